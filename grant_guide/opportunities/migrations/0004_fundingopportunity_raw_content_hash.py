@@ -0,0 +1,18 @@
+# Migration adding the scraped page content hash to FundingOpportunity
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('opportunities', '0003_fundingopportunity_auditlog'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='fundingopportunity',
+            name='raw_content_hash',
+            field=models.CharField(blank=True, db_index=True, max_length=64),
+        ),
+    ]
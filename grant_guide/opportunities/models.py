@@ -3,13 +3,15 @@ Models for the opportunities app.
 
 This module contains the FundingOpportunity, Industry, Province, and AuditLog models.
 """
-from django.db import models
+from django.db import IntegrityError, models, transaction
 from django.contrib.auth.models import User
 from django.utils.text import slugify
 from django.core.validators import URLValidator
 from django.core.exceptions import ValidationError
 from datetime import date, timedelta
 
+from .slugs import allocate_slugs
+
 
 # Choices
 FUNDING_TYPE_CHOICES = [
@@ -40,6 +42,9 @@ BBBEE_CHOICES = [
     ('unknown', 'Unknown'),
 ]
 
+# Retries when a concurrent writer takes the allocated slug first
+SLUG_ALLOCATION_ATTEMPTS = 5
+
 TARGET_GROUP_CHOICES = [
     ('women', 'Women'),
     ('youth', 'Youth'),
@@ -134,6 +139,7 @@ class FundingOpportunity(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     notes = models.TextField(blank=True)  # Admin notes, e.g., "Needs verification"
+    raw_content_hash = models.CharField(max_length=64, blank=True, db_index=True)  # SHA-256 of scraped page
     
     # Audit
     created_by = models.ForeignKey(
@@ -153,15 +159,23 @@ class FundingOpportunity(models.Model):
         return self.funding_name
 
     def save(self, *args, **kwargs):
-        if not self.slug:
-            base_slug = slugify(self.funding_name)
-            slug = base_slug
-            counter = 1
-            while FundingOpportunity.objects.filter(slug=slug).exclude(pk=self.pk).exists():
-                slug = f"{base_slug}-{counter}"
-                counter += 1
-            self.slug = slug
-        super().save(*args, **kwargs)
+        if self.slug:
+            super().save(*args, **kwargs)
+            return
+        
+        # Another writer may take the same slug between allocating and saving
+        for attempt in range(SLUG_ALLOCATION_ATTEMPTS):
+            others = FundingOpportunity.objects.exclude(pk=self.pk)
+            [self.slug] = allocate_slugs(others, [self.funding_name])
+            try:
+                with transaction.atomic():
+                    super().save(*args, **kwargs)
+                return
+            except IntegrityError:
+                slug_taken = others.filter(slug=self.slug).exists()
+                if not slug_taken or attempt == SLUG_ALLOCATION_ATTEMPTS - 1:
+                    self.slug = ''
+                    raise
 
     def clean(self):
         """Validate the model before saving."""
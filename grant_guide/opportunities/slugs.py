@@ -0,0 +1,47 @@
+"""
+Unique slug allocation.
+
+Finds free "<base>", "<base>-1", "<base>-2", ... slugs for any number of
+names with a single query for the slugs already taken, instead of one
+existence query per candidate.
+"""
+from django.db.models import Q
+from django.utils.text import slugify
+
+
+def allocate_slugs(queryset, names: list[str], field: str = 'slug') -> list[str]:
+    """
+    Allocate unique slugs for names.
+    
+    Names with the same base slug get consecutive free suffixes, so a whole
+    bulk batch can be assigned slugs up front.
+    
+    Args:
+        queryset: Rows whose slugs are taken (e.g. Model.objects.exclude(pk=...)).
+        names: Names to slugify, in order.
+        field: Name of the slug field.
+    
+    Returns:
+        One unique slug per name, in the same order.
+    """
+    bases = [slugify(name) for name in names]
+    if not bases:
+        return []
+    
+    query = Q()
+    for base in set(bases):
+        query |= Q(**{field: base}) | Q(**{f'{field}__startswith': f'{base}-'})
+    taken = set(queryset.filter(query).values_list(field, flat=True))
+    
+    next_counter: dict[str, int] = {}
+    slugs = []
+    for base in bases:
+        counter = next_counter.get(base, 0)
+        slug = f"{base}-{counter}" if counter else base
+        while slug in taken:
+            counter += 1
+            slug = f"{base}-{counter}"
+        next_counter[base] = counter + 1
+        taken.add(slug)
+        slugs.append(slug)
+    return slugs
@@ -2,6 +2,7 @@
 Source adapters for the Grant Guide scraper.
 """
 from .base import BaseSourceAdapter
+from .declarative import DeclarativeAdapter
 from .dtic import DTICAdapter
 from .dsbd import DSBDAdapter
 from .nyda import NYDAAdapter
@@ -19,6 +20,7 @@ from .tef import TEFAdapter
 
 __all__ = [
     'BaseSourceAdapter',
+    'DeclarativeAdapter',
     'DTICAdapter',
     'DSBDAdapter',
     'NYDAAdapter',
@@ -1,13 +1,21 @@
 """
 Base adapter class for source-specific scrapers.
 """
+import logging
 from abc import ABC, abstractmethod
-from typing import Iterator, Optional
+from typing import Container, Iterator, Optional
 
 from bs4 import BeautifulSoup
 
 from ..models import SourceConfig, RawOpportunity, RecordType
-from ..http_client import HttpClient
+from ..cancellation import OperationCancelled, check_cancelled
+from ..document import ParsedDocument, as_document
+from ..frontier import UrlFrontier
+from . import selectors
+from ..compliance import access_control_reason
+from ..http_client import AccessDeniedError, CircuitOpenError, HttpClient, NotModifiedError
+
+logger = logging.getLogger('scraper.adapter')
 
 
 class BaseSourceAdapter(ABC):
@@ -23,6 +31,14 @@ class BaseSourceAdapter(ABC):
         """
         self.config = config
         self.http = http_client
+        self.unchanged_urls: list[str] = []
+        # Pages rejected as behind a login, CAPTCHA or paywall
+        self.gated_urls: list[str] = []
+        # Shared by all adapters in a run; set by the engine
+        self.frontier: Optional[UrlFrontier] = None
+        # Source URLs of stored records; set by the engine. A not-modified
+        # page without one is fetched in full (None trusts every 304)
+        self.known_urls: Optional[Container[str]] = None
     
     @abstractmethod
     def get_opportunity_urls(self) -> Iterator[str]:
@@ -52,19 +68,115 @@ class BaseSourceAdapter(ABC):
         """
         Main scraping method - iterates through opportunities.
         
+        Opportunity pages are fetched conditionally; pages the server reports
+        as not modified are recorded in unchanged_urls, and gated pages in
+        gated_urls, instead of yielded.
+        
         Yields:
             RawOpportunity for each scraped page.
+        
+        Raises:
+            OperationCancelled: If the current cancellation token is cancelled.
         """
+        self.unchanged_urls = []
+        self.gated_urls = []
+        for url in self.opportunity_urls():
+            check_cancelled()
+            html = self.fetch(url)
+            if html is None:
+                continue
+            raw = self.extract(url, html)
+            if raw is not None:
+                yield raw
+    
+    def opportunity_urls(self) -> Iterator[str]:
+        """
+        Yield the URLs from get_opportunity_urls that are worth fetching.
+        
+        URLs go through the run's frontier (or one for this source alone),
+        which drops duplicates, fragment and tracking-parameter variants,
+        pages already fetched this run and links outside approved sources.
+        
+        Yields:
+            Opportunity page URLs, each at most once per run.
+        """
+        frontier = self.frontier
+        if frontier is None:
+            frontier = UrlFrontier.for_sources([self.config])
         for url in self.get_opportunity_urls():
+            admitted = frontier.admit(url)
+            if admitted is None:
+                logger.debug(f"Skipping {url}: duplicate or not an approved source")
+                continue
+            yield admitted
+    
+    def fetch(self, url: str) -> Optional[ParsedDocument]:
+        """
+        Fetch an opportunity page conditionally.
+        
+        Args:
+            url: URL of the page.
+        
+        Returns:
+            The page as a ParsedDocument, or None if the page is unchanged
+            (recorded in unchanged_urls), could not be fetched, or is behind
+            a login, CAPTCHA or paywall (recorded in gated_urls). Gated pages
+            are rejected before they are parsed. A not-modified page with no
+            stored record is fetched again in full.
+        
+        Raises:
+            CircuitOpenError: If the site has failed too often this run.
+        """
+        try:
             try:
+                html = self.http.get(url, conditional=True)
+            except NotModifiedError:
+                if self.known_urls is None or url in self.known_urls:
+                    self.unchanged_urls.append(url)
+                    return None
+                # The record was deleted or never imported, so there is nothing to verify
+                logger.info(f"Not modified but not stored, fetching in full: {url}")
+                self._forget_validators(url)
                 html = self.http.get(url)
-                yield self.extract_opportunity(url, html)
-            except Exception as e:
-                # Log error but continue with next URL
-                import logging
-                logging.getLogger('scraper.adapter').error(
-                    f"Error scraping {url}: {e}"
-                )
+            reason = access_control_reason(html)
+            if reason is not None:
+                raise AccessDeniedError(f"Access control detected: {reason}")
+            return as_document(html, url)
+        except AccessDeniedError as e:
+            logger.warning(f"Skipping {url}: {e}")
+            self.gated_urls.append(url)
+            self._forget_validators(url)
+        except (OperationCancelled, CircuitOpenError):
+            # The source cannot continue; stop instead of failing every page
+            raise
+        except Exception as e:
+            # Log error but continue with next URL
+            logger.error(f"Error scraping {url}: {e}")
+        return None
+    
+    def _forget_validators(self, url: str) -> None:
+        """Drop stored validators so a rejected page is not reported unchanged next run."""
+        store = getattr(self.http, 'validator_store', None)
+        if store is not None:
+            store.delete(url)
+    
+    def extract(self, url: str, html: str) -> Optional[RawOpportunity]:
+        """
+        Extract opportunity data from a page, logging failures.
+        
+        The page is handed to extract_opportunity as a ParsedDocument, so
+        parse_html reuses its tree instead of parsing the page again.
+        
+        Returns:
+            RawOpportunity, or None if extraction failed. A failed page's
+            validators are dropped so it is re-extracted next run.
+        """
+        try:
+            return self.extract_opportunity(url, as_document(html, url))
+        except Exception as e:
+            logger.error(f"Error scraping {url}: {e}")
+            self._forget_validators(url)
+            return None
     
     def classify_record_type(
         self,
@@ -91,11 +203,14 @@ class BaseSourceAdapter(ABC):
         Parse HTML content into BeautifulSoup object.
         
         Args:
-            html: HTML content string.
+            html: HTML content string. A ParsedDocument's cached tree is
+                returned as is; treat it as read-only.
             
         Returns:
             BeautifulSoup object for parsing.
         """
+        if isinstance(html, ParsedDocument):
+            return html.soup
         return BeautifulSoup(html, 'lxml')
     
     def extract_text(self, element, default: str = "") -> str:
@@ -128,6 +243,129 @@ class BaseSourceAdapter(ABC):
             return default
         return element.get('href', default)
     
+    # Fast backend: lxml trees queried with compiled XPath selectors. Adapters
+    # can use these instead of parse_html/extract_text one at a time.
+    
+    def parse_tree(self, html: str):
+        """
+        Parse HTML content into an lxml.html tree.
+        
+        Several times cheaper than parse_html; a ParsedDocument's cached tree
+        is reused.
+        
+        Args:
+            html: HTML content string or ParsedDocument.
+        
+        Returns:
+            Root element of the document.
+        """
+        return as_document(html).tree
+    
+    def select(self, node, expression) -> list:
+        """
+        Evaluate an XPath selector against a tree or element.
+        
+        Args:
+            node: lxml element to query.
+            expression: XPath expression or compiled selector.
+        
+        Returns:
+            Matching elements (or strings, for text()/attribute selectors).
+        """
+        if isinstance(expression, str):
+            expression = selectors.xpath(expression)
+        return expression(node)
+    
+    def select_one(self, node, *expressions):
+        """
+        Get the first match of the first selector that matches anything.
+        
+        Equivalent to chaining soup.find(...) or soup.find(...).
+        
+        Returns:
+            First matching element, or None.
+        """
+        for expression in expressions:
+            matches = self.select(node, expression)
+            if matches:
+                return matches[0]
+        return None
+    
+    def node_text(self, element, default: str = "") -> str:
+        """
+        Safely extract text from an lxml element.
+        
+        Equivalent to extract_text: stripped text fragments joined without a
+        separator, skipping script and style content.
+        
+        Args:
+            element: lxml element or None.
+            default: Default value if element is None.
+        
+        Returns:
+            Extracted text or default.
+        """
+        if element is None:
+            return default
+        return ''.join(fragment.strip() for fragment in selectors.TEXT(element))
+    
+    def node_href(self, element, default: str = "") -> str:
+        """
+        Safely extract href from an lxml element.
+        
+        Args:
+            element: lxml element or None.
+            default: Default value if element is None.
+        
+        Returns:
+            Extracted href or default.
+        """
+        if element is None:
+            return default
+        return element.get('href', default)
+    
+    def select_title(self, tree) -> Optional[str]:
+        """Get the text of the first <h1>, falling back to <title>."""
+        title = self.select_one(tree, *selectors.TITLE)
+        return self.node_text(title) if title is not None else None
+    
+    def select_paragraphs(self, container, limit: int = 3) -> list[str]:
+        """Get the text of the first limit <p> elements under container."""
+        return [self.node_text(p) for p in self.select(container, './/p')[:limit]]
+    
+    def select_section_items(self, tree, list_tag: str, heading_words: list[str]) -> list[str]:
+        """
+        Get list items from lists introduced by a matching heading.
+        
+        Args:
+            tree: lxml tree to search.
+            list_tag: 'ul' or 'ol'.
+            heading_words: Lowercase words; a list is used if the nearest
+                h2/h3/h4/strong before it contains one of them.
+        
+        Returns:
+            Text of each item of the matching lists, in document order.
+        """
+        selector = f"//{list_tag}[{selectors.heading_before(heading_words)}]//li"
+        return [self.node_text(li) for li in self.select(tree, selector)]
+    
+    def select_link(self, node, words: list[str]) -> Optional[str]:
+        """
+        Get the absolute href of the first link whose text contains a word.
+        
+        Args:
+            node: lxml element to search.
+            words: Lowercase words to look for in the link text.
+        
+        Returns:
+            Absolute URL, or None if no link matches.
+        """
+        for link in selectors.LINKS(node):
+            text = self.node_text(link).lower()
+            if any(word in text for word in words):
+                return self.make_absolute_url(self.node_href(link))
+        return None
+    
     def make_absolute_url(self, url: str) -> str:
         """
         Convert relative URL to absolute using base URL.
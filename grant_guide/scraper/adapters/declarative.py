@@ -0,0 +1,309 @@
+"""
+Declarative adapter driven by the extraction section of sources.yaml.
+
+Most sources only need the same heuristics with different selectors and
+keywords: find programme links on the listing pages, then take the title,
+the first few paragraphs, the lists introduced by an "eligibility" heading
+and the first "apply" link from each page. A source using DeclarativeAdapter
+describes those in YAML instead of a new adapter module:
+
+    adapter_class: "scraper.adapters.declarative.DeclarativeAdapter"
+    extraction:
+      links:
+        selector: "h2.title a"
+        href_keywords: [call, proposal]
+      title: ["h1.entry-title", "h1"]
+      title_strip: [" | TIA"]
+      description:
+        container: ["div.entry-content", "article"]
+        scan: 5
+        min_length: 20
+        paragraphs: 3
+      eligibility:
+        headings: [eligib, criteria, require, who can]
+        lists: [ul, ol]
+        min_length: 5
+      application_steps:
+        headings: [apply, process, step, how to]
+        lists: [ol]
+      apply_link:
+        keywords: [apply, submit, application]
+      defaults:
+        funder_type: government
+        funding_type: grant
+        provinces: [National]
+
+Selectors are XPath, or a CSS-like shorthand of tag/.class steps joined by
+spaces (descendant) or ">" (child). Each spec is compiled once into an
+ExtractionPlan of compiled XPath selectors and keyword regexes, shared by
+every adapter instance and page for that spec.
+"""
+import json
+import logging
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Iterator, Optional
+
+from lxml import etree
+
+from . import selectors
+from .base import BaseSourceAdapter
+from ..keywords import KeywordMatcher, keyword_matcher
+from ..models import RawOpportunity, SourceConfig
+
+logger = logging.getLogger('scraper.adapter.declarative')
+
+SPEC_KEYS = {
+    'links', 'title', 'title_strip', 'description', 'eligibility',
+    'application_steps', 'required_documents', 'apply_link', 'defaults'
+}
+DEFAULT_KEYS = {
+    'funder_name', 'funder_type', 'funding_type', 'industries', 'provinces',
+    'business_stage', 'eligibility', 'required_documents', 'application_steps',
+    'is_rolling'
+}
+_SHORTHAND_STEP = re.compile(r'^([a-z][a-z0-9]*|\*)?((?:\.[\w-]+)*)$', re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class ListRule:
+    """Compiled rule for list items under a matching heading."""
+    items: etree.XPath
+    min_length: int = 0
+
+
+@dataclass(frozen=True)
+class ExtractionPlan:
+    """A source's extraction spec, compiled for reuse across pages."""
+    links: etree.XPath
+    href_keywords: Optional[KeywordMatcher]
+    title: tuple[etree.XPath, ...]
+    title_strip: tuple[str, ...]
+    description: tuple[etree.XPath, ...]
+    paragraph_scan: int
+    paragraph_min_length: int
+    paragraphs: int
+    lists: dict[str, ListRule]
+    apply_keywords: Optional[KeywordMatcher]
+    apply_to_page: bool
+    defaults: dict = field(default_factory=dict)
+
+
+def to_xpath(selector: str) -> str:
+    """
+    Translate a selector into XPath.
+    
+    XPath expressions (starting with "/", "(" or ".") are returned as is.
+    Otherwise the selector is shorthand: steps like "div", "div.content" or
+    ".title", separated by spaces for descendants or ">" for children.
+    
+    Raises:
+        ValueError: If the shorthand cannot be translated.
+    """
+    selector = selector.strip()
+    if selector.startswith(('/', '(', '.')) and not re.match(r'^\.[\w-]', selector):
+        return selector
+    
+    xpath = ''
+    axis = '//'
+    for token in selector.replace('>', ' > ').split():
+        if token == '>':
+            axis = '/'
+            continue
+        match = _SHORTHAND_STEP.match(token)
+        if not match:
+            raise ValueError(f"Unsupported selector step '{token}' in '{selector}'")
+        tag, classes = match.group(1) or '*', match.group(2)
+        predicates = ''.join(
+            f"[{selectors.has_class(name)}]" for name in classes.split('.') if name
+        )
+        xpath += f"{axis}{tag.lower()}{predicates}"
+        axis = '//'
+    if not xpath:
+        raise ValueError("Empty selector")
+    return xpath
+
+
+def _compile(selector: str, first: bool = False) -> etree.XPath:
+    expression = to_xpath(selector)
+    try:
+        return selectors.xpath(f"({expression})[1]" if first else expression)
+    except etree.XPathSyntaxError as e:
+        raise ValueError(f"Invalid selector '{selector}': {e}")
+
+
+def _as_list(value) -> list:
+    if value is None:
+        return []
+    return list(value) if isinstance(value, (list, tuple)) else [value]
+
+
+def _keywords(words) -> Optional[KeywordMatcher]:
+    """Get the shared matcher for a list of keywords."""
+    return keyword_matcher(_as_list(words))
+
+
+def _list_rule(spec: dict) -> ListRule:
+    headings = [str(word).lower() for word in _as_list(spec.get('headings'))]
+    if not headings:
+        raise ValueError("List rules need at least one heading keyword")
+    if any("'" in word for word in headings):
+        raise ValueError("Heading keywords cannot contain quotes")
+    tags = [str(tag) for tag in _as_list(spec.get('lists', ['ul']))]
+    if not all(re.fullmatch(r'[a-z][a-z0-9]*', tag) for tag in tags):
+        raise ValueError(f"Invalid list tags: {tags}")
+    is_list = ' or '.join(f'self::{tag}' for tag in tags)
+    items = selectors.xpath(f"//*[{is_list}][{selectors.heading_before(headings)}]//li")
+    return ListRule(items=items, min_length=int(spec.get('min_length', 0)))
+
+
+def compile_plan(spec: dict) -> ExtractionPlan:
+    """
+    Compile an extraction spec, reusing the plan for identical specs.
+    
+    Args:
+        spec: The extraction section of a source's configuration.
+    
+    Returns:
+        Compiled ExtractionPlan.
+    
+    Raises:
+        ValueError: If the spec has unknown keys or invalid selectors.
+    """
+    return _compile_plan(json.dumps(spec, sort_keys=True))
+
+
+@lru_cache(maxsize=None)
+def _compile_plan(spec_json: str) -> ExtractionPlan:
+    spec = json.loads(spec_json)
+    unknown = set(spec) - SPEC_KEYS
+    if unknown:
+        raise ValueError(f"Unknown extraction keys: {', '.join(sorted(unknown))}")
+    defaults = spec.get('defaults', {})
+    unknown = set(defaults) - DEFAULT_KEYS
+    if unknown:
+        raise ValueError(f"Unknown extraction defaults: {', '.join(sorted(unknown))}")
+    
+    links = spec.get('links', {})
+    description = spec.get('description', {})
+    apply_link = spec.get('apply_link', {})
+    return ExtractionPlan(
+        links=_compile(links.get('selector', 'a')),
+        href_keywords=_keywords(links.get('href_keywords')),
+        title=tuple(_compile(s, first=True) for s in _as_list(spec.get('title', ['h1', 'title']))),
+        title_strip=tuple(_as_list(spec.get('title_strip'))),
+        description=tuple(_compile(s, first=True) for s in _as_list(description.get('container'))),
+        paragraph_scan=int(description.get('scan', description.get('paragraphs', 3))),
+        paragraph_min_length=int(description.get('min_length', 0)),
+        paragraphs=int(description.get('paragraphs', 3)),
+        lists={
+            name: _list_rule(spec[name])
+            for name in ('eligibility', 'application_steps', 'required_documents')
+            if name in spec
+        },
+        apply_keywords=_keywords(apply_link.get('keywords')) if apply_link != 'page' else None,
+        apply_to_page=apply_link == 'page',
+        defaults=defaults,
+    )
+
+
+class DeclarativeAdapter(BaseSourceAdapter):
+    """Adapter whose selectors and defaults come from the source's extraction spec."""
+    
+    def __init__(self, config: SourceConfig, http_client):
+        """
+        Initialize adapter.
+        
+        Raises:
+            ValueError: If the source has no valid extraction spec.
+        """
+        super().__init__(config, http_client)
+        if not config.extraction:
+            raise ValueError(f"Source {config.source_id} has no extraction spec")
+        self.plan = compile_plan(config.extraction)
+    
+    def get_opportunity_urls(self) -> Iterator[str]:
+        """Yield URLs of links on the listing pages matching the spec."""
+        plan = self.plan
+        seen = set()
+        for scrape_url in self.config.scrape_urls:
+            try:
+                tree = self.parse_tree(self.http.get(scrape_url))
+                for link in plan.links(tree):
+                    href = link.get('href')
+                    if not href:
+                        continue
+                    if plan.href_keywords and not plan.href_keywords.search(href):
+                        continue
+                    url = self.make_absolute_url(href)
+                    if url not in seen:
+                        seen.add(url)
+                        yield url
+            except Exception as e:
+                logger.error(f"Error getting URLs from {scrape_url}: {e}")
+    
+    def extract_opportunity(self, url: str, html: str) -> RawOpportunity:
+        """Extract opportunity data from a page using the compiled plan."""
+        plan = self.plan
+        defaults = plan.defaults
+        tree = self.parse_tree(html)
+        
+        title = self.select_one(tree, *plan.title)
+        title = self.node_text(title) if title is not None else None
+        if title:
+            for suffix in plan.title_strip:
+                title = title.replace(suffix, '')
+            title = title.strip()
+        
+        return RawOpportunity(
+            title=title,
+            funder_name=defaults.get('funder_name', self.config.source_name),
+            funder_type=defaults.get('funder_type'),
+            funding_type=defaults.get('funding_type'),
+            description=self._description(tree),
+            industries=list(defaults.get('industries', [])),
+            provinces=list(defaults.get('provinces', [])),
+            business_stage=defaults.get('business_stage'),
+            eligibility=self._list_items(tree, 'eligibility'),
+            funding_amount_min=None,
+            funding_amount_max=None,
+            deadline=None,
+            is_rolling=defaults.get('is_rolling', False),
+            required_documents=self._list_items(tree, 'required_documents'),
+            application_steps=self._list_items(tree, 'application_steps'),
+            apply_url=url if self.plan.apply_to_page else self._apply_url(tree),
+            source_url=url,
+            raw_html=html
+        )
+    
+    def _description(self, tree) -> Optional[str]:
+        plan = self.plan
+        container = self.select_one(tree, *plan.description) if plan.description else None
+        if container is None:
+            return None
+        parts = [
+            text for text in self.select_paragraphs(container, limit=plan.paragraph_scan)
+            if text and len(text) > plan.paragraph_min_length
+        ]
+        return ' '.join(parts[:plan.paragraphs]) or None
+    
+    def _list_items(self, tree, name: str) -> list[str]:
+        """Items from the spec's list rule, or the configured default list."""
+        rule = self.plan.lists.get(name)
+        items = []
+        if rule is not None:
+            items = [
+                text for text in (self.node_text(li) for li in rule.items(tree))
+                if text and len(text) > rule.min_length
+            ]
+        return items or list(self.plan.defaults.get(name, []))
+    
+    def _apply_url(self, tree) -> Optional[str]:
+        keywords = self.plan.apply_keywords
+        if keywords is None:
+            return None
+        for link in selectors.LINKS(tree):
+            if keywords.search(self.node_text(link)):
+                return self.make_absolute_url(self.node_href(link))
+        return None
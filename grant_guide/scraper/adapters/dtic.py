@@ -4,11 +4,19 @@ DTIC (Department of Trade, Industry and Competition) adapter.
 import logging
 from typing import Iterator
 
+from . import selectors
 from .base import BaseSourceAdapter
 from ..models import RawOpportunity
 
 logger = logging.getLogger('scraper.adapter.dtic')
 
+# Programme body, in order of preference
+DESCRIPTION = (
+    selectors.xpath(f"(//div[{selectors.has_class('field-body')}])[1]"),
+    selectors.xpath(f"(//div[{selectors.has_class('content')}])[1]"),
+    selectors.xpath('(//article)[1]'),
+)
+
 
 class DTICAdapter(BaseSourceAdapter):
     """Adapter for scraping DTIC incentives and programmes."""
@@ -23,15 +31,17 @@ class DTICAdapter(BaseSourceAdapter):
         for scrape_url in self.config.scrape_urls:
             try:
                 html = self.http.get(scrape_url)
-                soup = self.parse_html(html)
+                tree = self.parse_tree(html)
                 
                 # Find programme links - DTIC uses various structures
                 # Look for links in content area
-                content_area = soup.find('div', class_='content') or soup.find('main') or soup
+                content_area = self.select_one(tree, *selectors.MAIN_CONTENT)
+                if content_area is None:
+                    content_area = tree
                 
                 # Find all links that look like programme pages
-                for link in content_area.find_all('a', href=True):
-                    href = link['href']
+                for link in selectors.LINKS(content_area):
+                    href = self.node_href(link)
                     
                     # Filter for programme/incentive pages
                     if any(keyword in href.lower() for keyword in 
@@ -52,54 +62,33 @@ class DTICAdapter(BaseSourceAdapter):
         Returns:
             RawOpportunity with extracted data.
         """
-        soup = self.parse_html(html)
+        tree = self.parse_tree(html)
         
         # Extract title
-        title = None
-        title_elem = soup.find('h1') or soup.find('title')
-        if title_elem:
-            title = self.extract_text(title_elem)
+        title = self.select_title(tree)
+        if title is not None:
             # Clean up title
             title = title.replace(' | the dtic', '').replace(' - the dtic', '').strip()
         
         # Extract description
         description = None
-        desc_elem = (
-            soup.find('div', class_='field-body') or
-            soup.find('div', class_='content') or
-            soup.find('article')
-        )
-        if desc_elem:
+        desc_elem = self.select_one(tree, *DESCRIPTION)
+        if desc_elem is not None:
             # Get first few paragraphs
-            paragraphs = desc_elem.find_all('p', limit=3)
-            description = ' '.join(self.extract_text(p) for p in paragraphs)
+            description = ' '.join(self.select_paragraphs(desc_elem, limit=3))
         
         # Extract eligibility from lists
-        eligibility = []
-        for ul in soup.find_all('ul'):
-            # Check if this looks like eligibility criteria
-            prev_elem = ul.find_previous(['h2', 'h3', 'h4', 'strong'])
-            if prev_elem and any(word in self.extract_text(prev_elem).lower() 
-                                 for word in ['eligib', 'criteria', 'require', 'who can']):
-                for li in ul.find_all('li'):
-                    eligibility.append(self.extract_text(li))
+        eligibility = self.select_section_items(
+            tree, 'ul', ['eligib', 'criteria', 'require', 'who can']
+        )
         
         # Extract application steps
-        application_steps = []
-        for ol in soup.find_all('ol'):
-            prev_elem = ol.find_previous(['h2', 'h3', 'h4', 'strong'])
-            if prev_elem and any(word in self.extract_text(prev_elem).lower()
-                                 for word in ['apply', 'process', 'step', 'how to']):
-                for li in ol.find_all('li'):
-                    application_steps.append(self.extract_text(li))
+        application_steps = self.select_section_items(
+            tree, 'ol', ['apply', 'process', 'step', 'how to']
+        )
         
         # Find apply link
-        apply_url = None
-        for link in soup.find_all('a', href=True):
-            link_text = self.extract_text(link).lower()
-            if any(word in link_text for word in ['apply', 'application', 'register']):
-                apply_url = self.make_absolute_url(link['href'])
-                break
+        apply_url = self.select_link(tree, ['apply', 'application', 'register'])
         
         # Determine record type
         deadline = None  # DTIC programmes are typically rolling
@@ -0,0 +1,61 @@
+"""
+Compiled XPath selectors for the fast lxml extraction backend.
+
+Selectors are compiled once per expression and shared by every adapter and
+page, instead of BeautifulSoup walking the tree for each find() call.
+"""
+from functools import lru_cache
+
+from lxml import etree
+
+
+@lru_cache(maxsize=None)
+def xpath(expression: str) -> etree.XPath:
+    """
+    Compile an XPath expression, reusing earlier compilations.
+    
+    Args:
+        expression: XPath expression.
+    
+    Returns:
+        Compiled, reusable XPath evaluator.
+    """
+    return etree.XPath(expression)
+
+
+def has_class(name: str) -> str:
+    """
+    XPath predicate matching elements whose class list contains name.
+    
+    Equivalent to BeautifulSoup's class_=name.
+    """
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+def heading_before(words: list[str], headings: tuple[str, ...] = ('h2', 'h3', 'h4', 'strong')) -> str:
+    """
+    XPath predicate matching elements whose nearest preceding heading
+    contains any of words (case-insensitive).
+    
+    Equivalent to element.find_previous(headings) followed by a substring
+    check on its text. words must be lowercase.
+    """
+    is_heading = ' or '.join(f'self::{tag}' for tag in headings)
+    lowered = "translate(string(.), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz')"
+    matches = ' or '.join(f"contains({lowered}, '{word}')" for word in words)
+    return f"(ancestor::* | preceding::*)[{is_heading}][last()][{matches}]"
+
+
+# Visible text of an element, skipping script/style content like get_text()
+TEXT = xpath(
+    'descendant-or-self::text()'
+    '[not(ancestor::script) and not(ancestor::style) and not(ancestor::template)]'
+)
+
+# Common page parts, in order of preference
+TITLE = (xpath('(//h1)[1]'), xpath('(//title)[1]'))
+MAIN_CONTENT = (
+    xpath(f"(//div[{has_class('content')}])[1]"),
+    xpath('(//main)[1]'),
+)
+LINKS = xpath('.//a[@href]')
@@ -5,3 +5,7 @@ class ScraperConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'scraper'
     verbose_name = 'Grant Guide Scraper Engine'
+    
+    def ready(self):
+        from .lookups import connect_invalidation_signals
+        connect_invalidation_signals()
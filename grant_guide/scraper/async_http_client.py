@@ -0,0 +1,292 @@
+"""
+Asynchronous HTTP client with per-domain politeness.
+
+Fetches through a pooled httpx.AsyncClient, so requests to different
+domains can run concurrently in one event loop while requests to the same
+domain stay rate limited. Politeness and failure handling are not
+reimplemented here: the client wraps an HttpClient and uses its robots.txt
+cache and store, rate limiter, circuit breaker, retry budget and request
+timeout, so a sync and an async client built on the same HttpClient
+share every per-domain limit.
+"""
+import asyncio
+import logging
+from functools import wraps
+from typing import Callable, Iterable, Optional, Union
+from urllib.parse import urlparse
+from urllib.robotparser import RobotFileParser
+
+import httpx
+
+from . import cancellation
+from .circuit_breaker import CircuitBreaker
+from .http_client import (
+    DEFAULT_USER_AGENT, RETRYABLE_STATUSES, HttpClient, RobotsDisallowedError,
+    _within_retry_budget, next_retry_delay
+)
+from .rate_limiter import DomainRateLimiter
+from .robots_store import RobotsEntry
+
+logger = logging.getLogger('scraper.http')
+
+
+def is_retryable_httpx(error: Exception) -> bool:
+    """
+    Check if a failed httpx request is worth retrying.
+    
+    Same rules as http_client.is_retryable: timeouts, connection errors,
+    truncated responses and statuses in RETRYABLE_STATUSES.
+    """
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code in RETRYABLE_STATUSES
+    return isinstance(error, (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError))
+
+
+def async_retry_with_backoff(
+    max_retries: int = 3,
+    base_delay: float = 1.0,
+    max_delay: float = 30.0,
+    retry_allowed: Optional[Callable[..., bool]] = None
+):
+    """
+    Decorator for retrying async requests with exponential backoff.
+    
+    Same semantics as retry_with_backoff, using asyncio.sleep so other
+    requests keep running while one is backing off.
+    
+    Args:
+        max_retries: Maximum number of retry attempts.
+        base_delay: Base delay in seconds (doubles each retry).
+        max_delay: Maximum delay between retries.
+        retry_allowed: Optional callable given the error and the call's
+            arguments before each retry; returning False raises the error.
+    """
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            for attempt in range(max_retries + 1):
+                cancellation.check_cancelled()
+                try:
+                    return await func(*args, **kwargs)
+                except httpx.HTTPError as e:
+                    if not is_retryable_httpx(e):
+                        raise
+                    delay = next_retry_delay(
+                        e, attempt, max_retries, base_delay, max_delay, retry_allowed, args, kwargs
+                    )
+                    if delay is None:
+                        raise
+                    await asyncio.sleep(delay)
+        return wrapper
+    return decorator
+
+
+class AsyncHttpClient:
+    """Async HTTP client with rate limiting and robots.txt compliance."""
+    
+    def __init__(
+        self,
+        user_agent: str = DEFAULT_USER_AGENT,
+        default_delay: float = 2.0,
+        timeout: int = 30,
+        max_connections: int = 20,
+        max_per_domain: int = 1,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        rate_limiter: Optional[DomainRateLimiter] = None,
+        client: Optional[HttpClient] = None
+    ):
+        """
+        Initialize async HTTP client.
+        
+        Args:
+            user_agent: User agent string for requests.
+            default_delay: Default delay between requests to same domain (seconds).
+            timeout: Request timeout in seconds.
+            max_connections: Size of the shared connection pool.
+            max_per_domain: Maximum concurrent requests to a single domain.
+            transport: Optional httpx transport (e.g. for testing).
+            rate_limiter: Per-domain limiter, which may be shared with sync
+                clients. Ignored if client is given.
+            client: HttpClient whose robots.txt cache, rate limiter, circuit
+                breaker and retry budget this client shares. If None, a new
+                one is built from the arguments above.
+        """
+        self.client = client or HttpClient(
+            user_agent=user_agent,
+            default_delay=default_delay,
+            timeout=timeout,
+            rate_limiter=rate_limiter
+        )
+        self.user_agent = self.client.user_agent
+        self.max_per_domain = max_per_domain
+        self._domain_slots: dict[str, asyncio.Semaphore] = {}
+        self._robots_locks: dict[str, asyncio.Lock] = {}
+        self._client = httpx.AsyncClient(
+            headers={'User-Agent': self.user_agent},
+            limits=httpx.Limits(max_connections=max_connections),
+            follow_redirects=True,
+            transport=transport
+        )
+    
+    @property
+    def rate_limiter(self) -> DomainRateLimiter:
+        return self.client.rate_limiter
+    
+    @property
+    def circuit_breaker(self) -> CircuitBreaker:
+        return self.client.circuit_breaker
+    
+    async def get(self, url: str, check_robots: bool = True) -> str:
+        """
+        Fetch URL with rate limiting and robots.txt compliance.
+        
+        Args:
+            url: URL to fetch.
+            check_robots: Whether to check robots.txt (default True).
+        
+        Returns:
+            HTML content as string.
+        
+        Raises:
+            RobotsDisallowedError: If robots.txt disallows access.
+            CircuitOpenError: If the domain's circuit is open.
+            OperationCancelled: If the current cancellation token is cancelled.
+            httpx.HTTPError: If the request still fails after retries.
+        """
+        cancellation.check_cancelled()
+        domain = self._get_domain(url)
+        self.client._check_circuit(domain, url)
+        
+        if check_robots and not await self.is_allowed(url):
+            raise RobotsDisallowedError(f"Access disallowed by robots.txt: {url}")
+        
+        async with self._domain_slot(domain):
+            try:
+                content = await self._make_request(url)
+            except httpx.HTTPError as e:
+                if is_retryable_httpx(e):
+                    self.circuit_breaker.record_failure(domain)
+                else:
+                    # The server answered (e.g. 404), so the site is up
+                    self.circuit_breaker.record_success(domain)
+                raise
+        self.circuit_breaker.record_success(domain)
+        return content
+    
+    async def get_many(
+        self,
+        urls: Iterable[str],
+        check_robots: bool = True
+    ) -> dict[str, Union[str, Exception]]:
+        """
+        Fetch many URLs concurrently.
+        
+        Requests to different domains overlap; requests to the same domain
+        are spaced by its crawl delay.
+        
+        Args:
+            urls: URLs to fetch.
+            check_robots: Whether to check robots.txt (default True).
+        
+        Returns:
+            Dict mapping each URL to its content, or to the exception raised.
+        """
+        urls = list(dict.fromkeys(urls))
+        responses = await asyncio.gather(
+            *(self.get(url, check_robots=check_robots) for url in urls),
+            return_exceptions=True
+        )
+        return dict(zip(urls, responses))
+    
+    @async_retry_with_backoff(max_retries=3, base_delay=1.0, retry_allowed=_within_retry_budget)
+    async def _make_request(self, url: str) -> str:
+        """Make HTTP request with retry logic (each attempt is rate limited)."""
+        domain = self._get_domain(url)
+        await self._enforce_rate_limit(domain, url)
+        logger.debug(f"Fetching: {url}")
+        
+        response = await self._client.get(url, timeout=self.client._request_timeout())
+        self.client._record_pace(domain, response)
+        response.raise_for_status()
+        
+        logger.info(f"Fetched {url} ({len(response.text)} bytes)")
+        return response.text
+    
+    async def is_allowed(self, url: str) -> bool:
+        """
+        Check if URL is allowed by robots.txt.
+        
+        Args:
+            url: URL to check.
+        
+        Returns:
+            True if allowed, False if disallowed.
+        """
+        robots = await self._get_robots_parser(self._get_domain(url))
+        return self.client._robots_allow(robots, url)
+    
+    async def get_crawl_delay(self, url: str) -> float:
+        """
+        Get crawl delay from robots.txt or the domain's configured delay.
+        
+        Args:
+            url: URL to get delay for.
+        
+        Returns:
+            Crawl delay in seconds.
+        """
+        domain = self._get_domain(url)
+        return self.client._robots_crawl_delay(await self._get_robots_parser(domain), domain)
+    
+    async def _get_robots_parser(self, domain: str) -> Optional[RobotFileParser]:
+        """Get robots.txt parser for domain from the shared cache, the store or the site."""
+        if self.client._robots_fresh(domain):
+            return self.client._robots_cache[domain]
+        
+        lock = self._robots_locks.setdefault(domain, asyncio.Lock())
+        async with lock:
+            # Another task may have loaded it while we waited
+            if self.client._robots_fresh(domain):
+                return self.client._robots_cache[domain]
+            
+            entry = self.client.robots_store.get(domain)
+            if entry is None:
+                entry = await self._fetch_robots(domain)
+                self.client.robots_store.set(domain, entry)
+            return self.client._cache_robots(domain, entry)
+    
+    async def _fetch_robots(self, domain: str) -> RobotsEntry:
+        """Fetch robots.txt through the pooled client with the request timeout."""
+        robots_url = f"https://{domain}/robots.txt"
+        try:
+            response = await self._client.get(robots_url, timeout=self.client._request_timeout())
+        except Exception as e:
+            logger.debug(f"Could not load robots.txt for {domain}: {e}")
+            return RobotsEntry.fetch_failed()
+        
+        logger.debug(f"Loaded robots.txt for {domain} ({response.status_code})")
+        return RobotsEntry.from_response(response.status_code, response.text)
+    
+    def _domain_slot(self, domain: str) -> asyncio.Semaphore:
+        """Get the semaphore limiting concurrent requests to a domain."""
+        if domain not in self._domain_slots:
+            self._domain_slots[domain] = asyncio.Semaphore(self.max_per_domain)
+        return self._domain_slots[domain]
+    
+    async def _enforce_rate_limit(self, domain: str, url: str) -> None:
+        """Wait for the domain's next request slot."""
+        await self.rate_limiter.acquire_async(domain, await self.get_crawl_delay(url))
+    
+    def _get_domain(self, url: str) -> str:
+        """Extract domain from URL."""
+        return urlparse(url).netloc
+    
+    async def close(self):
+        """Close the underlying connection pool."""
+        await self._client.aclose()
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
@@ -0,0 +1,153 @@
+"""
+Cooperative cancellation for scrape runs.
+
+A CancellationToken is cancelled explicitly, by its deadline passing or by
+its parent being cancelled. The token for the current run is held in a
+context variable, so the engine, adapters' scrape() generators and
+HttpClient can check it between requests and records without it being
+threaded through every signature. Sleeps (rate limiting, retry backoff)
+wake up as soon as the token is cancelled.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+
+class OperationCancelled(Exception):
+    """Raised when work is stopped because its token was cancelled."""
+    pass
+
+
+class CancellationToken:
+    """Thread-safe cancellation flag with an optional deadline and parent."""
+    
+    def __init__(
+        self,
+        timeout: Optional[float] = None,
+        parent: Optional['CancellationToken'] = None
+    ):
+        """
+        Create a token.
+        
+        Args:
+            timeout: Seconds from now after which the token counts as cancelled.
+            parent: Token whose cancellation (or deadline) also cancels this one.
+        """
+        self.reason: Optional[str] = None
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._children: list['CancellationToken'] = []
+        self._deadline = time.monotonic() + timeout if timeout is not None else None
+        self._parent = parent
+        if parent is not None:
+            parent._add_child(self)
+    
+    def cancel(self, reason: str = "Operation cancelled") -> None:
+        """Cancel this token and its children. Later calls keep the first reason."""
+        with self._lock:
+            if self._event.is_set():
+                return
+            self.reason = reason
+            self._event.set()
+            children = list(self._children)
+        for child in children:
+            child.cancel(reason)
+    
+    @property
+    def cancelled(self) -> bool:
+        """Whether the token was cancelled or its deadline has passed."""
+        if self._event.is_set():
+            return True
+        if self._parent is not None and self._parent.cancelled:
+            self.cancel(self._parent.reason)
+        elif self._deadline is not None and time.monotonic() >= self._deadline:
+            self.cancel("Timed out")
+        return self._event.is_set()
+    
+    def remaining(self) -> Optional[float]:
+        """Seconds until the nearest deadline (own or parent's), or None if unbounded."""
+        remaining = None
+        if self._deadline is not None:
+            remaining = max(0.0, self._deadline - time.monotonic())
+        if self._parent is not None:
+            parent_remaining = self._parent.remaining()
+            if parent_remaining is not None:
+                remaining = parent_remaining if remaining is None else min(remaining, parent_remaining)
+        return remaining
+    
+    def raise_if_cancelled(self) -> None:
+        """
+        Raises:
+            OperationCancelled: If the token is cancelled.
+        """
+        if self.cancelled:
+            raise OperationCancelled(self.reason)
+    
+    def wait(self, seconds: float) -> bool:
+        """
+        Sleep for up to seconds, waking early on cancellation.
+        
+        Returns:
+            True if the token was cancelled, False if the full time elapsed.
+        """
+        end = time.monotonic() + seconds
+        while not self.cancelled:
+            left = end - time.monotonic()
+            if left <= 0:
+                return False
+            remaining = self.remaining()
+            self._event.wait(left if remaining is None else min(left, remaining))
+        return True
+    
+    def _add_child(self, child: 'CancellationToken') -> None:
+        with self._lock:
+            if not self._event.is_set():
+                self._children.append(child)
+                return
+        child.cancel(self.reason)
+
+
+_current_token: ContextVar[Optional[CancellationToken]] = ContextVar(
+    'scraper_cancellation_token', default=None
+)
+
+
+def current_token() -> Optional[CancellationToken]:
+    """Get the token for the work running in this context, if any."""
+    return _current_token.get()
+
+
+@contextmanager
+def cancellation_scope(token: Optional[CancellationToken]) -> Iterator[Optional[CancellationToken]]:
+    """Make token the current token for the duration of the block."""
+    reset = _current_token.set(token)
+    try:
+        yield token
+    finally:
+        _current_token.reset(reset)
+
+
+def check_cancelled() -> None:
+    """
+    Raises:
+        OperationCancelled: If the current token is cancelled.
+    """
+    token = current_token()
+    if token is not None:
+        token.raise_if_cancelled()
+
+
+def sleep(seconds: float) -> None:
+    """
+    Sleep, waking early if the current token is cancelled.
+    
+    Raises:
+        OperationCancelled: If the current token is cancelled.
+    """
+    token = current_token()
+    if token is None:
+        time.sleep(seconds)
+    elif token.wait(seconds):
+        raise OperationCancelled(token.reason)
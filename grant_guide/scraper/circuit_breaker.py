@@ -0,0 +1,95 @@
+"""
+Per-domain circuit breaker and retry budget.
+
+A source whose site is down fails every request after a full round of
+retries, which can cost minutes per URL. The breaker counts consecutive
+failed requests per domain and, once a domain reaches the threshold,
+opens its circuit so further requests fail immediately for the rest of
+the run. Each domain also gets a budget of retries per run; once it is
+spent, failed requests to that domain are not retried.
+
+Only failures where the server was unreachable or answered with a server
+error count; a 404 means the site is up, and resets the count.
+"""
+import logging
+import threading
+from typing import Iterable, Optional
+
+logger = logging.getLogger('scraper.http')
+
+
+class CircuitBreaker:
+    """Thread-safe consecutive-failure tracking per domain."""
+    
+    def __init__(self, failure_threshold: int = 5, retry_budget: int = 10):
+        """
+        Initialize breaker.
+        
+        Args:
+            failure_threshold: Consecutive failed requests that open a
+                domain's circuit.
+            retry_budget: Retries allowed per domain until the next reset.
+        """
+        self.failure_threshold = failure_threshold
+        self.retry_budget = retry_budget
+        self._failures: dict[str, int] = {}
+        self._retries: dict[str, int] = {}
+        self._open: set[str] = set()
+        self._lock = threading.Lock()
+    
+    def is_open(self, domain: str) -> bool:
+        """Whether requests to domain should fail fast."""
+        return domain in self._open
+    
+    def record_success(self, domain: str) -> None:
+        """Record that the domain's server answered."""
+        with self._lock:
+            self._failures.pop(domain, None)
+    
+    def record_failure(self, domain: str) -> bool:
+        """
+        Record a failed request to a domain.
+        
+        Returns:
+            True if this failure opened the domain's circuit.
+        """
+        with self._lock:
+            failures = self._failures.get(domain, 0) + 1
+            self._failures[domain] = failures
+            if failures < self.failure_threshold or domain in self._open:
+                return False
+            self._open.add(domain)
+        logger.warning(f"Circuit opened for {domain} after {failures} consecutive failures")
+        return True
+    
+    def take_retry(self, domain: str) -> bool:
+        """
+        Spend one retry from a domain's budget.
+        
+        Returns:
+            True if a retry was available, False if the budget is spent.
+        """
+        with self._lock:
+            used = self._retries.get(domain, 0)
+            if used >= self.retry_budget:
+                return False
+            self._retries[domain] = used + 1
+            return True
+    
+    def reset(self, domains: Optional[Iterable[str]] = None) -> None:
+        """
+        Close circuits and refill retry budgets.
+        
+        Args:
+            domains: Domains to reset. If None, resets every domain.
+        """
+        with self._lock:
+            if domains is None:
+                self._failures.clear()
+                self._retries.clear()
+                self._open.clear()
+                return
+            for domain in domains:
+                self._failures.pop(domain, None)
+                self._retries.pop(domain, None)
+                self._open.discard(domain)
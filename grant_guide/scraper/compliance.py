@@ -2,11 +2,104 @@
 Compliance checker for validating scraped records against trust and safety rules.
 """
 import re
-from typing import Optional
+from functools import lru_cache
+from typing import Optional, Sequence, Union
 from urllib.parse import urlparse
 
+from .domains import SOCIAL_MEDIA_DOMAINS, social_media_trie
+from .keywords import keyword_matcher
 from .models import NormalisedOpportunity, ComplianceResult
 
+# Patterns indicating access control, with the reason reported for each.
+# Structural markers match an opening tag; the rest match visible text.
+ACCESS_CONTROL_PATTERNS = (
+    ('login form', r'<form\b[^>]*(?:log-?in|sign-?in)'),
+    ('password field', r'<input\b[^>]*type=["\']?password'),
+    ('CAPTCHA widget', r'<[a-z][^>]*class=["\'][^"\']*\b(?:g-recaptcha|h-captcha|cf-turnstile)\b'),
+    ('paywall container', r'<[a-z][^>]*(?:class|id)=["\'][^"\']*paywall'),
+    ('login prompt', r'please\s+log\s*in|sign\s+in\s+to\s+continue|authentication\s+required'),
+    ('CAPTCHA challenge', r'h?captcha|verify\s+you\s+are\s+human'),
+    ('paywall notice', r'paywall|subscribe\s+to\s+(?:read|view|access)|premium\s+content|members\s+only'),
+)
+
+# Markup that is never treated as gating: scripts, styles and comments
+# (e.g. a reCAPTCHA script URL), site chrome around the main content,
+# and the attributes of any other tag
+_IGNORED_MARKUP = (
+    r'<(?P<_block>script|style|noscript|template|header|nav|footer|aside)\b.*?</(?P=_block)\s*>'
+    r'|<!--.*?-->'
+)
+_OTHER_TAG = r'<[^>]*>'
+
+
+@lru_cache(maxsize=None)
+def _access_control_regex(patterns: tuple[tuple[str, str], ...], binary: bool) -> re.Pattern:
+    """Compile access-control patterns into one case-insensitive scanner."""
+    markers = '|'.join(f'(?P<_m{i}>{pattern})' for i, (_, pattern) in enumerate(patterns))
+    scanner = f'(?P<_ignored>{_IGNORED_MARKUP})|{markers}|{_OTHER_TAG}'
+    return re.compile(scanner.encode('utf-8') if binary else scanner, re.IGNORECASE | re.DOTALL)
+
+
+def access_control_reason(
+    content: Union[str, bytes],
+    patterns: Sequence[tuple[str, str]] = ACCESS_CONTROL_PATTERNS
+) -> Optional[str]:
+    """
+    Find the login form, CAPTCHA or paywall gating a page.
+    
+    The original markup (text or bytes) is scanned once, without lowercasing
+    a copy, stopping at the first match. Structural markers match tags in
+    the main content; phrases match visible text only, so script URLs,
+    attributes and page chrome do not count.
+    
+    Args:
+        content: Page markup.
+        patterns: (reason, regex) pairs (default: ACCESS_CONTROL_PATTERNS).
+    
+    Returns:
+        The reason of the first pattern found, or None if the page is public.
+    """
+    if not content:
+        return None
+    patterns = tuple(patterns)
+    regex = _access_control_regex(patterns, isinstance(content, (bytes, bytearray)))
+    for match in regex.finditer(content):
+        name = match.lastgroup
+        if name is not None and name.startswith('_m'):
+            return patterns[int(name[2:])][0]
+    return None
+
+
+def detect_access_control(
+    content: Union[str, bytes],
+    patterns: Sequence[tuple[str, str]] = ACCESS_CONTROL_PATTERNS
+) -> bool:
+    """
+    Detect login forms, CAPTCHAs and paywalls in a page.
+    
+    Args:
+        content: Page markup.
+        patterns: (reason, regex) pairs (default: ACCESS_CONTROL_PATTERNS).
+    
+    Returns:
+        True if access control detected, False otherwise.
+    """
+    return access_control_reason(content, patterns) is not None
+
+
+# Record text fields checked for payment indicators, with their issue labels
+PAYMENT_FIELDS = (
+    ('description_short', 'description'),
+    ('eligibility_bullets', 'eligibility'),
+    ('application_steps', 'application steps'),
+)
+
+# Record URLs checked for social media domains, with their issue labels
+SOCIAL_MEDIA_FIELDS = (
+    ('official_apply_url', 'Apply URL'),
+    ('source_url', 'Source URL'),
+)
+
 
 class ComplianceChecker:
     """Validates records against trust and safety rules."""
@@ -20,32 +113,10 @@ class ComplianceChecker:
     ]
     
     # Social media domains that are not acceptable as sole contact
-    SOCIAL_MEDIA_DOMAINS = [
-        'whatsapp.com', 'wa.me', 'chat.whatsapp.com',
-        'telegram.org', 't.me', 'telegram.me',
-        'facebook.com', 'fb.com', 'fb.me',
-        'twitter.com', 'x.com',
-        'instagram.com',
-        'tiktok.com',
-    ]
+    SOCIAL_MEDIA_DOMAINS = SOCIAL_MEDIA_DOMAINS
     
     # Patterns indicating access control
-    ACCESS_CONTROL_PATTERNS = [
-        r'<form[^>]*login',
-        r'<form[^>]*signin',
-        r'<input[^>]*type=["\']password["\']',
-        r'please\s+log\s*in',
-        r'sign\s+in\s+to\s+continue',
-        r'authentication\s+required',
-        r'captcha',
-        r'recaptcha',
-        r'hcaptcha',
-        r'verify\s+you\s+are\s+human',
-        r'paywall',
-        r'subscribe\s+to\s+(read|view|access)',
-        r'premium\s+content',
-        r'members\s+only',
-    ]
+    ACCESS_CONTROL_PATTERNS = ACCESS_CONTROL_PATTERNS
     
     def check(self, record: NormalisedOpportunity) -> ComplianceResult:
         """
@@ -57,6 +128,34 @@ class ComplianceChecker:
         Returns:
             ComplianceResult with compliance status and any issues found.
         """
+        return self.check_many([record])[0]
+    
+    def check_many(self, records: Sequence[NormalisedOpportunity]) -> list[ComplianceResult]:
+        """
+        Run all compliance checks on many records.
+        
+        The payment keyword check scans every record's text in one pass.
+        
+        Args:
+            records: Normalised opportunity records to validate.
+        
+        Returns:
+            ComplianceResult for each record, in order.
+        """
+        payment = self._payment_issues(records)
+        social = self._social_media_issues(records)
+        return [
+            self._result(record, payment[i], social[i])
+            for i, record in enumerate(records)
+        ]
+    
+    def _result(
+        self,
+        record: NormalisedOpportunity,
+        payment_issues: list[str],
+        social_issues: list[str]
+    ) -> ComplianceResult:
+        """Combine one record's check results."""
         issues = []
         rejection_reason = None
         
@@ -65,13 +164,11 @@ class ComplianceChecker:
         issues.extend(field_issues)
         
         # Check for payment-to-apply
-        payment_issues = self.check_no_payment_required(record)
         if payment_issues:
             issues.extend(payment_issues)
             rejection_reason = "Payment required to apply"
         
         # Check for social-media-only
-        social_issues = self.check_no_social_media_only(record)
         if social_issues:
             issues.extend(social_issues)
             if not rejection_reason:
@@ -118,33 +215,7 @@ class ComplianceChecker:
         
         Returns list of issues if payment indicators found.
         """
-        issues = []
-        
-        # Check description
-        if record.description_short:
-            text = record.description_short.lower()
-            for keyword in self.PAYMENT_KEYWORDS:
-                if keyword in text:
-                    issues.append(f"Payment indicator found in description: '{keyword}'")
-                    break
-        
-        # Check eligibility bullets
-        for bullet in record.eligibility_bullets:
-            text = bullet.lower()
-            for keyword in self.PAYMENT_KEYWORDS:
-                if keyword in text:
-                    issues.append(f"Payment indicator found in eligibility: '{keyword}'")
-                    break
-        
-        # Check application steps
-        for step in record.application_steps:
-            text = step.lower()
-            for keyword in self.PAYMENT_KEYWORDS:
-                if keyword in text:
-                    issues.append(f"Payment indicator found in application steps: '{keyword}'")
-                    break
-        
-        return issues
+        return self._payment_issues([record])[0]
     
     def check_no_social_media_only(self, record: NormalisedOpportunity) -> list[str]:
         """
@@ -152,28 +223,39 @@ class ComplianceChecker:
         
         Returns list of issues if only social media contact found.
         """
-        issues = []
+        return self._social_media_issues([record])[0]
         
-        # Check apply URL
-        if record.official_apply_url:
-            parsed = urlparse(record.official_apply_url)
-            domain = parsed.netloc.lower()
-            
-            for social_domain in self.SOCIAL_MEDIA_DOMAINS:
-                if social_domain in domain:
-                    issues.append(f"Apply URL is social media only: {domain}")
-                    break
-        
-        # Check source URL
-        if record.source_url:
-            parsed = urlparse(record.source_url)
-            domain = parsed.netloc.lower()
+    def _payment_issues(self, records: Sequence[NormalisedOpportunity]) -> list[list[str]]:
+        """Payment issues for each record: one per text with an indicator."""
+        texts = []
+        for i, record in enumerate(records):
+            for field, label in PAYMENT_FIELDS:
+                value = getattr(record, field)
+                for j, text in enumerate([value] if isinstance(value, str) else value or []):
+                    texts.append(((i, label, j), text))
             
-            for social_domain in self.SOCIAL_MEDIA_DOMAINS:
-                if social_domain in domain:
-                    issues.append(f"Source URL is social media only: {domain}")
-                    break
+        issues = [[] for _ in records]
+        matcher = keyword_matcher(self.PAYMENT_KEYWORDS)
+        if matcher is None:
+            return issues
+        reported = set()
+        for hit in matcher.scan(texts):
+            if hit.key in reported:
+                continue
+            reported.add(hit.key)
+            i, label, _ = hit.key
+            issues[i].append(f"Payment indicator found in {label}: '{hit.keyword}'")
+        return issues
         
+    def _social_media_issues(self, records: Sequence[NormalisedOpportunity]) -> list[list[str]]:
+        """Social media issues for each record: one per URL on a social domain."""
+        social_media = social_media_trie(tuple(self.SOCIAL_MEDIA_DOMAINS))
+        issues = [[] for _ in records]
+        for i, record in enumerate(records):
+            for field, label in SOCIAL_MEDIA_FIELDS:
+                url = getattr(record, field)
+                if url and url in social_media:
+                    issues[i].append(f"{label} is social media only: {urlparse(url).netloc.lower()}")
         return issues
     
     def check_url_validity(self, record: NormalisedOpportunity) -> list[str]:
@@ -194,26 +276,17 @@ class ComplianceChecker:
         
         return issues
     
-    def detect_access_control(self, html_content: str) -> bool:
+    def detect_access_control(self, html_content: Union[str, bytes]) -> bool:
         """
         Detect if HTML content contains access control indicators.
         
         Args:
-            html_content: Raw HTML content to check.
+            html_content: Raw HTML content (text or bytes) to check.
             
         Returns:
             True if access control detected, False otherwise.
         """
-        if not html_content:
-            return False
-        
-        content_lower = html_content.lower()
-        
-        for pattern in self.ACCESS_CONTROL_PATTERNS:
-            if re.search(pattern, content_lower, re.IGNORECASE):
-                return True
-        
-        return False
+        return detect_access_control(html_content, self.ACCESS_CONTROL_PATTERNS)
     
     def _is_valid_url(self, url: str) -> bool:
         """Check if URL is well-formed."""
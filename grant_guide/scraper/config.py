@@ -6,6 +6,8 @@ from pathlib import Path
 from typing import Optional
 import yaml
 
+from .adapters.declarative import compile_plan
+from .frontier import ApprovedPrefixIndex
 from .models import SourceConfig, SourceType
 
 
@@ -61,6 +63,13 @@ def _parse_source_config(data: dict) -> SourceConfig:
         if field not in data:
             raise KeyError(f"Missing required field: {field}")
     
+    extraction = data.get('extraction')
+    if extraction is not None:
+        if not isinstance(extraction, dict):
+            raise ValueError("extraction must be a mapping")
+        # Compile now so bad selectors fail at load time, not mid-scrape
+        compile_plan(extraction)
+    
     return SourceConfig(
         source_id=data['source_id'],
         source_name=data['source_name'],
@@ -70,6 +79,8 @@ def _parse_source_config(data: dict) -> SourceConfig:
         adapter_class=data['adapter_class'],
         is_active=data.get('is_active', True),
         rate_limit_seconds=data.get('rate_limit_seconds', 2.0),
+        cache_ttl_seconds=data.get('cache_ttl_seconds'),
+        extraction=extraction,
         last_scraped=None,
         needs_attention=False,
         consecutive_failures=0
@@ -118,21 +129,18 @@ def is_approved_source(url: str, sources: Optional[list[SourceConfig]] = None) -
     
     Args:
         url: The URL to check.
-        sources: List of sources to check against. If None, loads from default config.
+        sources: List of sources to check against. If None, uses the
+            process-wide classifier for the default config, which is built
+            once and refreshed by ScraperEngine.load_sources().
         
     Returns:
         True if URL belongs to an approved source, False otherwise.
     """
     if sources is None:
-        sources = load_sources()
+        from .domains import default_classifier
+        return default_classifier().is_approved(url)
     
-    for source in sources:
-        if url.startswith(source.base_url):
-            return True
-        for scrape_url in source.scrape_urls:
-            if url.startswith(scrape_url.rsplit('/', 1)[0]):
-                return True
-    return False
+    return ApprovedPrefixIndex(sources).is_approved(url)
 
 
 # Approved source IDs for quick reference
@@ -1,27 +1,193 @@
 """
 Deduplicator for identifying and handling duplicate records.
 """
-from typing import Optional
+import threading
+from typing import Iterable, Optional
 
-from rapidfuzz import fuzz
+from rapidfuzz import fuzz, process
 
 from .models import NormalisedOpportunity, DeduplicationResult
 
 
+class DedupIndex:
+    """
+    In-memory index of existing records, loaded once per run.
+    
+    Exact matches on source_link/apply_link are dict lookups, and the
+    lowercased "{title} {funder}" strings used for fuzzy matching are
+    built once per row instead of once per comparison. Rows are also
+    grouped into blocks (funder tokens and title prefix) so batch fuzzy
+    matching only scores plausible candidates.
+    """
+    
+    TITLE_PREFIX_LENGTH = 4
+    
+    def __init__(self, records: Iterable[dict] = ()):
+        """
+        Build the index.
+        
+        Args:
+            records: Dicts with keys: id, apply_link, source_link, funding_name, funder
+                and optionally raw_content_hash
+        """
+        self.by_source_link: dict[str, int] = {}
+        self.by_apply_link: dict[str, int] = {}
+        self.fuzzy_candidates: dict[int, str] = {}
+        self.blocks: dict[str, dict[int, str]] = {}
+        self._rows: dict[int, dict] = {}
+        self._positions: dict[int, int] = {}
+        self._lock = threading.Lock()
+        
+        for record in records:
+            self.add(record)
+    
+    def __len__(self) -> int:
+        return len(self._rows)
+    
+    def add(self, record: dict) -> None:
+        """
+        Add a row to the index, or refresh it if the id is already indexed.
+        
+        Where several rows share a link the first one indexed wins, matching
+        the order of the original linear scan.
+        """
+        record_id = record.get('id')
+        if record_id is None:
+            return
+        
+        with self._lock:
+            previous = self._rows.get(record_id)
+            if previous is not None:
+                self._discard_links(record_id, previous)
+            
+            row = {
+                'id': record_id,
+                'apply_link': record.get('apply_link') or '',
+                'source_link': record.get('source_link') or '',
+                'funding_name': record.get('funding_name') or '',
+                'funder': record.get('funder') or '',
+                'raw_content_hash': record.get('raw_content_hash') or '',
+            }
+            self._rows[record_id] = row
+            self._positions.setdefault(record_id, len(self._positions))
+            
+            if row['source_link']:
+                self.by_source_link.setdefault(row['source_link'], record_id)
+            if row['apply_link']:
+                self.by_apply_link.setdefault(row['apply_link'], record_id)
+            
+            text = fuzzy_key(row['funding_name'], row['funder'])
+            self.fuzzy_candidates[record_id] = text
+            for key in self.blocking_keys(row['funding_name'], row['funder']):
+                self.blocks.setdefault(key, {})[record_id] = text
+    
+    def unchanged_record_id(self, source_url: str, content_hash: str) -> Optional[int]:
+        """
+        Get the id of the row for source_url if its page content is unchanged.
+        
+        Args:
+            source_url: URL the page was scraped from.
+            content_hash: Hash of the page content just scraped.
+            
+        Returns:
+            Record id if a row with this source link has the same content hash, else None.
+        """
+        if not source_url or not content_hash:
+            return None
+        record_id = self.by_source_link.get(source_url)
+        if record_id is None:
+            return None
+        row = self._rows.get(record_id)
+        if row is None or row['raw_content_hash'] != content_hash:
+            return None
+        return record_id
+    
+    def blocking_keys(self, title: str, funder: str) -> set[str]:
+        """
+        Get the blocking keys for a title+funder pair.
+        
+        Keys are each funder token plus the title prefix; a candidate has to
+        share at least one key with a query to be scored in batch mode.
+        """
+        keys = {f"f:{token}" for token in (funder or '').lower().split()}
+        prefix = (title or '').lower().strip()[:self.TITLE_PREFIX_LENGTH]
+        if prefix:
+            keys.add(f"t:{prefix}")
+        return keys
+    
+    def candidates(self, key: Optional[str] = None) -> dict[int, str]:
+        """
+        Get a snapshot of fuzzy candidate strings keyed by record id.
+        
+        Args:
+            key: Optional blocking key. If None, returns all candidates.
+        """
+        with self._lock:
+            if key is None:
+                return dict(self.fuzzy_candidates)
+            return dict(self.blocks.get(key, {}))
+    
+    def position(self, record_id: int) -> int:
+        """Get the order in which a record id was first indexed."""
+        return self._positions.get(record_id, len(self._positions))
+    
+    def _discard_links(self, record_id: int, row: dict) -> None:
+        """Remove link and block entries that point at record_id."""
+        if self.by_source_link.get(row['source_link']) == record_id:
+            del self.by_source_link[row['source_link']]
+        if self.by_apply_link.get(row['apply_link']) == record_id:
+            del self.by_apply_link[row['apply_link']]
+        for key in self.blocking_keys(row['funding_name'], row['funder']):
+            block = self.blocks.get(key)
+            if block is not None:
+                block.pop(record_id, None)
+                if not block:
+                    del self.blocks[key]
+
+
+def fuzzy_key(title: str, funder: str) -> str:
+    """Build the lowercased title+funder string used for fuzzy matching."""
+    return f"{title or ''} {funder or ''}".lower().strip()
+
+
 class Deduplicator:
     """Identifies and handles duplicate records."""
     
     FUZZY_THRESHOLD = 0.92  # 92% similarity threshold (stricter to avoid false matches)
     
-    def __init__(self, get_existing_records_func=None):
+    def __init__(self, get_existing_records_func=None, index: Optional[DedupIndex] = None):
         """
         Initialize deduplicator.
         
         Args:
             get_existing_records_func: Function to get existing records from database.
                 Should return list of dicts with keys: id, apply_link, source_link, funding_name, funder
+            index: Optional pre-built index. If None, it is loaded lazily from
+                get_existing_records_func on the first check.
         """
         self._get_existing_records = get_existing_records_func
+        self._index = index
+    
+    @property
+    def index(self) -> Optional[DedupIndex]:
+        """The index used for the current run, if loaded."""
+        return self._index
+    
+    def load_index(self) -> Optional[DedupIndex]:
+        """
+        (Re)load the index of existing records.
+        
+        Call once at the start of a run; the index is then kept current
+        through DedupIndex.add as records are imported.
+        
+        Returns:
+            The loaded index, or None if no record source is configured.
+        """
+        if self._get_existing_records is None:
+            return self._index
+        
+        self._index = DedupIndex(self._get_existing_records())
+        return self._index
     
     def check_duplicate(self, record: NormalisedOpportunity) -> DeduplicationResult:
         """
@@ -36,13 +202,28 @@ class Deduplicator:
         Returns:
             DeduplicationResult with match information.
         """
-        if self._get_existing_records is None:
-            return DeduplicationResult(is_duplicate=False)
+        index = self._index
+        if index is None:
+            if self._get_existing_records is None:
+                return DeduplicationResult(is_duplicate=False)
+            index = self.load_index()
         
-        existing_records = self._get_existing_records()
+        # Priorities 1 and 2: exact URL matches
+        result = self._check_exact(record, index)
+        if result.is_duplicate:
+            return result
         
+        # Priority 3: Fuzzy match on title + funder
+        result = self._fuzzy_match_index(record.title, record.funder_name, index)
+        if result.is_duplicate:
+            return result
+        
+        return DeduplicationResult(is_duplicate=False)
+    
+    def _check_exact(self, record: NormalisedOpportunity, index: DedupIndex) -> DeduplicationResult:
+        """Check for exact matches on source URL, then apply URL."""
         # Priority 1: Check by source URL (most reliable - unique per scraped page)
-        result = self._check_by_source_url(record.source_url, existing_records)
+        result = self._lookup(index.by_source_link, record.source_url, "source_url")
         if result.is_duplicate:
             return result
         
@@ -54,93 +235,218 @@ class Deduplicator:
             'login', 'register', 'portal'
         ])
         if not is_generic_apply:
-            result = self._check_by_apply_url(record.official_apply_url, existing_records)
-            if result.is_duplicate:
-                return result
-        
-        # Priority 3: Fuzzy match on title + funder
-        result = self.fuzzy_match_title_funder(
-            record.title, record.funder_name, existing_records
-        )
-        if result.is_duplicate:
-            return result
+            return self._lookup(index.by_apply_link, record.official_apply_url, "apply_url")
         
         return DeduplicationResult(is_duplicate=False)
     
-    def _check_by_apply_url(
-        self, apply_url: str, existing_records: list[dict]
-    ) -> DeduplicationResult:
-        """Check for exact match on apply URL."""
-        if not apply_url:
+    def _lookup(self, links: dict[str, int], url: str, match_type: str) -> DeduplicationResult:
+        """Check for exact match on a URL using an index map."""
+        if not url:
             return DeduplicationResult(is_duplicate=False)
         
-        for record in existing_records:
-            if record.get('apply_link') == apply_url:
-                return DeduplicationResult(
-                    is_duplicate=True,
-                    existing_record_id=record.get('id'),
-                    match_type="apply_url",
-                    similarity_score=1.0
-                )
+        record_id = links.get(url)
+        if record_id is None:
+            return DeduplicationResult(is_duplicate=False)
         
-        return DeduplicationResult(is_duplicate=False)
+        return DeduplicationResult(
+            is_duplicate=True,
+            existing_record_id=record_id,
+            match_type=match_type,
+            similarity_score=1.0
+        )
     
-    def _check_by_source_url(
-        self, source_url: str, existing_records: list[dict]
-    ) -> DeduplicationResult:
-        """Check for exact match on source URL."""
-        if not source_url:
+    def _fuzzy_match_index(self, title: str, funder: str, index: DedupIndex) -> DeduplicationResult:
+        """Fuzzy match title+funder against the index's prebuilt strings."""
+        if not title or not funder:
             return DeduplicationResult(is_duplicate=False)
         
-        for record in existing_records:
-            if record.get('source_link') == source_url:
-                return DeduplicationResult(
-                    is_duplicate=True,
-                    existing_record_id=record.get('id'),
-                    match_type="source_url",
-                    similarity_score=1.0
-                )
+        match = process.extractOne(
+            fuzzy_key(title, funder),
+            index.candidates(),
+            scorer=fuzz.token_sort_ratio,
+            processor=None,
+            score_cutoff=self.FUZZY_THRESHOLD * 100
+        )
+        if match is None:
+            return DeduplicationResult(is_duplicate=False)
         
-        return DeduplicationResult(is_duplicate=False)
+        _, score, record_id = match
+        return DeduplicationResult(
+            is_duplicate=True,
+            existing_record_id=record_id,
+            match_type="fuzzy_title",
+            similarity_score=score / 100.0
+        )
     
-    def fuzzy_match_title_funder(
-        self, title: str, funder: str, existing_records: list[dict]
-    ) -> DeduplicationResult:
+    def check_duplicates_batch(
+        self, records: list[NormalisedOpportunity]
+    ) -> list[DeduplicationResult]:
         """
-        Perform fuzzy matching on title+funder combination.
+        Check a whole run's records for duplicates in one pass.
+        
+        Exact URL matches use the same priority order as check_duplicate.
+        Records left over are fuzzy matched in bulk: each distinct query
+        string is scored once, and only against candidates that share a
+        blocking key (funder token or title prefix) with it.
         
-        Uses rapidfuzz for efficient string matching with 85% threshold.
+        Records are also matched against the new records before them in
+        the batch, as importing them one at a time would have done: a
+        record with no exact match in the index that matches an earlier
+        new record gets batch_match set to that record's position. Matches
+        on existing rows win, except that an exact in-batch match beats a
+        fuzzy match on an existing row.
+        
+        Args:
+            records: Normalised opportunities to check.
+            
+        Returns:
+            DeduplicationResult for each record, in input order.
         """
-        if not title or not funder:
-            return DeduplicationResult(is_duplicate=False)
+        if not records:
+            return []
         
-        # Combine title and funder for matching
-        search_text = f"{title} {funder}".lower().strip()
+        index = self._index
+        if index is None:
+            if self._get_existing_records is None:
+                return [DeduplicationResult(is_duplicate=False) for _ in records]
+            index = self.load_index()
         
-        best_match = None
-        best_score = 0.0
+        results: list[Optional[DeduplicationResult]] = [None] * len(records)
+        pending: dict[str, list[int]] = {}
+        pending_keys: dict[str, set[str]] = {}
         
-        for record in existing_records:
-            existing_title = record.get('funding_name', '')
-            existing_funder = record.get('funder', '')
-            existing_text = f"{existing_title} {existing_funder}".lower().strip()
+        for i, record in enumerate(records):
+            result = self._check_exact(record, index)
+            if result.is_duplicate:
+                results[i] = result
+                continue
             
-            # Calculate similarity using token_sort_ratio for better matching
-            score = fuzz.token_sort_ratio(search_text, existing_text) / 100.0
+            if not record.title or not record.funder_name:
+                results[i] = DeduplicationResult(is_duplicate=False)
+                continue
             
-            if score > best_score:
-                best_score = score
-                best_match = record
-        
-        if best_score >= self.FUZZY_THRESHOLD:
-            return DeduplicationResult(
-                is_duplicate=True,
-                existing_record_id=best_match.get('id'),
-                match_type="fuzzy_title",
-                similarity_score=best_score
+            query = fuzzy_key(record.title, record.funder_name)
+            pending.setdefault(query, []).append(i)
+            pending_keys.setdefault(query, set()).update(
+                index.blocking_keys(record.title, record.funder_name)
             )
         
-        return DeduplicationResult(is_duplicate=False)
+        # Group queries by blocking key so each block's choices are built once
+        queries_by_key: dict[str, list[str]] = {}
+        for query, keys in pending_keys.items():
+            for key in keys:
+                queries_by_key.setdefault(key, []).append(query)
+        
+        best: dict[str, tuple[float, int]] = {}
+        cutoff = self.FUZZY_THRESHOLD * 100
+        for key, queries in queries_by_key.items():
+            choices = index.candidates(key)
+            if not choices:
+                continue
+            for query in queries:
+                match = process.extractOne(
+                    query, choices,
+                    scorer=fuzz.token_sort_ratio,
+                    processor=None,
+                    score_cutoff=cutoff
+                )
+                if match is None:
+                    continue
+                _, score, record_id = match
+                current = best.get(query)
+                if (current is None or score > current[0] or
+                        (score == current[0] and index.position(record_id) < index.position(current[1]))):
+                    best[query] = (score, record_id)
+        
+        for query, positions in pending.items():
+            match = best.get(query)
+            for i in positions:
+                if match is None:
+                    results[i] = DeduplicationResult(is_duplicate=False)
+                else:
+                    results[i] = DeduplicationResult(
+                        is_duplicate=True,
+                        existing_record_id=match[1],
+                        match_type="fuzzy_title",
+                        similarity_score=match[0] / 100.0
+                    )
+        
+        self._match_within_batch(records, results)
+        return results
+    
+    def _match_within_batch(
+        self,
+        records: list[NormalisedOpportunity],
+        results: list[DeduplicationResult]
+    ) -> None:
+        """Point records at earlier new records of the batch they duplicate."""
+        provisional = DedupIndex()
+        for i, record in enumerate(records):
+            result = results[i]
+            if result.is_duplicate and result.match_type != "fuzzy_title":
+                continue
+            
+            match = self._check_exact(record, provisional)
+            if not match.is_duplicate and not result.is_duplicate:
+                match = self._fuzzy_match_blocked(record.title, record.funder_name, provisional)
+            
+            if match.is_duplicate:
+                results[i] = DeduplicationResult(
+                    is_duplicate=True,
+                    match_type=match.match_type,
+                    similarity_score=match.similarity_score,
+                    batch_match=match.existing_record_id
+                )
+            elif not result.is_duplicate:
+                # A new row; later records in the batch may duplicate it
+                provisional.add({
+                    'id': i,
+                    'apply_link': record.official_apply_url,
+                    'source_link': record.source_url,
+                    'funding_name': record.title,
+                    'funder': record.funder_name,
+                })
+    
+    def _fuzzy_match_blocked(self, title: str, funder: str, index: DedupIndex) -> DeduplicationResult:
+        """Fuzzy match title+funder against the index rows sharing a blocking key."""
+        if not title or not funder:
+            return DeduplicationResult(is_duplicate=False)
+        
+        choices: dict[int, str] = {}
+        for key in index.blocking_keys(title, funder):
+            choices.update(index.candidates(key))
+        if not choices:
+            return DeduplicationResult(is_duplicate=False)
+        
+        # Lowest position first, so ties go to the earliest row
+        ordered = {record_id: choices[record_id] for record_id in sorted(choices, key=index.position)}
+        match = process.extractOne(
+            fuzzy_key(title, funder),
+            ordered,
+            scorer=fuzz.token_sort_ratio,
+            processor=None,
+            score_cutoff=self.FUZZY_THRESHOLD * 100
+        )
+        if match is None:
+            return DeduplicationResult(is_duplicate=False)
+        
+        _, score, record_id = match
+        return DeduplicationResult(
+            is_duplicate=True,
+            existing_record_id=record_id,
+            match_type="fuzzy_title",
+            similarity_score=score / 100.0
+        )
+    
+    def fuzzy_match_title_funder(
+        self, title: str, funder: str, existing_records: list[dict]
+    ) -> DeduplicationResult:
+        """
+        Perform fuzzy matching on title+funder combination.
+        
+        Uses rapidfuzz for efficient string matching with 92% threshold.
+        """
+        return self._fuzzy_match_index(title, funder, DedupIndex(existing_records))
 
 
 def create_django_deduplicator():
@@ -154,7 +460,8 @@ def create_django_deduplicator():
         from opportunities.models import FundingOpportunity
         return list(
             FundingOpportunity.objects.values(
-                'id', 'apply_link', 'source_link', 'funding_name', 'funder'
+                'id', 'apply_link', 'source_link', 'funding_name', 'funder',
+                'raw_content_hash'
             )
         )
     
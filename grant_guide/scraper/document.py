@@ -0,0 +1,74 @@
+"""
+Parsed HTML documents shared between the stages that read a page.
+
+A ParsedDocument is the fetched HTML string itself, carrying its parse
+with it: the BeautifulSoup tree and the lxml tree are each built on first
+use and then reused by every adapter helper that reads the page
+(parse_html, the selector helpers), so a page is parsed at most once
+however many of them look at it.
+
+Because it is a str, adapters can keep storing it as raw_html and hashing
+it; pickling sends only the markup and URL, never the trees.
+"""
+import threading
+from functools import cached_property
+
+from bs4 import BeautifulSoup
+import lxml.html
+from lxml import etree
+
+# lxml parsers must not be shared between threads
+_parsers = threading.local()
+
+
+def _html_parser() -> lxml.html.HTMLParser:
+    if not hasattr(_parsers, 'html'):
+        _parsers.html = lxml.html.HTMLParser(encoding='utf-8')
+    return _parsers.html
+
+
+class ParsedDocument(str):
+    """HTML string with its parse trees built lazily and cached."""
+    
+    def __new__(cls, html: str, url: str = ""):
+        document = super().__new__(cls, html)
+        document.url = url
+        return document
+    
+    def __reduce__(self):
+        return (self.__class__, (str(self), self.url))
+    
+    @property
+    def html(self) -> str:
+        """The markup as a plain string."""
+        return str(self)
+    
+    @cached_property
+    def soup(self) -> BeautifulSoup:
+        """BeautifulSoup tree of the page."""
+        return BeautifulSoup(self.html, 'lxml')
+    
+    @cached_property
+    def tree(self):
+        """lxml.html document tree of the page (an empty <html> if blank)."""
+        # Parsed as UTF-8 bytes so pages with an XML encoding declaration load
+        try:
+            return lxml.html.document_fromstring(self.html.encode('utf-8', 'replace'), parser=_html_parser())
+        except etree.ParserError:
+            return lxml.html.document_fromstring(b"<html></html>", parser=_html_parser())
+
+
+def as_document(html: str, url: str = "") -> ParsedDocument:
+    """
+    Wrap html in a ParsedDocument, reusing it if it already is one.
+    
+    Args:
+        html: HTML string or ParsedDocument.
+        url: URL the page was fetched from.
+    
+    Returns:
+        ParsedDocument for html.
+    """
+    if isinstance(html, ParsedDocument):
+        return html
+    return ParsedDocument(html or "", url)
@@ -0,0 +1,121 @@
+"""
+Domain classification shared by the compliance checker, URL frontier and importer.
+
+Two questions are asked of every URL a run touches: is it on a social
+media site, and is it under an approved source? Social media domains are
+held in a suffix trie keyed by reversed host labels, so "m.facebook.com"
+matches "facebook.com" while "fax.company.co.za" does not match "x.com".
+Approved sources use the frontier's ApprovedPrefixIndex. Both answer in
+time proportional to the number of host labels and path segments, not
+the number of configured domains or sources.
+"""
+from functools import lru_cache
+from typing import Iterable, Optional
+from urllib.parse import urlsplit
+
+from .frontier import ApprovedPrefixIndex
+from .models import SourceConfig
+
+# Social media domains that are not acceptable as sole contact
+SOCIAL_MEDIA_DOMAINS = (
+    'whatsapp.com', 'wa.me', 'chat.whatsapp.com',
+    'telegram.org', 't.me', 'telegram.me',
+    'facebook.com', 'fb.com', 'fb.me',
+    'twitter.com', 'x.com',
+    'instagram.com',
+    'tiktok.com',
+)
+
+# Trie key marking the end of a registered domain (labels are never empty)
+_END = ''
+
+
+def host_of(url_or_host: str) -> str:
+    """Lowercase host of a URL (or of a bare host name), without port or trailing dot."""
+    if '//' in url_or_host:
+        host = urlsplit(url_or_host).hostname or ''
+    else:
+        host = url_or_host.split(':', 1)[0]
+    return host.lower().rstrip('.')
+
+
+class DomainSuffixTrie:
+    """Set of domains matching themselves and all of their subdomains."""
+    
+    def __init__(self, domains: Iterable[str]):
+        self._root: dict = {}
+        for domain in domains:
+            node = self._root
+            for label in reversed(host_of(domain).split('.')):
+                node = node.setdefault(label, {})
+            node[_END] = host_of(domain)
+    
+    def match(self, url_or_host: str) -> Optional[str]:
+        """
+        Find the registered domain a host belongs to.
+        
+        Args:
+            url_or_host: URL or host name.
+        
+        Returns:
+            The registered domain equal to or a parent of the host, or None.
+        """
+        host = host_of(url_or_host)
+        if not host:
+            return None
+        node = self._root
+        for label in reversed(host.split('.')):
+            node = node.get(label)
+            if node is None:
+                return None
+            if _END in node:
+                return node[_END]
+        return None
+    
+    def __contains__(self, url_or_host: str) -> bool:
+        return self.match(url_or_host) is not None
+
+
+@lru_cache(maxsize=None)
+def social_media_trie(domains: tuple[str, ...] = SOCIAL_MEDIA_DOMAINS) -> DomainSuffixTrie:
+    """Get the shared trie for a set of social media domains."""
+    return DomainSuffixTrie(domains)
+
+
+class DomainClassifier:
+    """Answers the approved-source and social media questions for URLs."""
+    
+    def __init__(
+        self,
+        sources: Iterable[SourceConfig],
+        social_media_domains: Iterable[str] = SOCIAL_MEDIA_DOMAINS
+    ):
+        """
+        Build the classifier.
+        
+        Args:
+            sources: Approved sources.
+            social_media_domains: Domains treated as social media.
+        """
+        self.approved = ApprovedPrefixIndex(sources)
+        self.social_media = social_media_trie(tuple(social_media_domains))
+    
+    def is_approved(self, url: str) -> bool:
+        """Check if url falls under an approved source."""
+        return self.approved.is_approved(url)
+    
+    def is_social_media(self, url: str) -> bool:
+        """Check if url (or host) is on a social media domain."""
+        return url in self.social_media
+
+
+@lru_cache(maxsize=1)
+def default_classifier() -> DomainClassifier:
+    """
+    Get the classifier for the sources in sources.yaml, built once per process.
+    
+    Later edits to sources.yaml are not seen until the cache is cleared;
+    ScraperEngine.load_sources() clears it whenever it reloads the file.
+    """
+    from .config import load_sources
+    return DomainClassifier(load_sources())
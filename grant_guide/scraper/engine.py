@@ -5,25 +5,55 @@ import importlib
 import logging
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Iterator, Optional
+from typing import Iterator, Optional, TextIO, Union
 
 from .models import (
     SourceConfig, RawOpportunity, NormalisedOpportunity,
     ComplianceResult, DeduplicationResult, ImportResult
 )
 from .config import load_sources
-from .http_client import HttpClient
+from .domains import DomainClassifier, default_classifier
+from .http_client import CircuitOpenError, HttpClient, compute_content_hash
 from .normaliser import RecordNormaliser
 from .deduplicator import Deduplicator
 from .compliance import ComplianceChecker
 from .status import StatusManager
 from .importer import DjangoImporter
-from .exporter import JsonExporter
+from .exporter import ExportFormat, JsonExporter
 from .feed_monitor import FeedMonitor, FeedCache
+from .pipeline import PipelineConfig, StagedPipeline
+from .cancellation import CancellationToken, cancellation_scope, check_cancelled, current_token
+from .frontier import UrlFrontier
 
 logger = logging.getLogger('scraper.engine')
 
 
+def normalise_and_check(
+    raw: RawOpportunity,
+    source: SourceConfig,
+    normaliser: RecordNormaliser,
+    compliance_checker: ComplianceChecker
+) -> Optional[NormalisedOpportunity]:
+    """
+    Normalise a raw record and check compliance.
+    
+    Module-level so worker processes can run it without an engine.
+    
+    Returns:
+        The normalised record, or None if it was rejected.
+    """
+    # 1. Normalise
+    normalised = normaliser.normalise(raw, source.source_name)
+    
+    # 2. Check compliance
+    compliance = compliance_checker.check(normalised)
+    if not compliance.is_compliant and compliance.rejection_reason:
+        logger.info(f"Rejected: {normalised.title} - {compliance.rejection_reason}")
+        return None
+    
+    return normalised
+
+
 @dataclass
 class SourceResult:
     """Result of processing a single source."""
@@ -34,6 +64,7 @@ class SourceResult:
     records_updated: int = 0
     records_skipped: int = 0
     records_rejected: int = 0
+    records_unchanged: int = 0
     errors: list[str] = field(default_factory=list)
     success: bool = True
 
@@ -50,6 +81,7 @@ class ScrapeResult:
     total_records_updated: int = 0
     total_records_skipped: int = 0
     total_records_rejected: int = 0
+    total_records_unchanged: int = 0
     source_results: list[SourceResult] = field(default_factory=list)
 
 
@@ -57,6 +89,8 @@ class ScraperEngine:
     """Orchestrates the scraping pipeline across all sources."""
     
     MAX_CONSECUTIVE_FAILURES = 3
+    IMPORT_BATCH_SIZE = 50  # Records written per bulk import
+    NORMALISE_BATCH_SIZE = 50  # Raw records normalised together by scrape_records
     
     def __init__(
         self,
@@ -68,11 +102,19 @@ class ScraperEngine:
         importer: Optional[DjangoImporter] = None,
         exporter: Optional[JsonExporter] = None,
         feed_monitor: Optional[FeedMonitor] = None,
+        skip_unchanged: bool = True,
+        pipeline_config: Optional[PipelineConfig] = None,
     ):
         """
         Initialize scraper engine with dependencies.
         
         All dependencies are optional and will be created with defaults if not provided.
+        
+        Args:
+            skip_unchanged: Skip normalising and importing pages whose content hash
+                matches the stored record (only their last_verified date is bumped).
+            pipeline_config: Run sources through the staged, concurrent pipeline
+                with these settings instead of one record at a time.
         """
         self.http_client = http_client or HttpClient()
         self.normaliser = normaliser or RecordNormaliser()
@@ -82,23 +124,37 @@ class ScraperEngine:
         self.importer = importer or DjangoImporter()
         self.exporter = exporter or JsonExporter()
         self.feed_monitor = feed_monitor or FeedMonitor(self.http_client, FeedCache())
+        self.skip_unchanged = skip_unchanged
+        self.pipeline_config = pipeline_config
         
         self._sources: dict[str, SourceConfig] = {}
         self._adapters: dict[str, type] = {}
-
+    
     def load_sources(self, sources_file: Optional[str] = None) -> None:
         """Load source configurations from YAML file."""
         sources = load_sources(sources_file)
         self._sources = {s.source_id: s for s in sources}
+        
+        response_cache = getattr(self.http_client, 'response_cache', None)
+        if response_cache is not None:
+            response_cache.set_source_ttls(sources)
+        
+        # Approved-source checks must follow edits to the sources file
+        if sources_file is None:
+            default_classifier.cache_clear()
+        if getattr(self.importer, 'classifier', None) is not None:
+            self.importer.classifier = DomainClassifier(sources)
+        
         logger.info(f"Loaded {len(self._sources)} source configurations")
     
-    def get_adapter(self, source: SourceConfig):
+    def get_adapter(self, source: SourceConfig, frontier: Optional[UrlFrontier] = None):
         """
         Get or create adapter instance for a source.
         
         Args:
             source: Source configuration.
-            
+            frontier: URL frontier shared by the adapters of the current run.
+        
         Returns:
             Adapter instance.
         """
@@ -109,12 +165,17 @@ class ScraperEngine:
             self._adapters[source.adapter_class] = getattr(module, class_name)
         
         adapter_class = self._adapters[source.adapter_class]
-        return adapter_class(source, self.http_client)
+        adapter = adapter_class(source, self.http_client)
+        adapter.frontier = frontier
+        index = self.deduplicator.index
+        adapter.known_urls = index.by_source_link if index is not None else None
+        return adapter
     
     def run(
         self,
         source_id: Optional[str] = None,
-        dry_run: bool = False
+        dry_run: bool = False,
+        cancel_token: Optional[CancellationToken] = None
     ) -> ScrapeResult:
         """
         Run the scraping pipeline.
@@ -122,10 +183,17 @@ class ScraperEngine:
         Args:
             source_id: Optional source ID to run single source.
             dry_run: If True, don't import to database.
-            
+            cancel_token: Optional token to stop the run early. It is checked
+                between sources, records and HTTP requests; a cancelled source
+                is reported as failed and remaining sources are skipped.
+        
         Returns:
             ScrapeResult with summary of the run.
         """
+        if cancel_token is not None:
+            with cancellation_scope(cancel_token):
+                return self.run(source_id, dry_run)
+        
         result = ScrapeResult(started_at=datetime.now())
         
         # Load sources if not already loaded
@@ -144,9 +212,47 @@ class ScraperEngine:
         
         logger.info(f"Starting scrape run for {len(sources)} sources")
         
+        source_urls = [url for s in sources for url in [s.base_url, *s.scrape_urls]]
+        
+        # Give this run's sites closed circuits and full retry budgets
+        reset_circuits = getattr(self.http_client, 'reset_circuits', None)
+        if reset_circuits is not None:
+            reset_circuits(source_urls)
+        
+        # Load robots.txt for every source concurrently, ahead of the first request
+        prefetch_robots = getattr(self.http_client, 'prefetch_robots', None)
+        if prefetch_robots is not None:
+            prefetch_robots(source_urls)
+        
+        # Space requests per domain by each source's rate_limit_seconds
+        configure_rate_limits = getattr(self.http_client, 'configure_rate_limits', None)
+        if configure_rate_limits is not None:
+            configure_rate_limits(sources)
+        
+        # Pick up Industry/Province changes made by other processes
+        lookups = getattr(self.importer, 'lookups', None)
+        if lookups is not None:
+            lookups.invalidate()
+        
+        # Load existing records once; the importer keeps the index current
+        dedup_index = self.deduplicator.load_index()
+        if dedup_index is not None:
+            self.importer.dedup_index = dedup_index
+        
+        # Each page is fetched at most once per run, across all sources
+        frontier = UrlFrontier.for_sources(self._sources.values())
+        
         # Process each source
-        for source in sources:
-            source_result = self._process_source(source, dry_run)
+        if self.pipeline_config is not None:
+            source_results = StagedPipeline(self, self.pipeline_config).run(sources, dry_run, frontier)
+        else:
+            source_results = []
+            for source in sources:
+                if self._cancelled():
+                    break
+                source_results.append(self._process_source(source, dry_run, frontier))
+        
+        for source_result in source_results:
             result.source_results.append(source_result)
             
             if source_result.success:
@@ -160,13 +266,19 @@ class ScraperEngine:
             result.total_records_updated += source_result.records_updated
             result.total_records_skipped += source_result.records_skipped
             result.total_records_rejected += source_result.records_rejected
+            result.total_records_unchanged += source_result.records_unchanged
         
         result.completed_at = datetime.now()
         self._log_summary(result)
         
         return result
     
-    def _process_source(self, source: SourceConfig, dry_run: bool) -> SourceResult:
+    def _process_source(
+        self,
+        source: SourceConfig,
+        dry_run: bool,
+        frontier: Optional[UrlFrontier] = None
+    ) -> SourceResult:
         """Process a single source with error isolation."""
         result = SourceResult(
             source_id=source.source_id,
@@ -177,99 +289,283 @@ class ScraperEngine:
         
         try:
             # Get adapter for this source
-            adapter = self.get_adapter(source)
+            adapter = self.get_adapter(source, frontier)
+            unchanged_ids = []
+            
+            # Checked records, deduplicated and imported in batches
+            pending: list[NormalisedOpportunity] = []
             
             # Scrape opportunities
-            for raw in adapter.scrape():
-                result.records_found += 1
-                
-                try:
-                    # Process through pipeline
-                    import_result = self._process_record(raw, source, dry_run)
+            try:
+                for raw in adapter.scrape():
+                    check_cancelled()
+                    result.records_found += 1
                     
-                    if import_result:
-                        if import_result.action == 'created':
-                            result.records_created += 1
-                        elif import_result.action == 'updated':
-                            result.records_updated += 1
-                        elif import_result.action == 'skipped':
-                            result.records_skipped += 1
+                    try:
+                        checked = self._check_record(raw, source)
+                    except Exception as e:
+                        self._record_error(result, raw, e)
+                        continue
+                    
+                    if isinstance(checked, NormalisedOpportunity):
+                        pending.append(checked)
+                        if len(pending) >= self.IMPORT_BATCH_SIZE:
+                            self._flush_imports(pending, result, dry_run)
                     else:
-                        result.records_rejected += 1
-                        
-                except Exception as e:
-                    logger.error(f"Error processing record from {source.source_id}: {e}")
-                    result.errors.append(str(e))
-                    result.records_skipped += 1
-            
-            # Update source metadata
-            source.last_scraped = datetime.now()
-            source.consecutive_failures = 0
+                        self._count_import(result, checked, unchanged_ids, raw.source_url)
+            finally:
+                # Pages already fetched keep their validators, so import what
+                # was checked even if the source stops part way
+                self._flush_imports(pending, result, dry_run)
             
+            self._finish_source(source, adapter, result, unchanged_ids, dry_run)
+        
         except Exception as e:
-            logger.error(f"Error processing source {source.source_id}: {e}")
-            result.success = False
-            result.errors.append(str(e))
-            
-            # Track consecutive failures
-            source.consecutive_failures += 1
-            if source.consecutive_failures >= self.MAX_CONSECUTIVE_FAILURES:
-                source.needs_attention = True
-                logger.warning(
-                    f"Source {source.source_id} marked for attention "
-                    f"after {source.consecutive_failures} consecutive failures"
-                )
+            self._fail_source(source, result, e)
         
+        self._log_source_result(source, result)
+        return result
+    
+    def _cancelled(self) -> bool:
+        """Whether the current run's cancellation token is cancelled."""
+        token = current_token()
+        if token is not None and token.cancelled:
+            logger.warning(f"Scrape run cancelled: {token.reason}")
+            return True
+        return False
+    
+    def _record_error(
+        self,
+        result: SourceResult,
+        raw: Union[RawOpportunity, NormalisedOpportunity],
+        error: Exception
+    ) -> None:
+        """Count a record that failed in the pipeline."""
+        logger.error(f"Error processing record from {result.source_id}: {error}")
+        result.errors.append(str(error))
+        result.records_skipped += 1
+        self._forget_validators(raw.source_url)
+    
+    def _finish_source(
+        self,
+        source: SourceConfig,
+        adapter,
+        result: SourceResult,
+        unchanged_ids: list[int],
+        dry_run: bool
+    ) -> None:
+        """
+        Verify unchanged records and update source metadata after a successful scrape.
+        
+        Raises:
+            CircuitOpenError: If the source's site failed too often for the
+                scrape to count as successful (adapters only log failed
+                listing pages).
+        """
+        circuit_open = getattr(self.http_client, 'circuit_open', None)
+        if circuit_open is not None:
+            for url in [source.base_url, *source.scrape_urls]:
+                if circuit_open(url):
+                    raise CircuitOpenError(f"Too many consecutive failures fetching {url}")
+        
+        # Pages behind a login, CAPTCHA or paywall
+        result.records_rejected += len(adapter.gated_urls)
+        
+        # Pages the server reported as not modified since the last run
+        result.records_unchanged += len(adapter.unchanged_urls)
+        index = self.deduplicator.index
+        if index is not None:
+            unchanged_ids.extend(
+                index.by_source_link[url] for url in adapter.unchanged_urls
+                if url in index.by_source_link
+            )
+        
+        # Unchanged records are still live on the source; one bulk update
+        if unchanged_ids and not dry_run:
+            self.importer.mark_verified(unchanged_ids)
+        
+        # Update source metadata
+        source.last_scraped = datetime.now()
+        source.consecutive_failures = 0
+    
+    def _fail_source(self, source: SourceConfig, result: SourceResult, error: Exception) -> None:
+        """Record a source-level failure and flag repeatedly failing sources."""
+        logger.error(f"Error processing source {source.source_id}: {error}")
+        result.success = False
+        result.errors.append(str(error))
+        
+        # Track consecutive failures
+        source.consecutive_failures += 1
+        if source.consecutive_failures >= self.MAX_CONSECUTIVE_FAILURES:
+            source.needs_attention = True
+            logger.warning(
+                f"Source {source.source_id} marked for attention "
+                f"after {source.consecutive_failures} consecutive failures"
+            )
+    
+    def _log_source_result(self, source: SourceConfig, result: SourceResult) -> None:
+        """Log the per-source counts."""
         logger.info(
             f"Completed {source.source_name}: "
             f"found={result.records_found}, created={result.records_created}, "
-            f"updated={result.records_updated}, skipped={result.records_skipped}"
+            f"updated={result.records_updated}, skipped={result.records_skipped}, "
+            f"unchanged={result.records_unchanged}"
         )
-        
-        return result
     
-    def _process_record(
+    def _forget_validators(self, url: str) -> None:
+        """Drop stored validators so a failed or rejected page is fetched in full next run."""
+        store = getattr(self.http_client, 'validator_store', None)
+        if store is not None and url:
+            store.delete(url)
+    
+    def _check_record(
         self,
         raw: RawOpportunity,
-        source: SourceConfig,
-        dry_run: bool
-    ) -> Optional[ImportResult]:
+        source: SourceConfig
+    ) -> Union[ImportResult, NormalisedOpportunity, None]:
         """
-        Process a single record through the pipeline.
+        Run the unchanged-page check, normalisation and compliance steps.
         
-        Pipeline: Normalise → Deduplicate → Validate → Import
+        Returns:
+            An 'unchanged' ImportResult, None if rejected, or the normalised record.
         """
-        # 1. Normalise
-        normalised = self.normaliser.normalise(raw, source.source_name)
+        # 0. Skip pages that have not changed since they were imported
+        unchanged_id = self._unchanged_record_id(raw)
+        if unchanged_id is not None:
+            logger.debug(f"Unchanged: {raw.source_url}")
+            return ImportResult(success=True, action='unchanged', record_id=unchanged_id)
         
-        # 2. Check compliance
-        compliance = self.compliance_checker.check(normalised)
-        if not compliance.is_compliant and compliance.rejection_reason:
-            logger.info(f"Rejected: {normalised.title} - {compliance.rejection_reason}")
-            return None
+        return normalise_and_check(raw, source, self.normaliser, self.compliance_checker)
+    
+    def _match_records(
+        self,
+        records: list[NormalisedOpportunity]
+    ) -> list[tuple[NormalisedOpportunity, Optional[int], Optional[int]]]:
+        """
+        Run the deduplication and status steps for a batch of records.
+        
+        Fuzzy matching is blocked: each record is only scored against
+        existing rows sharing a funder token or title prefix with it.
+        Records are also matched against earlier new records of the batch.
         
+        Returns:
+            (normalised record, existing record id, position of the earlier
+            record in the batch it duplicates) per record, in order.
+        """
+        matched = []
         # 3. Check for duplicates
-        dedup = self.deduplicator.check_duplicate(normalised)
-        existing_id = dedup.existing_record_id if dedup.is_duplicate else None
+        for normalised, dedup in zip(records, self.deduplicator.check_duplicates_batch(records)):
+            existing_id = dedup.existing_record_id if dedup.is_duplicate else None
+            batch_match = dedup.batch_match if dedup.is_duplicate else None
+            
+            if dedup.is_duplicate:
+                logger.debug(
+                    f"Duplicate found: {normalised.title} "
+                    f"(match_type={dedup.match_type}, score={dedup.similarity_score})"
+                )
+            
+            # 4. Determine final status
+            normalised.status = self.status_manager.determine_status(normalised)
+            matched.append((normalised, existing_id, batch_match))
         
-        if dedup.is_duplicate:
-            logger.debug(
-                f"Duplicate found: {normalised.title} "
-                f"(match_type={dedup.match_type}, score={dedup.similarity_score})"
-            )
+        return matched
+    
+    def _dry_run_result(
+        self,
+        normalised: NormalisedOpportunity,
+        existing_id: Optional[int],
+        batch_match: Optional[int] = None
+    ) -> ImportResult:
+        """Result reported for a record that a dry run does not import."""
+        return ImportResult(
+            success=True,
+            action='created' if not existing_id and batch_match is None else 'updated',
+            record_id=existing_id
+        )
+    
+    def _flush_imports(
+        self,
+        pending: list[NormalisedOpportunity],
+        result: SourceResult,
+        dry_run: bool = False
+    ) -> None:
+        """Deduplicate and import pending records as one batch and count the outcomes."""
+        if not pending:
+            return
         
-        # 4. Determine final status
-        normalised.status = self.status_manager.determine_status(normalised)
+        records = list(pending)
+        pending.clear()
+        
+        try:
+            matched = self._match_records(records)
+        except Exception as e:
+            for record in records:
+                self._record_error(result, record, e)
+            return
         
-        # 5. Import (unless dry run)
         if dry_run:
-            return ImportResult(
-                success=True,
-                action='created' if not existing_id else 'updated',
-                record_id=existing_id
+            for normalised, existing_id, batch_match in matched:
+                self._count_import(result, self._dry_run_result(normalised, existing_id, batch_match))
+            return
+        
+        try:
+            import_results = self.importer.import_batch(
+                [record for record, _, _ in matched],
+                [existing_id for _, existing_id, _ in matched],
+                [batch_match for _, _, batch_match in matched]
             )
+        except Exception as e:
+            logger.error(f"Error importing batch from {result.source_id}: {e}")
+            result.errors.append(str(e))
+            result.records_skipped += len(records)
+            for record in records:
+                self._forget_validators(record.source_url)
+            return
+        
+        for record, import_result in zip(records, import_results):
+            self._count_import(result, import_result, source_url=record.source_url)
+    
+    def _count_import(
+        self,
+        result: SourceResult,
+        import_result: Optional[ImportResult],
+        unchanged_ids: Optional[list[int]] = None,
+        source_url: str = ""
+    ) -> None:
+        """
+        Add one record's outcome to the source totals.
         
-        return self.importer.import_record(normalised, existing_id)
+        Pages that were rejected or failed to import lose their validators
+        (looked up by source_url), so they are fetched and processed in
+        full next run instead of being reported as not modified.
+        """
+        if import_result is None or not import_result.success:
+            self._forget_validators(source_url)
+        
+        if import_result is None:
+            result.records_rejected += 1
+        elif import_result.action == 'created':
+            result.records_created += 1
+        elif import_result.action == 'updated':
+            result.records_updated += 1
+        elif import_result.action == 'skipped':
+            result.records_skipped += 1
+        elif import_result.action == 'unchanged':
+            result.records_unchanged += 1
+            if unchanged_ids is not None:
+                unchanged_ids.append(import_result.record_id)
+    
+    def _unchanged_record_id(self, raw: RawOpportunity) -> Optional[int]:
+        """Get the stored record id if this page's content is unchanged."""
+        # Static adapters carry no page content, so there is nothing to compare
+        if not self.skip_unchanged or not raw.raw_html:
+            return None
+        index = self.deduplicator.index
+        if index is None:
+            return None
+        return index.unchanged_record_id(
+            raw.source_url, compute_content_hash(raw.raw_html)
+        )
     
     def scrape_to_json(
         self,
@@ -282,33 +578,82 @@ class ScraperEngine:
         Args:
             source_id: Optional source ID to scrape.
             output_path: Optional file path for JSON output.
-            
+        
         Returns:
             JSON string of scraped records.
         """
-        records = []
+        return self.exporter.export(list(self.scrape_records(source_id)), output_path)
+    
+    def scrape_to_stream(
+        self,
+        output: Union[str, TextIO, None] = None,
+        source_id: Optional[str] = None,
+        fmt: ExportFormat = ExportFormat.JSON,
+        compress: Optional[bool] = None
+    ) -> int:
+        """
+        Scrape and stream records to a file or stream without importing.
+        
+        Each record is written as soon as it is normalised, so memory use
+        does not grow with the number of records.
+        
+        Args:
+            output: File path, open text stream, or None for stdout.
+            source_id: Optional source ID to scrape.
+            fmt: Output layout (JSON array or NDJSON).
+            compress: Gzip the file. If None, files ending in .gz are gzipped.
         
+        Returns:
+            Number of records written.
+        """
+        with self.exporter.open_stream(output, fmt, compress) as writer:
+            return writer.write_all(self.scrape_records(source_id))
+    
+    def scrape_records(self, source_id: Optional[str] = None) -> Iterator[NormalisedOpportunity]:
+        """
+        Scrape and yield compliant records without importing them.
+        
+        Args:
+            source_id: Optional source ID to scrape.
+        
+        Yields:
+            Normalised records with their status set. Each source's pages are
+            normalised in batches of NORMALISE_BATCH_SIZE.
+        """
         if not self._sources:
             self.load_sources()
         
         sources = ([self._sources[source_id]] if source_id 
                    else [s for s in self._sources.values() if s.is_active])
         
+        # Same per-run de-duplication as run(), so dry runs see the same pages
+        frontier = UrlFrontier.for_sources(self._sources.values())
+        
         for source in sources:
             try:
-                adapter = self.get_adapter(source)
+                adapter = self.get_adapter(source, frontier)
+                batch: list[RawOpportunity] = []
                 for raw in adapter.scrape():
-                    normalised = self.normaliser.normalise(raw, source.source_name)
-                    compliance = self.compliance_checker.check(normalised)
-                    
-                    if compliance.is_compliant or not compliance.rejection_reason:
-                        normalised.status = self.status_manager.determine_status(normalised)
-                        records.append(normalised)
-                        
+                    batch.append(raw)
+                    if len(batch) >= self.NORMALISE_BATCH_SIZE:
+                        yield from self._checked_batch(batch, source)
+                        batch = []
+                yield from self._checked_batch(batch, source)
+            
             except Exception as e:
                 logger.error(f"Error scraping {source.source_id}: {e}")
-        
-        return self.exporter.export(records, output_path)
+    
+    def _checked_batch(
+        self,
+        batch: list[RawOpportunity],
+        source: SourceConfig
+    ) -> Iterator[NormalisedOpportunity]:
+        """Normalise and compliance-check a batch of raw records together and yield the compliant ones."""
+        records = self.normaliser.normalise_batch(batch, source.source_name)
+        for normalised, compliance in zip(records, self.compliance_checker.check_many(records)):
+            if compliance.is_compliant or not compliance.rejection_reason:
+                normalised.status = self.status_manager.determine_status(normalised)
+                yield normalised
     
     def _log_summary(self, result: ScrapeResult) -> None:
         """Log summary of scrape run."""
@@ -325,4 +670,5 @@ class ScraperEngine:
         logger.info(f"Records updated: {result.total_records_updated}")
         logger.info(f"Records skipped: {result.total_records_skipped}")
         logger.info(f"Records rejected: {result.total_records_rejected}")
+        logger.info(f"Records unchanged: {result.total_records_unchanged}")
         logger.info("=" * 60)
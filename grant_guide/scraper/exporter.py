@@ -1,16 +1,99 @@
 """
 JSON exporter for outputting scraped records.
+
+Besides building one JSON document, records can be streamed: a
+RecordWriter writes each record as it arrives, either as NDJSON (one
+record per line) or as a JSON array in the same layout as export(), so
+memory stays constant however many records a run produces and consumers
+can start reading before the run ends.
 """
+import gzip
 import json
 import sys
 from datetime import date
 from decimal import Decimal
+from enum import Enum
 from pathlib import Path
-from typing import Optional, TextIO
+from typing import Iterable, Optional, TextIO, Union
 
 from .models import NormalisedOpportunity
 
 
+class ExportFormat(Enum):
+    """Layout of streamed exports."""
+    JSON = "json"      # Indented JSON array, as export() writes
+    NDJSON = "ndjson"  # One compact JSON object per line
+
+
+class RecordWriter:
+    """Writes records to a stream one at a time."""
+    
+    def __init__(
+        self,
+        exporter: 'JsonExporter',
+        stream: TextIO,
+        fmt: ExportFormat = ExportFormat.JSON,
+        close_stream: bool = False,
+        flush: bool = True
+    ):
+        """
+        Initialize writer.
+        
+        Args:
+            exporter: Exporter converting records to dicts.
+            stream: Text stream to write to.
+            fmt: Output layout.
+            close_stream: Whether close() also closes stream.
+            flush: Flush after every record so readers see it at once
+                (off for gzip, where it would hurt compression).
+        """
+        self.exporter = exporter
+        self.stream = stream
+        self.fmt = fmt
+        self.count = 0
+        self._close_stream = close_stream
+        self._flush = flush
+        self._closed = False
+    
+    def write(self, record: NormalisedOpportunity) -> None:
+        """Write one record to the stream."""
+        data = self.exporter._record_to_dict(record)
+        if self.fmt is ExportFormat.NDJSON:
+            self.stream.write(json.dumps(data, default=self.exporter._json_serializer) + '\n')
+        else:
+            # Same text json.dumps(records, indent=2) gives each array item
+            text = json.dumps(data, indent=2, default=self.exporter._json_serializer)
+            self.stream.write(("[\n" if self.count == 0 else ",\n") + '\n'.join(
+                '  ' + line for line in text.split('\n')
+            ))
+        self.count += 1
+        if self._flush:
+            self.stream.flush()
+    
+    def write_all(self, records: Iterable[NormalisedOpportunity]) -> int:
+        """Write every record; returns the number written so far."""
+        for record in records:
+            self.write(record)
+        return self.count
+    
+    def close(self) -> None:
+        """Finish the output (closing the JSON array) and release the stream."""
+        if self._closed:
+            return
+        self._closed = True
+        if self.fmt is ExportFormat.JSON:
+            self.stream.write("[]\n" if self.count == 0 else "\n]\n")
+        self.stream.flush()
+        if self._close_stream:
+            self.stream.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
 class JsonExporter:
     """Exports normalised records to JSON format."""
     
@@ -39,19 +122,55 @@ class JsonExporter:
     
     def export_to_stream(
         self,
-        records: list[NormalisedOpportunity],
+        records: Iterable[NormalisedOpportunity],
         stream: TextIO = sys.stdout
     ) -> None:
         """
         Export records to a stream (stdout or file handle).
         
+        Records are written one at a time, so records may be a generator.
+        
         Args:
-            records: List of normalised opportunities to export.
+            records: Normalised opportunities to export.
             stream: Output stream (default: stdout).
         """
-        json_str = self.export(records)
-        stream.write(json_str)
-        stream.write('\n')
+        with self.open_stream(stream) as writer:
+            writer.write_all(records)
+    
+    def open_stream(
+        self,
+        output: Union[str, Path, TextIO, None] = None,
+        fmt: ExportFormat = ExportFormat.JSON,
+        compress: Optional[bool] = None
+    ) -> RecordWriter:
+        """
+        Open a writer that streams records to a file or stream.
+        
+        Args:
+            output: File path, open text stream, or None for stdout.
+            fmt: Output layout.
+            compress: Gzip the file. If None, files ending in .gz are gzipped.
+        
+        Returns:
+            RecordWriter; close it (or use it as a context manager) to
+            finish the output.
+        
+        Raises:
+            ValueError: If compression is requested for a stream.
+        """
+        if output is None or hasattr(output, 'write'):
+            if compress:
+                raise ValueError("Gzip output needs a file path")
+            return RecordWriter(self, output or sys.stdout, fmt)
+        
+        path = Path(output)
+        if compress is None:
+            compress = path.suffix == '.gz'
+        if compress:
+            stream = gzip.open(path, 'wt', encoding='utf-8')
+        else:
+            stream = path.open('w', encoding='utf-8')
+        return RecordWriter(self, stream, fmt, close_stream=True, flush=not compress)
     
     def _record_to_dict(self, record: NormalisedOpportunity) -> dict:
         """Convert normalised record to JSON-serializable dict."""
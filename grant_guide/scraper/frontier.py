@@ -0,0 +1,164 @@
+"""
+URL frontier for a scrape run.
+
+Listing pages link to the same programme many times over: with and without
+a trailing slash, with #fragments, with utm_* tracking parameters, in
+different host case, and to sites that are not approved sources. Every one
+of those would cost a rate-limited fetch. The frontier canonicalises each
+URL, drops URLs already admitted this run and URLs outside the approved
+sources, so each page is fetched at most once per run.
+"""
+import threading
+from typing import Iterable, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from .models import SourceConfig
+
+# Query parameters that only track the visitor and never change the page
+TRACKING_PARAMS = frozenset({
+    'fbclid', 'gclid', 'dclid', 'msclkid', 'mc_cid', 'mc_eid', '_ga', '_gl',
+})
+TRACKING_PREFIXES = ('utm_',)
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+def canonicalise_url(url: str) -> str:
+    """
+    Canonicalise a URL for de-duplication.
+    
+    Lowercases the scheme and host, drops default ports, fragments and
+    tracking parameters, and strips the trailing slash from the path
+    (an empty path becomes "/"). Other query parameters keep their order.
+    
+    Args:
+        url: Absolute URL.
+    
+    Returns:
+        Canonical form of url.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+    if port and port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{port}"
+    
+    path = parts.path.rstrip('/') or '/'
+    query = parts.query
+    if query:
+        params = [
+            (key, value) for key, value in parse_qsl(query, keep_blank_values=True)
+            if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)
+        ]
+        query = urlencode(params)
+    
+    return urlunsplit((scheme, host, path, query, ''))
+
+
+class ApprovedPrefixIndex:
+    """
+    Precompiled index of the URL prefixes covered by approved sources.
+    
+    A URL is approved if it falls under a source's base_url or under the
+    directory of one of its scrape_urls. Prefixes are stored as a set per
+    host, so a lookup checks each ancestor path of the URL: the cost grows
+    with the URL's path segments, not the number of sources. Scheme is
+    ignored, so http and https links to an approved site are both accepted.
+    """
+    
+    def __init__(self, sources: Iterable[SourceConfig]):
+        self._paths: dict[str, set[str]] = {}
+        for source in sources:
+            self._add(source.base_url)
+            for scrape_url in source.scrape_urls:
+                self._add(self._directory(scrape_url))
+    
+    @staticmethod
+    def _directory(url: str) -> str:
+        """The URL up to its last path segment, keeping the origin intact."""
+        parts = urlsplit(url)
+        path = parts.path.rsplit('/', 1)[0] if '/' in parts.path else ''
+        return urlunsplit((parts.scheme, parts.netloc, path, '', ''))
+    
+    def _add(self, prefix: str) -> None:
+        parts = urlsplit(canonicalise_url(prefix))
+        if parts.netloc:
+            self._paths.setdefault(parts.netloc, set()).add(parts.path)
+    
+    def is_approved(self, url: str) -> bool:
+        """Check if url falls under an approved source."""
+        parts = urlsplit(canonicalise_url(url))
+        paths = self._paths.get(parts.netloc)
+        if not paths:
+            return False
+        if '/' in paths:
+            return True
+        # "/a/b/c" is under "/a", "/a/b" or "/a/b/c"
+        path = parts.path
+        end = path.find('/', 1)
+        while end != -1:
+            if path[:end] in paths:
+                return True
+            end = path.find('/', end + 1)
+        return path in paths
+
+
+class UrlFrontier:
+    """
+    Thread-safe set of the URLs admitted for fetching during one run.
+    
+    Shared by every adapter in a run (including pipeline fetch workers), so
+    a page linked from several listing pages or sources is fetched once.
+    """
+    
+    def __init__(self, index: Optional[ApprovedPrefixIndex] = None):
+        """
+        Initialize frontier.
+        
+        Args:
+            index: Approved-source index; None admits any host.
+        """
+        self.index = index
+        self.duplicates = 0
+        self.rejected = 0
+        self._seen: set[str] = set()
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def for_sources(cls, sources: Iterable[SourceConfig]) -> 'UrlFrontier':
+        """Create a frontier admitting only URLs under the given sources."""
+        return cls(ApprovedPrefixIndex(sources))
+    
+    def admit(self, url: str) -> Optional[str]:
+        """
+        Admit a URL for fetching.
+        
+        Args:
+            url: Absolute URL found on a listing page.
+        
+        Returns:
+            url, or None if it is not under an approved source or an
+            equivalent URL was already admitted this run. The URL is fetched
+            as found; the canonical form is only the de-duplication key, so
+            stored source URLs keep matching.
+        """
+        canonical = canonicalise_url(url)
+        if self.index is not None and not self.index.is_approved(canonical):
+            with self._lock:
+                self.rejected += 1
+            return None
+        with self._lock:
+            if canonical in self._seen:
+                self.duplicates += 1
+                return None
+            self._seen.add(canonical)
+        return url
+    
+    def __contains__(self, url: str) -> bool:
+        return canonicalise_url(url) in self._seen
+    
+    def __len__(self) -> int:
+        return len(self._seen)
@@ -3,21 +3,37 @@ HTTP client with rate limiting, robots.txt compliance, and retry logic.
 """
 import hashlib
 import logging
+import threading
 import time
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 from functools import wraps
-from typing import Optional
+from typing import TYPE_CHECKING, Callable, Iterable, Optional
 from urllib.parse import urlparse
 from urllib.robotparser import RobotFileParser
 
 import requests
-from requests.exceptions import RequestException, Timeout, ConnectionError
+from requests.exceptions import (
+    ChunkedEncodingError, ConnectionError, HTTPError, RequestException, Timeout
+)
+
+from . import cancellation
+from .circuit_breaker import CircuitBreaker
+from .rate_limiter import DomainRateLimiter, parse_retry_after
+from .robots_store import RobotsEntry, RobotsStore
+from .validator_store import ValidatorStore
+
+if TYPE_CHECKING:
+    from .models import SourceConfig
+    from .response_cache import ResponseCache
 
 logger = logging.getLogger('scraper.http')
 
 # Default user agent
 DEFAULT_USER_AGENT = "GrantGuideSA-Scraper/1.0 (+https://grantsguide.co.za/about)"
 
+# Response statuses worth retrying; other 4xx will not change on retry
+RETRYABLE_STATUSES = frozenset({408, 425, 429, 500, 502, 503, 504})
+
 
 class HttpClientError(Exception):
     """Base exception for HTTP client errors."""
@@ -34,38 +50,111 @@ class RobotsDisallowedError(HttpClientError):
     pass
 
 
-def retry_with_backoff(max_retries: int = 3, base_delay: float = 1.0, max_delay: float = 30.0):
+class NotModifiedError(HttpClientError):
+    """Raised when a conditional request returns 304 Not Modified."""
+    pass
+
+
+class CacheMissError(HttpClientError):
+    """Raised in replay mode when a URL is not in the response cache."""
+    pass
+
+
+class CircuitOpenError(HttpClientError):
+    """Raised without a request when a domain has failed too often this run."""
+    pass
+
+
+def is_retryable(error: Exception) -> bool:
+    """
+    Check if a failed request is worth retrying.
+    
+    Timeouts, connection errors and truncated responses are retried, as are
+    responses with a status in RETRYABLE_STATUSES. Anything else (404, 403,
+    invalid URLs, too many redirects) fails the same way every time.
+    """
+    if isinstance(error, HTTPError):
+        return error.response is not None and error.response.status_code in RETRYABLE_STATUSES
+    return isinstance(error, (Timeout, ConnectionError, ChunkedEncodingError))
+
+
+def next_retry_delay(
+    error: Exception,
+    attempt: int,
+    max_retries: int,
+    base_delay: float,
+    max_delay: float,
+    retry_allowed: Optional[Callable[..., bool]],
+    args: tuple,
+    kwargs: dict
+) -> Optional[float]:
+    """
+    Decide whether a failed, retryable attempt is retried.
+    
+    Shared by retry_with_backoff and the async client's retry loop.
+    
+    Returns:
+        Seconds to wait before the next attempt, or None to raise the error.
+    """
+    if attempt == max_retries:
+        logger.error(f"Request failed after {max_retries + 1} attempts: {error}")
+        return None
+    if retry_allowed is not None and not retry_allowed(error, *args, **kwargs):
+        logger.error(f"Request failed, retry budget spent: {error}")
+        return None
+    delay = min(base_delay * (2 ** attempt), max_delay)
+    logger.warning(
+        f"Request failed (attempt {attempt + 1}/{max_retries + 1}), "
+        f"retrying in {delay}s: {error}"
+    )
+    return delay
+
+
+def retry_with_backoff(
+    max_retries: int = 3,
+    base_delay: float = 1.0,
+    max_delay: float = 30.0,
+    retry_allowed: Optional[Callable[..., bool]] = None
+):
     """
     Decorator for retrying requests with exponential backoff.
     
+    Only errors for which is_retryable() is true are retried; others are
+    raised at once.
+    
     Args:
         max_retries: Maximum number of retry attempts.
         base_delay: Base delay in seconds (doubles each retry).
         max_delay: Maximum delay between retries.
+        retry_allowed: Optional callable given the error and the call's
+            arguments before each retry; returning False raises the error
+            instead (e.g. when a retry budget is spent).
     """
     def decorator(func):
         @wraps(func)
         def wrapper(*args, **kwargs):
-            last_exception = None
             for attempt in range(max_retries + 1):
+                cancellation.check_cancelled()
                 try:
                     return func(*args, **kwargs)
-                except (Timeout, ConnectionError, RequestException) as e:
-                    last_exception = e
-                    if attempt < max_retries:
-                        delay = min(base_delay * (2 ** attempt), max_delay)
-                        logger.warning(
-                            f"Request failed (attempt {attempt + 1}/{max_retries + 1}), "
-                            f"retrying in {delay}s: {e}"
-                        )
-                        time.sleep(delay)
-                    else:
-                        logger.error(f"Request failed after {max_retries + 1} attempts: {e}")
-            raise last_exception
+                except RequestException as e:
+                    if not is_retryable(e):
+                        raise
+                    delay = next_retry_delay(
+                        e, attempt, max_retries, base_delay, max_delay, retry_allowed, args, kwargs
+                    )
+                    if delay is None:
+                        raise
+                    cancellation.sleep(delay)
         return wrapper
     return decorator
 
 
+def _within_retry_budget(error: Exception, client: 'HttpClient', url: str, *args, **kwargs) -> bool:
+    """retry_allowed hook for HttpClient and AsyncHttpClient: spend a retry from the domain's budget."""
+    return client.circuit_breaker.take_retry(client._get_domain(url))
+
+
 class HttpClient:
     """HTTP client with rate limiting and robots.txt compliance."""
     
@@ -73,7 +162,12 @@ class HttpClient:
         self,
         user_agent: str = DEFAULT_USER_AGENT,
         default_delay: float = 2.0,
-        timeout: int = 30
+        timeout: int = 30,
+        validator_store: Optional[ValidatorStore] = None,
+        response_cache: Optional['ResponseCache'] = None,
+        robots_store: Optional[RobotsStore] = None,
+        rate_limiter: Optional[DomainRateLimiter] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None
     ):
         """
         Initialize HTTP client.
@@ -82,52 +176,134 @@ class HttpClient:
             user_agent: User agent string for requests.
             default_delay: Default delay between requests to same domain (seconds).
             timeout: Request timeout in seconds.
+            validator_store: Optional store of ETag/Last-Modified validators.
+                Required for conditional requests.
+            response_cache: Optional on-disk response cache.
+            robots_store: Persistent robots.txt cache. If None, robots.txt is
+                cached in memory for this client only (with the same TTLs).
+            rate_limiter: Per-domain limiter, which may be shared with other
+                clients. If None, a private limiter using default_delay.
+            circuit_breaker: Per-domain failure tracking and retry budget.
+                If None, uses CircuitBreaker defaults.
         """
         self.user_agent = user_agent
         self.default_delay = default_delay
         self.timeout = timeout
-        self._robots_cache: dict[str, RobotFileParser] = {}
-        self._last_request: dict[str, datetime] = {}
+        self.validator_store = validator_store
+        self.response_cache = response_cache
+        self.robots_store = robots_store or RobotsStore(":memory:")
+        self._robots_cache: dict[str, Optional[RobotFileParser]] = {}
+        # monotonic expiry per cached domain; domains without one never expire
+        self._robots_expiry: dict[str, float] = {}
+        self._robots_locks: dict[str, threading.Lock] = {}
+        self._robots_guard = threading.Lock()
+        self.rate_limiter = rate_limiter or DomainRateLimiter(default_delay)
+        self._last_request = self.rate_limiter.last_request
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
         self._session = requests.Session()
         self._session.headers.update({'User-Agent': user_agent})
     
-    def get(self, url: str, check_robots: bool = True) -> str:
+    def get(self, url: str, check_robots: bool = True, conditional: bool = False) -> str:
         """
         Fetch URL with rate limiting and robots.txt compliance.
         
         Args:
             url: URL to fetch.
             check_robots: Whether to check robots.txt (default True).
-            
+            conditional: Send If-None-Match/If-Modified-Since from the
+                validator store, if one is configured (default False).
+        
         Returns:
             HTML content as string.
-            
+        
         Raises:
             RobotsDisallowedError: If robots.txt disallows access.
+            CircuitOpenError: If the domain's circuit is open.
+            NotModifiedError: If a conditional request returns 304.
+            CacheMissError: If the cache is in replay mode and has no entry.
+            OperationCancelled: If the current cancellation token is cancelled.
             HttpClientError: For other HTTP errors.
         """
+        cancellation.check_cancelled()
+        
+        # Serve from cache (replay mode never touches the network)
+        if self.response_cache is not None:
+            content = self.response_cache.lookup(url)
+            if content is not None:
+                return content
+            if self.response_cache.replay:
+                raise CacheMissError(f"Not in response cache (replay mode): {url}")
+        
+        # Fail fast for sites that keep failing this run
+        domain = self._get_domain(url)
+        self._check_circuit(domain, url)
+        
         # Check robots.txt
         if check_robots and not self.is_allowed(url):
             raise RobotsDisallowedError(f"Access disallowed by robots.txt: {url}")
         
-        # Enforce rate limiting
-        domain = self._get_domain(url)
-        self._enforce_rate_limit(domain, url)
-        
-        # Make request with retry
-        return self._make_request(url)
+        # Make request with retry (each attempt is rate limited)
+        try:
+            content = self._make_request(url, conditional)
+        except RequestException as e:
+            if is_retryable(e):
+                self.circuit_breaker.record_failure(domain)
+            else:
+                # The server answered (e.g. 404), so the site is up
+                self.circuit_breaker.record_success(domain)
+            raise
+        except NotModifiedError:
+            self.circuit_breaker.record_success(domain)
+            raise
+        self.circuit_breaker.record_success(domain)
+        return content
+    
+    def circuit_open(self, url: str) -> bool:
+        """Check if requests to url's domain currently fail fast."""
+        return self.circuit_breaker.is_open(self._get_domain(url))
     
-    @retry_with_backoff(max_retries=3, base_delay=1.0)
-    def _make_request(self, url: str) -> str:
+    def reset_circuits(self, urls: Iterable[str]) -> None:
+        """Close the circuits and refill the retry budgets of urls' domains."""
+        self.circuit_breaker.reset({self._get_domain(url) for url in urls})
+    
+    @retry_with_backoff(max_retries=3, base_delay=1.0, retry_allowed=_within_retry_budget)
+    def _make_request(self, url: str, conditional: bool = False) -> str:
         """Make HTTP request with retry logic."""
+        domain = self._get_domain(url)
+        self._enforce_rate_limit(domain, url)
         logger.debug(f"Fetching: {url}")
         
-        response = self._session.get(url, timeout=self.timeout)
+        # A stale cached body can be revalidated instead of re-downloaded
+        stale = None
+        if not conditional and self.response_cache is not None:
+            stale = self.response_cache.get(url, allow_stale=True)
+        
+        headers = {}
+        if (conditional or stale is not None) and self.validator_store is not None:
+            validators = self.validator_store.get(url)
+            if validators is not None:
+                headers = validators.as_request_headers()
+        
+        response = self._session.get(url, timeout=self._request_timeout(), headers=headers)
+        self._record_pace(domain, response)
+        
+        if response.status_code == 304:
+            logger.info(f"Not modified: {url}")
+            if stale is not None:
+                self.response_cache.touch(url)
+                return stale
+            raise NotModifiedError(f"Not modified since last fetch: {url}")
+        
         response.raise_for_status()
         
-        # Update last request time
-        domain = self._get_domain(url)
-        self._last_request[domain] = datetime.now()
+        if self.validator_store is not None:
+            self.validator_store.set(
+                url,
+                response.headers.get('ETag'),
+                response.headers.get('Last-Modified')
+            )
+        if self.response_cache is not None:
+            self.response_cache.put(url, response.text)
         
         logger.info(f"Fetched {url} ({len(response.text)} bytes)")
         return response.text
@@ -138,70 +314,150 @@ class HttpClient:
         
         Args:
             url: URL to check.
-            
+        
         Returns:
             True if allowed, False if disallowed.
         """
-        domain = self._get_domain(url)
-        robots = self._get_robots_parser(domain)
-        
-        if robots is None:
-            # No robots.txt found, assume allowed
-            return True
-        
-        return robots.can_fetch(self.user_agent, url)
+        return self._robots_allow(self._get_robots_parser(self._get_domain(url)), url)
     
     def get_crawl_delay(self, url: str) -> float:
         """
-        Get crawl delay from robots.txt or use default.
+        Get crawl delay from robots.txt or the domain's configured delay.
         
         Args:
             url: URL to get delay for.
-            
+        
         Returns:
             Crawl delay in seconds.
         """
         domain = self._get_domain(url)
-        robots = self._get_robots_parser(domain)
+        return self._robots_crawl_delay(self._get_robots_parser(domain), domain)
+    
+    def configure_rate_limits(self, sources: Iterable['SourceConfig']) -> None:
+        """
+        Apply each source's rate_limit_seconds to its domains.
         
-        if robots is not None:
-            delay = robots.crawl_delay(self.user_agent)
-            if delay is not None:
-                return max(delay, self.default_delay)
+        A domain shared by several sources uses the slowest of their delays,
+        and never goes below default_delay.
+        
+        Args:
+            sources: Sources about to be scraped.
+        """
+        delays: dict[str, float] = {}
+        for source in sources:
+            for url in [source.base_url, *source.scrape_urls]:
+                domain = self._get_domain(url)
+                if domain:
+                    delays[domain] = max(delays.get(domain, self.default_delay), source.rate_limit_seconds)
+        for domain, delay in delays.items():
+            self.rate_limiter.set_delay(domain, delay)
+    
+    def prefetch_robots(self, urls: Iterable[str], max_workers: int = 8) -> None:
+        """
+        Start loading robots.txt for the domains of urls in the background.
+        
+        Returns immediately; a request to a domain still being prefetched
+        waits for that fetch instead of starting another.
         
-        return self.default_delay
+        Args:
+            urls: URLs whose domains' robots.txt to load.
+            max_workers: Maximum concurrent robots.txt fetches.
+        """
+        # Replay mode never touches the network
+        if self.response_cache is not None and self.response_cache.replay:
+            return
+        domains = {self._get_domain(url) for url in urls} - {''}
+        if not domains:
+            return
+        executor = ThreadPoolExecutor(
+            max_workers=min(max_workers, len(domains)), thread_name_prefix='robots'
+        )
+        for domain in domains:
+            executor.submit(self._get_robots_parser, domain)
+        executor.shutdown(wait=False)
     
     def _get_robots_parser(self, domain: str) -> Optional[RobotFileParser]:
-        """Get or fetch robots.txt parser for domain."""
-        if domain in self._robots_cache:
+        """Get robots.txt parser for domain from memory, the store or the site."""
+        if self._robots_fresh(domain):
             return self._robots_cache[domain]
         
+        with self._robots_guard:
+            lock = self._robots_locks.setdefault(domain, threading.Lock())
+        with lock:
+            # Another thread may have loaded it while we waited
+            if self._robots_fresh(domain):
+                return self._robots_cache[domain]
+            
+            entry = self.robots_store.get(domain)
+            if entry is None:
+                entry = self._fetch_robots(domain)
+                self.robots_store.set(domain, entry)
+            return self._cache_robots(domain, entry)
+            
+    def _cache_robots(self, domain: str, entry: RobotsEntry) -> Optional[RobotFileParser]:
+        """Build the parser for a domain's robots.txt entry and keep it until the entry expires."""
+        parser = entry.to_parser(f"https://{domain}/robots.txt")
+        self._robots_cache[domain] = parser
+        self._robots_expiry[domain] = time.monotonic() + self.robots_store.expires_in(entry)
+        return parser
+    
+    def _robots_allow(self, robots: Optional[RobotFileParser], url: str) -> bool:
+        """Whether a domain's robots.txt parser allows url."""
+        if robots is None:
+            # No robots.txt found, assume allowed
+            return True
+        return robots.can_fetch(self.user_agent, url)
+    
+    def _robots_crawl_delay(self, robots: Optional[RobotFileParser], domain: str) -> float:
+        """Largest of the domain's configured delay and its robots.txt Crawl-delay."""
+        configured = self.rate_limiter.delay_for(domain)
+        if robots is not None:
+            delay = robots.crawl_delay(self.user_agent)
+            if delay is not None:
+                return max(delay, configured)
+        return configured
+    
+    def _robots_fresh(self, domain: str) -> bool:
+        if domain not in self._robots_cache:
+            return False
+        expiry = self._robots_expiry.get(domain)
+        return expiry is None or time.monotonic() < expiry
+    
+    def _fetch_robots(self, domain: str) -> RobotsEntry:
+        """Fetch robots.txt through the pooled session with the request timeout."""
         robots_url = f"https://{domain}/robots.txt"
-        parser = RobotFileParser()
-        parser.set_url(robots_url)
-        
         try:
-            parser.read()
-            self._robots_cache[domain] = parser
-            logger.debug(f"Loaded robots.txt for {domain}")
-            return parser
+            response = self._session.get(robots_url, timeout=self._request_timeout())
         except Exception as e:
             logger.debug(f"Could not load robots.txt for {domain}: {e}")
-            self._robots_cache[domain] = None
-            return None
+            return RobotsEntry.fetch_failed()
+        
+        logger.debug(f"Loaded robots.txt for {domain} ({response.status_code})")
+        return RobotsEntry.from_response(response.status_code, response.text)
+    
+    def _check_circuit(self, domain: str, url: str) -> None:
+        """Raise CircuitOpenError if the domain's circuit is open."""
+        if self.circuit_breaker.is_open(domain):
+            raise CircuitOpenError(f"Too many consecutive failures for {domain}: {url}")
+    
+    def _record_pace(self, domain: str, response) -> None:
+        """Update the domain's spacing from a response (requests or httpx)."""
+        if response.status_code in (429, 503):
+            self.rate_limiter.penalise(domain, parse_retry_after(response.headers.get('Retry-After')))
+        else:
+            self.rate_limiter.record(domain)
     
     def _enforce_rate_limit(self, domain: str, url: str) -> None:
-        """Wait if necessary to respect rate limits."""
-        if domain not in self._last_request:
-            return
-        
-        delay = self.get_crawl_delay(url)
-        elapsed = (datetime.now() - self._last_request[domain]).total_seconds()
-        
-        if elapsed < delay:
-            wait_time = delay - elapsed
-            logger.debug(f"Rate limiting: waiting {wait_time:.2f}s for {domain}")
-            time.sleep(wait_time)
+        """Wait for the domain's next request slot."""
+        self.rate_limiter.acquire(domain, self.get_crawl_delay(url))
+    
+    def _request_timeout(self) -> float:
+        """Request timeout, shortened so a request cannot outlive the current token."""
+        token = cancellation.current_token()
+        remaining = token.remaining() if token is not None else None
+        if remaining is None:
+            return self.timeout
+        return max(0.1, min(self.timeout, remaining))
     
     def _get_domain(self, url: str) -> str:
         """Extract domain from URL."""
@@ -225,7 +481,7 @@ def compute_content_hash(content: str) -> str:
     
     Args:
         content: Content to hash.
-        
+    
     Returns:
         Hex-encoded SHA-256 hash.
     """
@@ -3,11 +3,17 @@ Django importer for importing normalised records into the database.
 """
 import logging
 from datetime import date
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 from django.db import transaction
+from django.utils import timezone
 
 from .models import NormalisedOpportunity, ImportResult, OpportunityStatus
+from .deduplicator import DedupIndex
+from .lookups import LookupCache, lookup_cache
+
+if TYPE_CHECKING:
+    from .domains import DomainClassifier
 
 logger = logging.getLogger('scraper.import')
 
@@ -39,6 +45,26 @@ class DjangoImporter:
         'Any': 'any',
     }
     
+    def __init__(
+        self,
+        dedup_index: Optional[DedupIndex] = None,
+        lookups: Optional[LookupCache] = None,
+        classifier: Optional['DomainClassifier'] = None
+    ):
+        """
+        Initialize importer.
+        
+        Args:
+            dedup_index: Optional deduplication index to keep current as
+                records are created or updated during a run.
+            lookups: Industry/Province cache. If None, uses the process-wide cache.
+            classifier: If given, records whose source_url is not under an
+                approved source are skipped instead of imported.
+        """
+        self.dedup_index = dedup_index
+        self.lookups = lookups or lookup_cache
+        self.classifier = classifier
+    
     def import_record(
         self,
         record: NormalisedOpportunity,
@@ -56,6 +82,9 @@ class DjangoImporter:
         """
         from opportunities.models import FundingOpportunity, AuditLog
         
+        if not self._is_approved(record):
+            return self._unapproved_result(record)
+        
         try:
             model_data = self.map_to_model(record)
             
@@ -82,6 +111,8 @@ class DjangoImporter:
                         changes={'fields': changed_fields}
                     )
                     
+                    self._index_record(opp)
+                    
                     logger.info(f"Updated: {record.title} (ID: {existing_id})")
                     return ImportResult(
                         success=True,
@@ -102,6 +133,8 @@ class DjangoImporter:
                         changes={'source': record.source_name}
                     )
                     
+                    self._index_record(opp)
+                    
                     logger.info(f"Created: {record.title} (ID: {opp.id})")
                     return ImportResult(
                         success=True,
@@ -111,28 +144,120 @@ class DjangoImporter:
                     
         except Exception as e:
             logger.error(f"Failed to import '{record.title}': {e}")
+            # Industries created in the rolled back transaction no longer exist
+            self.lookups.invalidate()
             return ImportResult(
                 success=False,
                 action='skipped',
                 error=str(e)
             )
     
-    def import_batch(self, records: list[NormalisedOpportunity]) -> list[ImportResult]:
+    def import_batch(
+        self,
+        records: list[NormalisedOpportunity],
+        existing_ids: Optional[list[Optional[int]]] = None,
+        merge_with: Optional[list[Optional[int]]] = None
+    ) -> list[ImportResult]:
         """
-        Import multiple records.
+        Import multiple records with a constant number of queries.
+        
+        Existing rows are fetched in one query, new rows are bulk created,
+        changed fields are bulk updated, and ManyToMany rows and audit logs
+        are bulk inserted, all in one transaction. If the batch fails the
+        records are imported one by one so a bad record only skips itself.
         
         Args:
             records: List of normalised opportunities to import.
+            existing_ids: IDs of existing records to update, parallel to records
+                (None entries are created). If omitted, all records are created.
+            merge_with: Positions of earlier records in the batch that each
+                new record duplicates, parallel to records (see
+                DeduplicationResult.batch_match). A merged record writes to
+                the same row as the record it points at.
             
         Returns:
-            List of ImportResult for each record.
+            List of ImportResult for each record, in input order.
         """
-        results = []
-        for record in records:
-            result = self.import_record(record)
-            results.append(result)
+        if not records:
+            return []
+        if existing_ids is None:
+            existing_ids = [None] * len(records)
+        if merge_with is None:
+            merge_with = [None] * len(records)
+        
+        approved = [self._is_approved(record) for record in records]
+        if not all(approved):
+            # Renumber merge targets; a record whose target was skipped is new
+            positions = {}
+            for i, ok in enumerate(approved):
+                if ok:
+                    positions[i] = len(positions)
+            kept = iter(self.import_batch(
+                [r for r, ok in zip(records, approved) if ok],
+                [e for e, ok in zip(existing_ids, approved) if ok],
+                [positions.get(m) if m is not None else None
+                 for m, ok in zip(merge_with, approved) if ok]
+            ))
+            return [
+                next(kept) if ok else self._unapproved_result(record)
+                for record, ok in zip(records, approved)
+            ]
+        
+        try:
+            with transaction.atomic():
+                results, imported = self._bulk_import(records, existing_ids, merge_with)
+        except Exception as e:
+            logger.warning(
+                f"Bulk import of {len(records)} records failed, importing one by one: {e}"
+            )
+            self.lookups.invalidate()
+            results = []
+            for record, existing_id, target in zip(records, existing_ids, merge_with):
+                if target is not None and not existing_id:
+                    existing_id = results[target].record_id
+                results.append(self.import_record(record, existing_id))
+            return results
+        
+        # Only index rows once the transaction has committed
+        for opp in imported:
+            self._index_record(opp)
+        
+        logger.info(f"Imported batch of {len(records)} records")
         return results
     
+    def _is_approved(self, record: NormalisedOpportunity) -> bool:
+        """Check the record's source page is under an approved source."""
+        return self.classifier is None or self.classifier.is_approved(record.source_url)
+    
+    def _unapproved_result(self, record: NormalisedOpportunity) -> ImportResult:
+        logger.warning(f"Skipped '{record.title}': not from an approved source ({record.source_url})")
+        return ImportResult(
+            success=False,
+            action='skipped',
+            error=f"Source URL is not under an approved source: {record.source_url}"
+        )
+    
+    def mark_verified(self, record_ids: list[int]) -> int:
+        """
+        Bump last_verified for unchanged records in a single query.
+        
+        Args:
+            record_ids: IDs of records whose source pages were unchanged.
+        
+        Returns:
+            Number of rows updated.
+        """
+        from opportunities.models import FundingOpportunity
+        
+        if not record_ids:
+            return 0
+        
+        updated = FundingOpportunity.objects.filter(
+            id__in=set(record_ids)
+        ).update(last_verified=date.today())
+        logger.info(f"Marked {updated} unchanged records as verified")
+        return updated
+    
     def map_to_model(self, record: NormalisedOpportunity) -> dict:
         """
         Map normalised record to FundingOpportunity model fields.
@@ -171,10 +296,188 @@ class DjangoImporter:
             'source_link': record.source_url,
             'last_verified': record.last_verified_date,
             'status': self.STATUS_MAPPING.get(record.status, 'draft'),
+            'raw_content_hash': record.raw_content_hash,
             'notes': f"Imported from {record.source_name}. " + 
                      (f"Issues: {', '.join(record.validation_issues)}" if record.validation_issues else ""),
         }
     
+    def _index_record(self, opp) -> None:
+        """Add a created/updated row to the deduplication index."""
+        if self.dedup_index is None:
+            return
+        self.dedup_index.add({
+            'id': opp.id,
+            'apply_link': opp.apply_link,
+            'source_link': opp.source_link,
+            'funding_name': opp.funding_name,
+            'funder': opp.funder,
+            'raw_content_hash': opp.raw_content_hash,
+        })
+    
+    def _bulk_import(
+        self,
+        records: list[NormalisedOpportunity],
+        existing_ids: list[Optional[int]],
+        merge_with: list[Optional[int]]
+    ) -> tuple[list[ImportResult], list]:
+        """
+        Write a batch inside the caller's transaction.
+        
+        Records updating the same row, creating rows with the same source
+        URL, or merged with an earlier record of the batch are merged into
+        one row (the last record wins), as importing them in sequence would
+        have done.
+        
+        Returns:
+            Tuple of (results in input order, imported model instances).
+        """
+        from opportunities.models import FundingOpportunity, AuditLog
+        
+        today = date.today()
+        now = timezone.now()
+        model_data = [self.map_to_model(record) for record in records]
+        
+        # Group record indices by the row they write to
+        groups: dict[tuple, list[int]] = {}
+        keys: list[tuple] = []
+        for i, existing_id in enumerate(existing_ids):
+            if existing_id:
+                key = ('existing', existing_id)
+            elif merge_with[i] is not None:
+                key = keys[merge_with[i]]
+            else:
+                key = ('new', model_data[i]['source_link'] or i)
+            keys.append(key)
+            groups.setdefault(key, []).append(i)
+        
+        existing = FundingOpportunity.objects.in_bulk(
+            [key[1] for key in groups if key[0] == 'existing']
+        )
+        
+        results: list[Optional[ImportResult]] = [None] * len(records)
+        rows: list[tuple[object, list[int], bool]] = []
+        to_create = []
+        to_update = []
+        update_fields = {'last_verified', 'updated_at'}
+        audit_logs = []
+        
+        for key, indices in groups.items():
+            data = model_data[indices[-1]]
+            
+            if key[0] == 'existing':
+                opp = existing.get(key[1])
+                if opp is None:
+                    for i in indices:
+                        logger.error(f"Failed to import '{records[i].title}': record {key[1]} not found")
+                        results[i] = ImportResult(
+                            success=False,
+                            action='skipped',
+                            error=f"FundingOpportunity {key[1]} does not exist"
+                        )
+                    continue
+                
+                changed_fields = self._get_changed_fields(opp, data)
+                for field, value in data.items():
+                    setattr(opp, field, value)
+                # bulk_update skips auto_now, so set it here
+                opp.last_verified = today
+                opp.updated_at = now
+                update_fields.update(changed_fields)
+                to_update.append(opp)
+                audit_logs.append(AuditLog(
+                    opportunity=opp,
+                    action='updated_by_scraper',
+                    changes={'fields': changed_fields}
+                ))
+                rows.append((opp, indices, False))
+            else:
+                opp = FundingOpportunity(**data)
+                to_create.append(opp)
+                rows.append((opp, indices, True))
+        
+        if to_create:
+            self._assign_slugs(to_create)
+            FundingOpportunity.objects.bulk_create(to_create)
+            audit_logs.extend(
+                AuditLog(
+                    opportunity=opp,
+                    action='created_by_scraper',
+                    changes={'source': records[indices[-1]].source_name}
+                )
+                for opp, indices, created in rows if created
+            )
+        
+        if to_update:
+            FundingOpportunity.objects.bulk_update(to_update, sorted(update_fields))
+        
+        self._bulk_set_relationships([
+            (opp, records[indices[-1]]) for opp, indices, _ in rows
+        ], replace=[opp.id for opp in to_update])
+        
+        AuditLog.objects.bulk_create(audit_logs)
+        
+        for opp, indices, created in rows:
+            for position, i in enumerate(indices):
+                # Later records for a newly created row update it
+                action = 'created' if created and position == 0 else 'updated'
+                results[i] = ImportResult(success=True, action=action, record_id=opp.id)
+        
+        return results, [opp for opp, _, _ in rows]
+    
+    def _bulk_set_relationships(self, rows: list[tuple], replace: list[int]) -> None:
+        """
+        Set industries and provinces for many rows with bulk inserts.
+        
+        Args:
+            rows: (opportunity, record) pairs.
+            replace: IDs of existing rows whose current relations are removed first.
+        """
+        from opportunities.models import FundingOpportunity
+        
+        industries = self.lookups.industries(
+            tag for _, record in rows for tag in record.industry_tags
+        )
+        provinces = self.lookups.provinces(
+            tag for _, record in rows for tag in record.province_tags
+        )
+        
+        IndustryLink = FundingOpportunity.industries.through
+        ProvinceLink = FundingOpportunity.provinces.through
+        
+        if replace:
+            IndustryLink.objects.filter(fundingopportunity_id__in=replace).delete()
+            ProvinceLink.objects.filter(fundingopportunity_id__in=replace).delete()
+        
+        industry_links = []
+        province_links = []
+        for opp, record in rows:
+            industry_ids = {industries[t].id for t in record.industry_tags if t in industries}
+            province_ids = {provinces[t].id for t in record.province_tags if t in provinces}
+            industry_links.extend(
+                IndustryLink(fundingopportunity_id=opp.id, industry_id=industry_id)
+                for industry_id in industry_ids
+            )
+            province_links.extend(
+                ProvinceLink(fundingopportunity_id=opp.id, province_id=province_id)
+                for province_id in province_ids
+            )
+        
+        IndustryLink.objects.bulk_create(industry_links)
+        ProvinceLink.objects.bulk_create(province_links)
+    
+    def _assign_slugs(self, opps: list) -> None:
+        """Give new rows unique slugs using one query for the slugs already taken."""
+        from opportunities.models import FundingOpportunity
+        from opportunities.slugs import allocate_slugs
+        
+        unassigned = [opp for opp in opps if not opp.slug]
+        slugs = allocate_slugs(
+            FundingOpportunity.objects.all(),
+            [opp.funding_name for opp in unassigned]
+        )
+        for opp, slug in zip(unassigned, slugs):
+            opp.slug = slug
+    
     def _update_relationships(
         self,
         opp,
@@ -199,17 +502,8 @@ class DjangoImporter:
         Returns:
             List of Industry model instances.
         """
-        from opportunities.models import Industry
-        from django.utils.text import slugify
-        
-        industries = []
-        for tag in tags:
-            industry, _ = Industry.objects.get_or_create(
-                name=tag,
-                defaults={'slug': slugify(tag)}
-            )
-            industries.append(industry)
-        return industries
+        industries = self.lookups.industries(tags)
+        return [industries[tag] for tag in tags if tag in industries]
     
     def get_provinces(self, tags: list[str]) -> list:
         """
@@ -221,23 +515,8 @@ class DjangoImporter:
         Returns:
             List of Province model instances.
         """
-        from opportunities.models import Province
-        
-        provinces = []
-        for tag in tags:
-            try:
-                # Try exact match first
-                province = Province.objects.get(name=tag)
-                provinces.append(province)
-            except Province.DoesNotExist:
-                # Try case-insensitive match
-                try:
-                    province = Province.objects.get(name__iexact=tag)
-                    provinces.append(province)
-                except Province.DoesNotExist:
-                    logger.warning(f"Province not found: {tag}")
-        
-        return provinces
+        provinces = self.lookups.provinces(tags)
+        return [provinces[tag] for tag in tags if tag in provinces]
     
     def _format_funding_amount(self, min_amount, max_amount) -> str:
         """Format funding amount as range string."""
@@ -0,0 +1,103 @@
+"""
+Keyword matching for compliance checks and adapters.
+
+A KeywordMatcher compiles its keywords into one alternation (longest
+first), so finding any of N keywords in a text is a single regex scan
+rather than N substring searches. scan() goes further and matches the
+texts of many fields (or many records) in one pass over their
+concatenation, reporting each hit with the key of the text it fell in.
+
+Matchers are cached per keyword set, so each is built once per process.
+"""
+import re
+from bisect import bisect_right
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Hashable, Iterable, Optional
+
+# Joins texts in scan(); never part of a keyword, so no match spans two texts
+_SEPARATOR = '\x00'
+
+
+@dataclass(frozen=True)
+class KeywordHit:
+    """A keyword found in one of the texts passed to scan()."""
+    key: Any
+    keyword: str
+    offset: int  # Position of the match in the lowercased text
+
+
+class KeywordMatcher:
+    """Case-insensitive matcher for a fixed set of keywords."""
+    
+    def __init__(self, keywords: Iterable[str]):
+        """
+        Compile keywords.
+        
+        Args:
+            keywords: Keywords to match; case is ignored.
+        
+        Raises:
+            ValueError: If there are no keywords.
+        """
+        words = sorted({str(word).lower() for word in keywords if word}, key=len, reverse=True)
+        if not words:
+            raise ValueError("KeywordMatcher needs at least one keyword")
+        self.keywords = tuple(words)
+        self._pattern = re.compile('|'.join(re.escape(word) for word in words))
+    
+    def search(self, text: str) -> Optional[str]:
+        """Return the first keyword found in text, or None."""
+        match = self._pattern.search(text.lower())
+        return match.group() if match else None
+    
+    def find_all(self, text: str) -> list[str]:
+        """Return every (non-overlapping) keyword occurrence in text, in order."""
+        return self._pattern.findall(text.lower())
+    
+    def scan(self, items: Iterable[tuple[Hashable, str]]) -> list[KeywordHit]:
+        """
+        Find keywords in many texts with one regex pass.
+        
+        Args:
+            items: (key, text) pairs; the key identifies the text in the
+                hits, e.g. a field name or a (record, field) tuple. Empty
+                texts are skipped.
+        
+        Returns:
+            Every hit, in the order of items and then of position in the text.
+        """
+        keys = []
+        starts = []
+        parts = []
+        position = 0
+        for key, text in items:
+            if not text:
+                continue
+            text = text.lower()
+            keys.append(key)
+            starts.append(position)
+            parts.append(text)
+            position += len(text) + len(_SEPARATOR)
+        
+        hits = []
+        for match in self._pattern.finditer(_SEPARATOR.join(parts)):
+            index = bisect_right(starts, match.start()) - 1
+            hits.append(KeywordHit(keys[index], match.group(), match.start() - starts[index]))
+        return hits
+
+
+@lru_cache(maxsize=None)
+def _matcher(keywords: tuple[str, ...]) -> KeywordMatcher:
+    return KeywordMatcher(keywords)
+
+
+def keyword_matcher(keywords: Iterable[str]) -> Optional[KeywordMatcher]:
+    """
+    Get the shared matcher for a keyword set.
+    
+    Returns:
+        KeywordMatcher, or None if keywords is empty.
+    """
+    words = tuple(sorted({str(word).lower() for word in keywords if word}))
+    return _matcher(words) if words else None
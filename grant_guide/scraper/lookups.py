@@ -0,0 +1,139 @@
+"""
+Cached Industry and Province lookups for the importer.
+
+Both tables are tiny and almost static, so they are loaded once into
+dicts keyed by exact and lowercased name instead of being queried per tag.
+The process-wide cache is invalidated when a row is saved or deleted
+through the ORM, and at the start of each scrape run to pick up changes
+made by other processes.
+"""
+import logging
+import threading
+from typing import Iterable, Optional
+
+logger = logging.getLogger('scraper.import')
+
+
+class _NameTable:
+    """Rows of one lookup table keyed by exact and lowercased name."""
+    
+    def __init__(self, rows: Iterable):
+        self.by_name = {}
+        self.by_lower = {}
+        for row in rows:
+            self.add(row)
+    
+    def add(self, row) -> None:
+        """Add a row to both dicts (the first row wins on a lowercase clash)."""
+        self.by_name[row.name] = row
+        self.by_lower.setdefault(row.name.lower(), row)
+    
+    def find(self, name: str):
+        """Find a row by exact name, then case-insensitively."""
+        return self.by_name.get(name) or self.by_lower.get(name.lower())
+
+
+class LookupCache:
+    """Thread-safe cache of Industry and Province rows."""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._industries: Optional[_NameTable] = None
+        self._provinces: Optional[_NameTable] = None
+    
+    def invalidate(self) -> None:
+        """Drop cached rows so the next lookup reloads them."""
+        with self._lock:
+            self._industries = None
+            self._provinces = None
+    
+    def industries(self, names: Iterable[str]) -> dict:
+        """
+        Get Industry rows for names, creating missing ones in one bulk insert.
+        
+        Args:
+            names: Industry tag names.
+        
+        Returns:
+            Dict mapping each name to its Industry instance.
+        """
+        from opportunities.models import Industry
+        from django.utils.text import slugify
+        
+        names = set(names)
+        if not names:
+            return {}
+        
+        with self._lock:
+            if self._industries is None:
+                self._industries = _NameTable(Industry.objects.all())
+            table = self._industries
+            
+            missing = {name for name in names if table.find(name) is None}
+            if missing:
+                Industry.objects.bulk_create(
+                    [Industry(name=name, slug=slugify(name)) for name in missing],
+                    ignore_conflicts=True
+                )
+                for industry in Industry.objects.filter(name__in=missing):
+                    table.add(industry)
+            
+            industries = {}
+            for name in names:
+                industry = table.find(name)
+                if industry is None:
+                    logger.warning(f"Could not create industry: {name}")
+                else:
+                    industries[name] = industry
+            return industries
+    
+    def provinces(self, names: Iterable[str]) -> dict:
+        """
+        Get Province rows for names (exact match first, then case-insensitive).
+        
+        Args:
+            names: Province names.
+        
+        Returns:
+            Dict mapping each found name to its Province instance.
+        """
+        from opportunities.models import Province
+        
+        names = set(names)
+        if not names:
+            return {}
+        
+        with self._lock:
+            if self._provinces is None:
+                self._provinces = _NameTable(Province.objects.all())
+            table = self._provinces
+        
+        provinces = {}
+        for name in names:
+            province = table.find(name)
+            if province is None:
+                logger.warning(f"Province not found: {name}")
+            else:
+                provinces[name] = province
+        return provinces
+
+
+# Shared by every importer in the process
+lookup_cache = LookupCache()
+
+
+def _invalidate_lookup_cache(sender, **kwargs) -> None:
+    """Signal handler dropping the shared cache when a lookup row changes."""
+    lookup_cache.invalidate()
+
+
+def connect_invalidation_signals() -> None:
+    """Invalidate the shared cache whenever an Industry or Province changes."""
+    from django.db.models.signals import post_delete, post_save
+    from opportunities.models import Industry, Province
+    
+    for model in (Industry, Province):
+        post_save.connect(_invalidate_lookup_cache, sender=model,
+                          dispatch_uid=f'scraper.lookups.{model.__name__}.save')
+        post_delete.connect(_invalidate_lookup_cache, sender=model,
+                            dispatch_uid=f'scraper.lookups.{model.__name__}.delete')
@@ -13,7 +13,13 @@ from scraper.deduplicator import create_django_deduplicator
 from scraper.compliance import ComplianceChecker
 from scraper.status import StatusManager
 from scraper.importer import DjangoImporter
-from scraper.exporter import JsonExporter
+from scraper.domains import default_classifier
+from scraper.exporter import ExportFormat, JsonExporter
+from scraper.validator_store import ValidatorStore
+from scraper.rate_limiter import DEFAULT_LEASE_DB, DomainRateLimiter
+from scraper.robots_store import RobotsStore
+from scraper.response_cache import ResponseCache, CacheMode
+from scraper.pipeline import PipelineConfig
 
 
 class Command(BaseCommand):
@@ -35,11 +41,61 @@ class Command(BaseCommand):
             type=str,
             help='Output file path for JSON (used with --dry-run). If not specified, outputs to stdout.'
         )
+        parser.add_argument(
+            '--format',
+            choices=[fmt.value for fmt in ExportFormat],
+            default=ExportFormat.JSON.value,
+            help='Dry-run output layout: "json" writes one JSON array, "ndjson" one '
+                 'record per line. Records are written as they are scraped. Default: json.'
+        )
+        parser.add_argument(
+            '--gzip',
+            action='store_true',
+            help='Gzip the dry-run output file (implied by an --output ending in .gz).'
+        )
         parser.add_argument(
             '--verbose',
             action='store_true',
             help='Enable verbose logging output.'
         )
+        parser.add_argument(
+            '--full-refresh',
+            action='store_true',
+            help='Re-download and re-import every page instead of sending conditional '
+                 'requests and skipping pages whose content is unchanged.'
+        )
+        parser.add_argument(
+            '--cache',
+            choices=['off'] + [mode.value for mode in CacheMode],
+            default='off',
+            help='Response cache mode: "normal" serves fresh cached pages, "record" '
+                 'fetches and stores everything, "replay" serves only from the cache '
+                 '(no network). Default: off.'
+        )
+        parser.add_argument(
+            '--cache-dir',
+            type=str,
+            help='Directory for the response cache (default: scraper/http_cache).'
+        )
+        parser.add_argument(
+            '--pipeline',
+            action='store_true',
+            help='Run sources concurrently through the staged pipeline.'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=PipelineConfig.fetch_workers,
+            help='Sources fetched concurrently in pipeline mode '
+                 f'(default: {PipelineConfig.fetch_workers}).'
+        )
+        parser.add_argument(
+            '--processes',
+            type=int,
+            default=0,
+            help='Worker processes for parsing and normalising pages '
+                 '(implies --pipeline; default: 0, parse in threads).'
+        )
         parser.add_argument(
             '--list-sources',
             action='store_true',
@@ -54,15 +110,40 @@ class Command(BaseCommand):
             format='%(asctime)s [%(levelname)s] %(name)s - %(message)s'
         )
         
+        # Conditional requests only for real runs; dry runs export every page
+        validator_store = None
+        if not options.get('dry_run') and not options.get('full_refresh'):
+            validator_store = ValidatorStore()
+        
+        response_cache = None
+        if options.get('cache', 'off') != 'off':
+            response_cache = ResponseCache(
+                cache_dir=options.get('cache_dir'),
+                mode=CacheMode(options['cache'])
+            )
+        
         # Create engine with all components
         engine = ScraperEngine(
-            http_client=HttpClient(),
+            http_client=HttpClient(
+                validator_store=validator_store,
+                response_cache=response_cache,
+                robots_store=RobotsStore(),
+                rate_limiter=DomainRateLimiter(lease_path=DEFAULT_LEASE_DB)
+            ),
             normaliser=RecordNormaliser(),
             deduplicator=create_django_deduplicator(),
             compliance_checker=ComplianceChecker(),
             status_manager=StatusManager(),
-            importer=DjangoImporter(),
+            importer=DjangoImporter(classifier=default_classifier()),
             exporter=JsonExporter(),
+            skip_unchanged=not options.get('full_refresh'),
+            pipeline_config=(
+                PipelineConfig(
+                    fetch_workers=options['workers'],
+                    process_workers=options['processes']
+                )
+                if options.get('pipeline') or options.get('processes') else None
+            ),
         )
         
         # Load sources
@@ -81,16 +162,21 @@ class Command(BaseCommand):
             # Dry run - output JSON
             self.stdout.write(self.style.NOTICE('Running in dry-run mode (no database import)'))
             
-            json_output = engine.scrape_to_json(
+            if options.get('gzip') and not output_path:
+                raise CommandError('--gzip requires --output')
+            
+            # Records are streamed as they are scraped
+            if not output_path:
+                self.stdout.ending = None
+            count = engine.scrape_to_stream(
+                output=output_path or self.stdout,
                 source_id=source_id,
-                output_path=output_path
+                fmt=ExportFormat(options.get('format', ExportFormat.JSON.value)),
+                compress=True if options.get('gzip') else None
             )
             
-            if not output_path:
-                # Output to stdout
-                self.stdout.write(json_output)
-            else:
-                self.stdout.write(self.style.SUCCESS(f'JSON output written to: {output_path}'))
+            if output_path:
+                self.stdout.write(self.style.SUCCESS(f'{count} records written to: {output_path}'))
         else:
             # Normal run - import to database
             result = engine.run(source_id=source_id, dry_run=False)
@@ -107,6 +193,7 @@ class Command(BaseCommand):
             self.stdout.write(self.style.SUCCESS(f'Records updated: {result.total_records_updated}'))
             self.stdout.write(f'Records skipped: {result.total_records_skipped}')
             self.stdout.write(f'Records rejected: {result.total_records_rejected}')
+            self.stdout.write(f'Records unchanged: {result.total_records_unchanged}')
             
             if result.sources_failed > 0:
                 self.stdout.write('')
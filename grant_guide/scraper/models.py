@@ -70,6 +70,8 @@ class SourceConfig:
     last_scraped: Optional[datetime] = None
     needs_attention: bool = False
     consecutive_failures: int = 0
+    cache_ttl_seconds: Optional[int] = None
+    extraction: Optional[dict] = None  # Spec for adapters.declarative.DeclarativeAdapter
 
 
 @dataclass
@@ -139,6 +141,7 @@ class DeduplicationResult:
     existing_record_id: Optional[int] = None
     match_type: Optional[str] = None  # "apply_url", "source_url", "fuzzy_title"
     similarity_score: Optional[float] = None
+    batch_match: Optional[int] = None  # Position of an earlier new record in the same batch
 
 
 @dataclass
@@ -153,6 +156,6 @@ class ComplianceResult:
 class ImportResult:
     """Result of importing a record."""
     success: bool
-    action: str  # "created", "updated", "skipped"
+    action: str  # "created", "updated", "skipped", "unchanged"
     record_id: Optional[int] = None
     error: Optional[str] = None
@@ -1,10 +1,20 @@
 """
 Record normaliser for transforming raw scraped data into canonical format.
+
+Dates and amounts are parsed by module-level functions built on
+precompiled regexes. A date string is matched once against a single
+pattern whose alternatives are the supported shapes, and the name of the
+alternative that matched picks the field order, so adding a shape does
+not add a failed parse per value. Both parsers are memoised, since the
+same strings ("Rolling", "R1 million") recur across pages and runs.
 """
 import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import date
 from decimal import Decimal, InvalidOperation
-from typing import Optional
+from functools import lru_cache
+from typing import Iterable, Optional, Sequence
 
 from .models import (
     RawOpportunity, NormalisedOpportunity, RecordType, FundingType,
@@ -12,10 +22,147 @@ from .models import (
 )
 from .http_client import compute_content_hash
 
+# Distinct strings remembered by the date and amount parsers
+PARSE_CACHE_SIZE = 4096
+
+_MONTHS = {
+    name: number
+    for number, names in enumerate((
+        ('january', 'jan'), ('february', 'feb'), ('march', 'mar'),
+        ('april', 'apr'), ('may',), ('june', 'jun'), ('july', 'jul'),
+        ('august', 'aug'), ('september', 'sep', 'sept'), ('october', 'oct'),
+        ('november', 'nov'), ('december', 'dec'),
+    ), start=1)
+    for name in names
+}
+
+# One alternative per date shape; the outer group's name says which matched
+_DATE_SHAPES = re.compile(
+    r'(?P<ymd>(\d{4})[-/.](\d{1,2})[-/.](\d{1,2}))'                           # 2025-03-15
+    r'|(?P<dmy>(\d{1,2})[-/.](\d{1,2})[-/.](\d{4}))'                          # 15/03/2025
+    r'|(?P<dmony>(\d{1,2})(?:st|nd|rd|th)?\s+([a-z]+)\.?,?\s+(\d{4}))'         # 15th March, 2025
+    r'|(?P<mondy>([a-z]+)\.?\s+(\d{1,2})(?:st|nd|rd|th)?,?\s+(\d{4}))',        # March 15, 2025
+    re.IGNORECASE
+)
+
+# Positions of year, month and day among each shape's inner groups
+_DATE_FIELDS = {'ymd': (0, 1, 2), 'dmy': (2, 1, 0), 'dmony': (2, 1, 0), 'mondy': (2, 0, 1)}
+
+# A number (spaces group thousands, commas and dots separate) and its scale
+_AMOUNT = re.compile(
+    r'(?P<number>\d+(?:[ \u00a0]\d{3}(?!\d)|[,.]\d+)*)'
+    r'(?:\s*(?P<unit>billion|bn|million|mil|mn|m|thousand|k)(?![a-z]))?',
+    re.IGNORECASE
+)
+
+# Text allowed between the two amounts of a range: "R50k–R2m", "R1m to R5m"
+_RANGE_SEPARATOR = re.compile(
+    r'\s*(?:[-\u2013\u2014]|to|and)\s*(?:r|zar|\$)?\s*', re.IGNORECASE
+)
+
+_THOUSANDS = re.compile(r'\d{1,3}(?:,\d{3})+')
+
+_MULTIPLIERS = {
+    'k': 1_000, 'thousand': 1_000,
+    'm': 1_000_000, 'mn': 1_000_000, 'mil': 1_000_000, 'million': 1_000_000,
+    'bn': 1_000_000_000, 'billion': 1_000_000_000,
+}
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_date(text: str) -> Optional[date]:
+    """
+    Parse a date string.
+    
+    Handles formats: 15 March 2025 / 15th Mar 2025 / 2025/03/15 /
+    15-03-2025 / March 15, 2025 / 15 March, 2025
+    
+    Returns:
+        The date, or None if the string is not a supported date.
+    """
+    match = _DATE_SHAPES.fullmatch(text.strip())
+    if match is None:
+        return None
+    parts = match.groups()[match.lastindex:match.lastindex + 3]
+    year, month, day = (parts[i] for i in _DATE_FIELDS[match.lastgroup])
+    month = int(month) if month.isdigit() else _MONTHS.get(month.lower())
+    if month is None:
+        return None
+    try:
+        return date(int(year), month, int(day))
+    except ValueError:
+        return None
+
+
+def _parse_number(number: str) -> Optional[Decimal]:
+    """Read a number whose commas group thousands ("1,500") or mark decimals ("1,5")."""
+    number = number.replace(' ', '').replace('\u00a0', '')
+    if ',' in number:
+        if '.' in number or _THOUSANDS.fullmatch(number):
+            number = number.replace(',', '')
+        else:
+            number = number.replace(',', '.')
+    try:
+        return Decimal(number)
+    except InvalidOperation:
+        return None
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_amount_range(text: str) -> tuple[Optional[Decimal], Optional[Decimal]]:
+    """
+    Parse an amount or a range of amounts in ZAR.
+    
+    Handles formats: R50,000 / R 50 000 / 50000 ZAR / R1 million /
+    R500k / R1,5m / R50k–R2m / R1 to R5 million
+    
+    Returns:
+        (low, high); high is None unless the string is a range, and both
+        are None if it holds no amount. In "R1–5 million" the unit of the
+        upper bound also applies to the lower one.
+    """
+    matches = []
+    for match in _AMOUNT.finditer(text):
+        matches.append(match)
+        if len(matches) == 2:
+            break
+    if not matches:
+        return None, None
+    
+    low = _parse_number(matches[0].group('number'))
+    low_unit = matches[0].group('unit')
+    if low is None:
+        return None, None
+    
+    high = None
+    if len(matches) == 2 and _RANGE_SEPARATOR.fullmatch(
+        text, matches[0].end(), matches[1].start()
+    ):
+        high = _parse_number(matches[1].group('number'))
+        high_unit = matches[1].group('unit')
+        if high is not None:
+            if low_unit is None and high_unit and low < high:
+                low_unit = high_unit
+            high *= _MULTIPLIERS[high_unit.lower()] if high_unit else 1
+    
+    low *= _MULTIPLIERS[low_unit.lower()] if low_unit else 1
+    return low, high
+
+
+@dataclass
+class _Resolved:
+    """Normalised values of the distinct strings in a batch of raw records."""
+    dates: dict
+    amounts: dict
+    industries: dict
+    provinces: dict
+
 
 class RecordNormaliser:
     """Transforms raw extracted data into normalised format."""
     
+    HASH_WORKERS = 4  # Threads hashing page content in normalise_batch
+    
     CANONICAL_PROVINCES = [
         "Eastern Cape", "Free State", "Gauteng", "KwaZulu-Natal",
         "Limpopo", "Mpumalanga", "Northern Cape", "North West",
@@ -110,14 +257,74 @@ class RecordNormaliser:
         Args:
             raw: Raw opportunity data from scraper.
             source_name: Name of the source for attribution.
-            
+        
         Returns:
             Normalised opportunity record.
         """
+        return self._assemble(
+            raw, source_name, self._resolve([raw]), compute_content_hash(raw.raw_html)
+        )
+    
+    def normalise_batch(
+        self,
+        records: Iterable[RawOpportunity],
+        source_name: str
+    ) -> list[NormalisedOpportunity]:
+        """
+        Transform many raw records to normalised format.
+        
+        Each distinct date, amount, industry and province string in the
+        batch is resolved once, and the pages' content hashes are computed
+        in a thread pool (hashlib releases the GIL while hashing).
+        
+        Args:
+            records: Raw opportunity data from scraper.
+            source_name: Name of the source for attribution.
+        
+        Returns:
+            Normalised opportunity records, in order.
+        """
+        records = list(records)
+        resolved = self._resolve(records)
+        hashes = self._content_hashes([raw.raw_html for raw in records])
+        return [
+            self._assemble(raw, source_name, resolved, content_hash)
+            for raw, content_hash in zip(records, hashes)
+        ]
+    
+    def _resolve(self, records: Sequence[RawOpportunity]) -> _Resolved:
+        """Normalise each distinct date, amount and tag string in records once."""
+        deadlines = {raw.deadline for raw in records}
+        amounts = {raw.funding_amount_min for raw in records}
+        amounts.update(raw.funding_amount_max for raw in records)
+        industries = {tag for raw in records for tag in raw.industries}
+        provinces = {tag for raw in records for tag in raw.provinces}
+        return _Resolved(
+            dates={text: self.normalise_date(text) for text in deadlines},
+            amounts={text: self.normalise_amount_range(text) for text in amounts},
+            industries={tag: self.normalise_industry(tag) for tag in industries},
+            provinces={tag: self.normalise_province(tag) for tag in provinces},
+        )
+    
+    def _content_hashes(self, pages: list[str]) -> list[str]:
+        """Hash pages, spreading large batches over HASH_WORKERS threads."""
+        if len(pages) < 2 or self.HASH_WORKERS < 2:
+            return [compute_content_hash(page) for page in pages]
+        with ThreadPoolExecutor(max_workers=min(self.HASH_WORKERS, len(pages))) as executor:
+            return list(executor.map(compute_content_hash, pages))
+    
+    def _assemble(
+        self,
+        raw: RawOpportunity,
+        source_name: str,
+        resolved: _Resolved,
+        raw_content_hash: str
+    ) -> NormalisedOpportunity:
+        """Build a normalised record from raw data and its resolved strings."""
         validation_issues = []
         
         # Determine record type
-        deadline_date = self.normalise_date(raw.deadline)
+        deadline_date = resolved.dates[raw.deadline]
         if deadline_date is not None or not raw.is_rolling:
             record_type = RecordType.FUNDING_OPPORTUNITY
         else:
@@ -144,16 +351,16 @@ class RecordNormaliser:
         
         # Industries
         industry_tags = [
-            self.normalise_industry(i) for i in raw.industries
-            if self.normalise_industry(i) is not None
+            resolved.industries[i] for i in raw.industries
+            if resolved.industries[i] is not None
         ]
         if not industry_tags and raw.industries:
             validation_issues.append(f"Could not map industries: {raw.industries}")
         
         # Provinces
         province_tags = [
-            self.normalise_province(p) for p in raw.provinces
-            if self.normalise_province(p) is not None
+            resolved.provinces[p] for p in raw.provinces
+            if resolved.provinces[p] is not None
         ]
         if not province_tags:
             province_tags = ["National"]  # Default
@@ -165,12 +372,12 @@ class RecordNormaliser:
             if raw.business_stage:
                 validation_issues.append(f"Could not map business stage: {raw.business_stage}")
         
-        # Amounts
-        funding_amount_min = self.normalise_amount(raw.funding_amount_min)
-        funding_amount_max = self.normalise_amount(raw.funding_amount_max)
-        
-        # Compute content hash
-        raw_content_hash = compute_content_hash(raw.raw_html)
+        # Amounts (either field may hold a range such as "R50k–R2m")
+        funding_amount_min, range_max = resolved.amounts[raw.funding_amount_min]
+        max_low, max_high = resolved.amounts[raw.funding_amount_max]
+        funding_amount_max = max_high if max_high is not None else max_low
+        if funding_amount_max is None:
+            funding_amount_max = range_max
         
         # Determine status
         status = self._determine_status(
@@ -208,87 +415,44 @@ class RecordNormaliser:
         """
         Convert amount string to ZAR Decimal.
         
-        Handles formats: R50,000 / R 50 000 / 50000 ZAR / R1 million / R500k
-        Also handles integers/floats passed directly.
+        Handles formats: R50,000 / R 50 000 / 50000 ZAR / R1 million / R500k / R1,5m
+        Also handles integers/floats passed directly. For a range such as
+        "R50k–R2m" this is the lower bound.
+        """
+        return self.normalise_amount_range(amount_str)[0]
+    
+    def normalise_amount_range(
+        self,
+        amount_str: Optional[str]
+    ) -> tuple[Optional[Decimal], Optional[Decimal]]:
+        """
+        Convert an amount or range string to ZAR Decimals.
+        
+        Returns:
+            (low, high); high is None unless amount_str is a range.
         """
         if amount_str is None:
-            return None
+            return None, None
         
         # Handle numeric types directly
         if isinstance(amount_str, (int, float)):
-            return Decimal(str(amount_str))
+            return Decimal(str(amount_str)), None
         
         if not isinstance(amount_str, str):
-            return None
-        
-        # Clean the string
-        amount = amount_str.strip().upper()
-        
-        # Remove currency indicators
-        amount = re.sub(r'^R\s*', '', amount)
-        amount = re.sub(r'\s*ZAR$', '', amount)
-        amount = re.sub(r'\s*RAND$', '', amount)
-        
-        # Handle multipliers
-        multiplier = 1
-        if 'MILLION' in amount or 'MIL' in amount:
-            multiplier = 1_000_000
-            amount = re.sub(r'\s*(MILLION|MIL).*', '', amount)
-        elif 'K' in amount:
-            multiplier = 1_000
-            amount = re.sub(r'\s*K.*', '', amount)
-        elif 'BILLION' in amount:
-            multiplier = 1_000_000_000
-            amount = re.sub(r'\s*BILLION.*', '', amount)
-        
-        # Remove spaces and commas
-        amount = amount.replace(' ', '').replace(',', '')
+            return None, None
         
-        # Extract number
-        match = re.search(r'[\d.]+', amount)
-        if not match:
-            return None
-        
-        try:
-            value = Decimal(match.group()) * multiplier
-            return value
-        except InvalidOperation:
-            return None
+        return parse_amount_range(amount_str)
     
     def normalise_date(self, date_str: Optional[str]) -> Optional[date]:
         """
         Convert date string to ISO date.
         
-        Handles formats: 15 March 2025 / 2025/03/15 / 15-03-2025 / March 15, 2025
+        Handles formats: 15 March 2025 / 15th March 2025 / 2025/03/15 / 15-03-2025 / March 15, 2025
         """
-        if not date_str:
+        if not date_str or not isinstance(date_str, str):
             return None
         
-        import re
-        from datetime import datetime
-        
-        date_str = date_str.strip()
-        
-        # Common date formats to try
-        formats = [
-            '%Y-%m-%d',           # 2025-03-15
-            '%d-%m-%Y',           # 15-03-2025
-            '%Y/%m/%d',           # 2025/03/15
-            '%d/%m/%Y',           # 15/03/2025
-            '%d %B %Y',           # 15 March 2025
-            '%d %b %Y',           # 15 Mar 2025
-            '%B %d, %Y',          # March 15, 2025
-            '%b %d, %Y',          # Mar 15, 2025
-            '%d %B, %Y',          # 15 March, 2025
-        ]
-        
-        for fmt in formats:
-            try:
-                return datetime.strptime(date_str, fmt).date()
-            except ValueError:
-                continue
-        
-        return None
+        return parse_date(date_str)
     
     def normalise_province(self, province: str) -> Optional[str]:
         """Map province to canonical name."""
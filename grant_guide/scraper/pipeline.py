@@ -0,0 +1,433 @@
+"""
+Staged, queue-based pipeline for ScraperEngine.
+
+Runs the same steps as the serial engine (fetch, extract, normalise and
+compliance, deduplicate, import) as stages of worker threads connected by
+bounded queues. One source's network waits overlap other sources' parsing
+and database work, and a full queue blocks its producers (backpressure),
+so memory stays bounded and run time tends towards the slowest stage.
+
+Fetch workers take whole sources, so pages from one source are still
+fetched one at a time and per-domain politeness is unchanged. Workers run
+in the caller's cancellation scope and drop queued work once it is cancelled.
+
+With process_workers set, extraction, normalisation and compliance run in
+a process pool so CPU-bound parsing is not serialised by the GIL.
+"""
+import importlib
+import logging
+import multiprocessing
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Callable, Optional
+
+from .adapters.base import BaseSourceAdapter
+from .cancellation import CancellationToken, OperationCancelled, cancellation_scope, current_token
+from .frontier import UrlFrontier
+from .models import SourceConfig, RawOpportunity, NormalisedOpportunity, ImportResult
+
+if TYPE_CHECKING:
+    from .engine import ScraperEngine, SourceResult
+
+logger = logging.getLogger('scraper.pipeline')
+
+# Queue marker telling a worker to stop
+_DONE = object()
+
+
+@dataclass
+class PipelineConfig:
+    """Worker counts and queue sizes for the staged pipeline."""
+    fetch_workers: int = 4        # Sources fetched concurrently
+    extract_workers: int = 2      # HTML parsing
+    check_workers: int = 2        # Normalisation and compliance
+    queue_size: int = 64          # Items buffered between stages
+    import_batch_size: int = 50   # Records written per bulk import
+    process_workers: int = 0      # If > 0, extract/normalise/check in worker processes
+
+
+@dataclass
+class CheckedPage:
+    """Compact result of extracting and checking one page in a worker process."""
+    source_url: str
+    extracted: bool = True
+    normalised: Optional[NormalisedOpportunity] = None  # None if rejected or failed
+    error: Optional[str] = None
+
+
+# Per-process state set up by _init_process_worker
+_worker_state: dict = {}
+
+
+def _init_process_worker(normaliser, compliance_checker) -> None:
+    """Store the record steps once per worker process instead of per task."""
+    _worker_state['normaliser'] = normaliser
+    _worker_state['compliance_checker'] = compliance_checker
+    _worker_state['adapters'] = {}
+
+
+def extract_and_check(source: SourceConfig, url: str, html: str) -> CheckedPage:
+    """
+    Extract, normalise and compliance-check a page in a worker process.
+    
+    Only the normalised record travels back to the parent, not the HTML
+    or the parse tree.
+    """
+    from .engine import normalise_and_check
+    
+    adapters = _worker_state['adapters']
+    adapter = adapters.get(source.source_id)
+    if adapter is None:
+        # Extraction never makes requests, so no HTTP client is needed
+        module_path, class_name = source.adapter_class.rsplit('.', 1)
+        adapter_class = getattr(importlib.import_module(module_path), class_name)
+        adapter = adapters[source.source_id] = adapter_class(source, None)
+    
+    raw = adapter.extract(url, html)
+    if raw is None:
+        return CheckedPage(source_url=url, extracted=False)
+    
+    try:
+        normalised = normalise_and_check(
+            raw, source, _worker_state['normaliser'], _worker_state['compliance_checker']
+        )
+    except Exception as e:
+        return CheckedPage(source_url=raw.source_url, error=str(e))
+    return CheckedPage(source_url=raw.source_url, normalised=normalised)
+
+
+def _warm_up() -> None:
+    """No-op task used to start worker processes before the stages run."""
+
+
+@dataclass
+class _SourceRun:
+    """Per-source state shared by the stages."""
+    source: SourceConfig
+    result: 'SourceResult'
+    adapter: Optional[BaseSourceAdapter] = None
+    unchanged_ids: list[int] = field(default_factory=list)
+    failed: bool = False
+
+
+class _Stage:
+    """A pool of worker threads consuming one bounded queue."""
+    
+    def __init__(
+        self,
+        name: str,
+        handler: Callable,
+        workers: int,
+        queue_size: int,
+        on_exit: Optional[Callable[[], None]] = None,
+        token: Optional[CancellationToken] = None
+    ):
+        self.name = name
+        self.token = token
+        self.queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._handler = handler
+        self._on_exit = on_exit
+        self._threads = [
+            threading.Thread(target=self._work, name=f"{name}-{i}", daemon=True)
+            for i in range(max(1, workers))
+        ]
+    
+    def start(self) -> None:
+        for thread in self._threads:
+            thread.start()
+    
+    def put(self, item) -> None:
+        """Queue an item, blocking while the stage is saturated."""
+        self.queue.put(item)
+    
+    def close(self) -> None:
+        """Wait for queued items to be handled, then stop the workers."""
+        for _ in self._threads:
+            self.queue.put(_DONE)
+        for thread in self._threads:
+            thread.join()
+    
+    def _work(self) -> None:
+        # Worker threads do not inherit the caller's context
+        with cancellation_scope(self.token):
+            try:
+                while True:
+                    item = self.queue.get()
+                    if item is _DONE:
+                        break
+                    # Once cancelled, drain the queue so producers are not blocked
+                    if self.token is not None and self.token.cancelled:
+                        continue
+                    try:
+                        self._handler(item)
+                    except Exception:
+                        logger.exception(f"Unhandled error in {self.name} stage")
+            finally:
+                if self._on_exit is not None:
+                    self._on_exit()
+
+
+class StagedPipeline:
+    """Runs sources through the engine's steps as concurrent stages."""
+    
+    def __init__(self, engine: 'ScraperEngine', config: Optional[PipelineConfig] = None):
+        """
+        Initialize pipeline.
+        
+        Args:
+            engine: Engine providing adapters and the per-record steps.
+            config: Worker counts and queue sizes. If None, uses defaults.
+        """
+        self.engine = engine
+        self.config = config or PipelineConfig()
+        self._lock = threading.Lock()
+        self._pending: list[tuple[_SourceRun, RawOpportunity, NormalisedOpportunity]] = []
+        self._dry_run = False
+        self._frontier: Optional[UrlFrontier] = None
+        self._stages: list[_Stage] = []
+        self._pool: Optional[ProcessPoolExecutor] = None
+    
+    def _build_stages(self, token: Optional[CancellationToken]) -> None:
+        """Create the stages, each running in the caller's cancellation scope."""
+        size = self.config.queue_size
+        self._fetch = _Stage('fetch', self._fetch_source, self.config.fetch_workers, size, token=token)
+        if self._pool is not None:
+            # One thread per process keeps every process busy
+            self._extract = _Stage('extract', self._extract_in_process,
+                                   self.config.process_workers, size, token=token)
+        else:
+            self._extract = _Stage('extract', self._extract_page, self.config.extract_workers, size, token=token)
+        self._check = _Stage('check', self._check_record, self.config.check_workers, size, token=token)
+        # Deduplication and database writes go through one worker in batches,
+        # so each batch is matched against everything imported before it
+        self._import = _Stage('import', self._queue_import, 1, size,
+                              on_exit=self._finish_imports, token=token)
+        self._stages = [self._fetch, self._extract, self._check, self._import]
+    
+    def run(
+        self,
+        sources: list[SourceConfig],
+        dry_run: bool = False,
+        frontier: Optional[UrlFrontier] = None
+    ) -> list['SourceResult']:
+        """
+        Process sources through all stages.
+        
+        Args:
+            sources: Sources to scrape.
+            dry_run: If True, don't import to database.
+            frontier: URL frontier shared by the fetch workers.
+        
+        Returns:
+            SourceResult per source, in the order given.
+        """
+        from .engine import SourceResult
+        
+        self._dry_run = dry_run
+        self._frontier = frontier
+        token = current_token()
+        
+        if self.config.process_workers > 0:
+            # Threads are already running (robots prefetch, scheduler workers),
+            # and a fork could copy a lock one of them holds into the child, so
+            # workers start from a clean forkserver process instead
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.config.process_workers,
+                mp_context=multiprocessing.get_context('forkserver'),
+                initializer=_init_process_worker,
+                initargs=(self.engine.normaliser, self.engine.compliance_checker)
+            )
+            # Start the processes before the stages so the first pages do not wait
+            self._pool.submit(_warm_up).result()
+        
+        self._build_stages(token)
+        runs = [
+            _SourceRun(source=s, result=SourceResult(source_id=s.source_id, source_name=s.source_name))
+            for s in sources
+        ]
+        
+        for stage in self._stages:
+            stage.start()
+        for run in runs:
+            self._fetch.put(run)
+        # Each stage drains before the next is told to stop
+        try:
+            for stage in self._stages:
+                stage.close()
+        finally:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
+        
+        for run in runs:
+            if not run.failed and token is not None and token.cancelled:
+                # Records still queued were dropped, so the source is incomplete
+                self.engine._fail_source(run.source, run.result, OperationCancelled(token.reason))
+            elif not run.failed:
+                try:
+                    self.engine._finish_source(
+                        run.source, run.adapter, run.result, run.unchanged_ids, dry_run
+                    )
+                except Exception as e:
+                    self.engine._fail_source(run.source, run.result, e)
+            self.engine._log_source_result(run.source, run.result)
+        
+        return [run.result for run in runs]
+    
+    def _fetch_source(self, run: _SourceRun) -> None:
+        """Fetch stage: fetch every page of one source."""
+        source = run.source
+        logger.info(f"Processing source: {source.source_name} ({source.source_id})")
+        
+        try:
+            adapter = self.engine.get_adapter(source, self._frontier)
+            run.adapter = adapter
+            
+            # Adapters with their own scrape() cannot be split into stages
+            if type(adapter).scrape is not BaseSourceAdapter.scrape:
+                for raw in adapter.scrape():
+                    self._check.put((run, raw))
+                return
+            
+            adapter.unchanged_urls = []
+            adapter.gated_urls = []
+            for url in adapter.opportunity_urls():
+                html = adapter.fetch(url)
+                if html is not None:
+                    self._extract.put((run, url, html))
+        except Exception as e:
+            run.failed = True
+            with self._lock:
+                self.engine._fail_source(source, run.result, e)
+    
+    def _extract_page(self, item: tuple[_SourceRun, str, str]) -> None:
+        """Extract stage: parse a fetched page."""
+        run, url, html = item
+        raw = run.adapter.extract(url, html)
+        if raw is not None:
+            self._check.put((run, raw))
+    
+    def _extract_in_process(self, item: tuple[_SourceRun, str, str]) -> None:
+        """Extract stage (process mode): extract, normalise and check in a worker process."""
+        run, url, html = item
+        
+        # Adapters set source_url and raw_html to the fetched page, so the
+        # unchanged check can run before the page is shipped anywhere
+        page_raw = RawOpportunity(source_url=url, raw_html=html)
+        unchanged_id = self.engine._unchanged_record_id(page_raw)
+        if unchanged_id is not None:
+            with self._lock:
+                run.result.records_found += 1
+                self.engine._count_import(
+                    run.result,
+                    ImportResult(success=True, action='unchanged', record_id=unchanged_id),
+                    run.unchanged_ids
+                )
+            return
+        
+        try:
+            page = self._pool.submit(extract_and_check, run.source, url, html).result()
+        except Exception as e:
+            with self._lock:
+                run.result.records_found += 1
+                self.engine._record_error(run.result, page_raw, e)
+            return
+        
+        if not page.extracted:
+            # Extraction failed or found nothing; the worker cannot reach the
+            # validator store, so make sure the page is fetched in full next run
+            self.engine._forget_validators(url)
+            return
+        
+        raw = RawOpportunity(source_url=page.source_url)
+        with self._lock:
+            run.result.records_found += 1
+            if page.error is not None:
+                self.engine._record_error(run.result, raw, RuntimeError(page.error))
+                return
+            if page.normalised is None:
+                self.engine._count_import(run.result, None, source_url=page.source_url)
+                return
+        
+        self._import.put((run, raw, page.normalised))
+    
+    def _check_record(self, item: tuple[_SourceRun, RawOpportunity]) -> None:
+        """Check stage: unchanged-page check, normalisation and compliance."""
+        run, raw = item
+        with self._lock:
+            run.result.records_found += 1
+        
+        try:
+            checked = self.engine._check_record(raw, run.source)
+        except Exception as e:
+            with self._lock:
+                self.engine._record_error(run.result, raw, e)
+            return
+        
+        if isinstance(checked, NormalisedOpportunity):
+            self._import.put((run, raw, checked))
+        else:
+            with self._lock:
+                self.engine._count_import(run.result, checked, run.unchanged_ids, raw.source_url)
+    
+    def _queue_import(self, item: tuple[_SourceRun, RawOpportunity, NormalisedOpportunity]) -> None:
+        """Import stage: collect records and deduplicate and write them in batches."""
+        self._pending.append(item)
+        if len(self._pending) >= self.config.import_batch_size:
+            self._flush_imports()
+    
+    def _flush_imports(self) -> None:
+        """
+        Deduplicate and write pending records with one bulk import.
+        
+        Records from every source share the batch, so two sources
+        publishing the same opportunity resolve to one row.
+        """
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+        
+        try:
+            matched = self.engine._match_records([record for _, _, record in pending])
+        except Exception as e:
+            with self._lock:
+                for run, raw, _ in pending:
+                    self.engine._record_error(run.result, raw, e)
+            return
+        
+        if self._dry_run:
+            with self._lock:
+                for (run, _, _), (record, existing_id, batch_match) in zip(pending, matched):
+                    self.engine._count_import(
+                        run.result, self.engine._dry_run_result(record, existing_id, batch_match)
+                    )
+            return
+        
+        try:
+            results = self.engine.importer.import_batch(
+                [record for record, _, _ in matched],
+                [existing_id for _, existing_id, _ in matched],
+                [batch_match for _, _, batch_match in matched]
+            )
+        except Exception as e:
+            logger.error(f"Error importing batch of {len(pending)} records: {e}")
+            with self._lock:
+                for run, _, record in pending:
+                    run.result.errors.append(str(e))
+                    run.result.records_skipped += 1
+                    self.engine._forget_validators(record.source_url)
+            return
+        
+        with self._lock:
+            for (run, _, record), import_result in zip(pending, results):
+                self.engine._count_import(run.result, import_result, source_url=record.source_url)
+    
+    def _finish_imports(self) -> None:
+        """Flush the last batch and release this thread's database connection."""
+        try:
+            self._flush_imports()
+        finally:
+            from django.db import connections
+            connections.close_all()
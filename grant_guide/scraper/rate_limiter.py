@@ -0,0 +1,218 @@
+"""
+Per-domain rate limiting shared by every worker that fetches pages.
+
+Each domain is a token bucket holding one token that refills after the
+domain's interval: a request reserves the next free slot under a lock and
+then waits for it outside the lock, so any number of threads (or asyncio
+tasks) can share one limiter without two requests to the same site ever
+landing closer together than its interval. Different domains never wait
+on each other.
+
+The interval for a domain is the largest of the source's configured
+rate_limit_seconds (or the default delay) and robots.txt Crawl-delay,
+stretched while the site is pushing back: a 429/503 holds the domain off
+for its Retry-After (or one interval) and doubles the interval, and each
+later success halves it back towards normal.
+
+With a lease file, slots are also reserved through a small SQLite table, so
+separate processes (a cron run and a manual run, say) share the same
+per-domain spacing.
+"""
+import asyncio
+import logging
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Optional
+
+from . import cancellation
+
+logger = logging.getLogger('scraper.rate_limit')
+
+# Default lease location, next to sources.yaml
+DEFAULT_LEASE_DB = Path(__file__).parent / "rate_limits.sqlite3"
+
+# Cap on how far 429/503 responses can stretch a domain's interval
+MAX_BACKOFF_FACTOR = 16.0
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header.
+    
+    Args:
+        value: Header value: delay in seconds or an HTTP date.
+    
+    Returns:
+        Seconds to wait (never negative), or None if missing or invalid.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        return None
+    return max(0.0, (when - datetime.now(when.tzinfo)).total_seconds())
+
+
+class DomainRateLimiter:
+    """Thread- and asyncio-safe per-domain request spacing."""
+    
+    def __init__(self, default_delay: float = 2.0, lease_path: Optional[str] = None):
+        """
+        Initialize limiter.
+        
+        Args:
+            default_delay: Seconds between requests to a domain with no
+                configured delay.
+            lease_path: SQLite file to share slots with other processes.
+                If None, slots are only shared within this process.
+        """
+        self.default_delay = default_delay
+        # Start of the latest slot reserved per domain (may be in the future)
+        self.last_request: dict[str, datetime] = {}
+        self._delays: dict[str, float] = {}
+        self._backoff: dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._lease: Optional[sqlite3.Connection] = None
+        if lease_path is not None:
+            self._lease = sqlite3.connect(
+                str(lease_path), timeout=30, check_same_thread=False, isolation_level=None
+            )
+            self._lease.execute(
+                "CREATE TABLE IF NOT EXISTS domain_slots ("
+                " domain TEXT PRIMARY KEY,"
+                " last_request REAL NOT NULL)"
+            )
+    
+    def set_delay(self, domain: str, seconds: float) -> None:
+        """Configure the minimum seconds between requests to a domain."""
+        with self._lock:
+            self._delays[domain] = seconds
+    
+    def delay_for(self, domain: str) -> float:
+        """Configured delay for a domain, or the default delay."""
+        return self._delays.get(domain, self.default_delay)
+    
+    def reserve(self, domain: str, interval: Optional[float] = None) -> float:
+        """
+        Reserve the next request slot for a domain.
+        
+        Args:
+            domain: Domain to request.
+            interval: Seconds since the previous request required (e.g. the
+                robots.txt Crawl-delay). If None, uses delay_for(domain).
+        
+        Returns:
+            Seconds to wait before making the request.
+        """
+        if interval is None:
+            interval = self.delay_for(domain)
+        with self._lock:
+            now = datetime.now()
+            interval *= self._backoff.get(domain, 1.0)
+            if self._lease is not None:
+                start = self._reserve_lease(domain, now, interval)
+            else:
+                previous = self.last_request.get(domain)
+                start = now if previous is None else max(now, previous + timedelta(seconds=interval))
+            self.last_request[domain] = start
+        return (start - now).total_seconds()
+    
+    def acquire(self, domain: str, interval: Optional[float] = None) -> None:
+        """
+        Wait for the next request slot for a domain.
+        
+        Raises:
+            OperationCancelled: If the current cancellation token is cancelled
+                while waiting.
+        """
+        wait = self.reserve(domain, interval)
+        if wait > 0:
+            logger.debug(f"Rate limiting: waiting {wait:.2f}s for {domain}")
+            cancellation.sleep(wait)
+    
+    async def acquire_async(self, domain: str, interval: Optional[float] = None) -> None:
+        """Wait for the next request slot for a domain without blocking the event loop."""
+        wait = self.reserve(domain, interval)
+        if wait > 0:
+            logger.debug(f"Rate limiting: waiting {wait:.2f}s for {domain}")
+            await asyncio.sleep(wait)
+            cancellation.check_cancelled()
+    
+    def record(self, domain: str) -> None:
+        """
+        Record that a request to a domain just finished successfully.
+        
+        Spacing is measured from the end of the latest request, and any
+        backoff from earlier 429/503 responses is halved.
+        """
+        with self._lock:
+            self._push_back(domain, datetime.now())
+            factor = self._backoff.get(domain, 1.0) / 2
+            if factor <= 1.0:
+                self._backoff.pop(domain, None)
+            else:
+                self._backoff[domain] = factor
+    
+    def penalise(self, domain: str, retry_after: Optional[float] = None) -> None:
+        """
+        Slow down after the site answered 429 Too Many Requests or 503.
+        
+        Doubles the domain's interval (up to MAX_BACKOFF_FACTOR) and holds
+        off its next request until retry_after seconds (or one stretched
+        interval) from now, plus the interval.
+        """
+        with self._lock:
+            factor = min(self._backoff.get(domain, 1.0) * 2, MAX_BACKOFF_FACTOR)
+            self._backoff[domain] = factor
+            pause = retry_after if retry_after is not None else self.delay_for(domain) * factor
+            self._push_back(domain, datetime.now() + timedelta(seconds=pause))
+        logger.warning(f"{domain} asked us to slow down; pausing {pause:.1f}s")
+    
+    def _push_back(self, domain: str, when: datetime) -> None:
+        """Move the domain's latest request time forward to when (lock held)."""
+        previous = self.last_request.get(domain)
+        self.last_request[domain] = when if previous is None else max(previous, when)
+        if self._lease is not None:
+            self._lease.execute(
+                "INSERT INTO domain_slots (domain, last_request) VALUES (?, ?) "
+                "ON CONFLICT(domain) DO UPDATE SET "
+                "last_request = max(last_request, excluded.last_request)",
+                (domain, when.timestamp())
+            )
+    
+    def _reserve_lease(self, domain: str, now: datetime, interval: float) -> datetime:
+        """Reserve a slot through the shared lease table (lock held)."""
+        self._lease.execute("BEGIN IMMEDIATE")
+        try:
+            row = self._lease.execute(
+                "SELECT last_request FROM domain_slots WHERE domain = ?", (domain,)
+            ).fetchone()
+            latest = [datetime.fromtimestamp(row[0])] if row else []
+            if domain in self.last_request:
+                latest.append(self.last_request[domain])
+            start = max(now, max(latest) + timedelta(seconds=interval)) if latest else now
+            self._lease.execute(
+                "INSERT OR REPLACE INTO domain_slots (domain, last_request) VALUES (?, ?)",
+                (domain, start.timestamp())
+            )
+            self._lease.execute("COMMIT")
+        except Exception:
+            self._lease.execute("ROLLBACK")
+            raise
+        return start
+    
+    def close(self) -> None:
+        """Close the lease database, if any."""
+        with self._lock:
+            if self._lease is not None:
+                self._lease.close()
+                self._lease = None
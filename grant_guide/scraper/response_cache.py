@@ -0,0 +1,246 @@
+"""
+On-disk HTTP response cache with TTLs, LRU eviction and record/replay modes.
+
+Bodies are stored content-addressed (by compute_content_hash) and gzip
+compressed, so identical pages served under several URLs are stored once.
+A small SQLite index maps URLs to content hashes and tracks fetch and
+access times for TTL checks and LRU eviction.
+"""
+import gzip
+import logging
+import os
+import sqlite3
+import threading
+import time
+from enum import Enum
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urlparse
+
+from .http_client import compute_content_hash
+from .models import SourceConfig
+
+logger = logging.getLogger('scraper.cache')
+
+# Default location, next to sources.yaml
+DEFAULT_CACHE_DIR = Path(__file__).parent / "http_cache"
+
+
+class CacheMode(Enum):
+    """How the cache is used by HttpClient."""
+    NORMAL = "normal"   # Serve fresh entries, fetch and store otherwise
+    RECORD = "record"   # Always fetch, store every response
+    REPLAY = "replay"   # Serve only from cache, never touch the network
+
+
+class ResponseCache:
+    """Content-addressed, compressed, size-bounded cache of response bodies."""
+    
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        mode: CacheMode = CacheMode.NORMAL,
+        default_ttl: float = 24 * 3600,
+        max_bytes: int = 256 * 1024 * 1024
+    ):
+        """
+        Open (or create) the cache.
+        
+        Args:
+            cache_dir: Directory for the index and blobs. If None, uses the default location.
+            mode: Cache mode (normal, record or replay).
+            default_ttl: Seconds an entry stays fresh unless its source overrides it.
+            max_bytes: Maximum compressed size on disk before LRU eviction.
+        """
+        self.cache_dir = Path(cache_dir or DEFAULT_CACHE_DIR)
+        self.mode = CacheMode(mode)
+        self.default_ttl = default_ttl
+        self.max_bytes = max_bytes
+        self._domain_ttls: dict[str, float] = {}
+        self._lock = threading.Lock()
+        
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            str(self.cache_dir / "index.sqlite3"), check_same_thread=False
+        )
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " url TEXT PRIMARY KEY,"
+                " content_hash TEXT NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " fetched_at REAL NOT NULL,"
+                " accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed_at)"
+            )
+    
+    @property
+    def replay(self) -> bool:
+        """Whether the cache is in replay (offline) mode."""
+        return self.mode is CacheMode.REPLAY
+    
+    def set_source_ttls(self, sources: list[SourceConfig]) -> None:
+        """
+        Apply per-source TTLs, keyed by the domain of each source's URLs.
+        
+        Args:
+            sources: Source configurations; those with cache_ttl_seconds set override the default.
+        """
+        self._domain_ttls = {}
+        for source in sources:
+            if source.cache_ttl_seconds is None:
+                continue
+            for url in [source.base_url, *source.scrape_urls]:
+                self._domain_ttls[urlparse(url).netloc] = source.cache_ttl_seconds
+    
+    def ttl_for(self, url: str) -> float:
+        """Get the TTL in seconds for a URL."""
+        return self._domain_ttls.get(urlparse(url).netloc, self.default_ttl)
+    
+    def lookup(self, url: str) -> Optional[str]:
+        """
+        Get the body HttpClient should serve for a URL without fetching.
+        
+        Returns:
+            Cached content, or None if the URL must be fetched (always None in
+            record mode; stale entries are still served in replay mode).
+        """
+        if self.mode is CacheMode.RECORD:
+            return None
+        return self.get(url, allow_stale=self.replay)
+    
+    def get(self, url: str, allow_stale: bool = False) -> Optional[str]:
+        """
+        Get cached content for a URL.
+        
+        Args:
+            url: URL to look up.
+            allow_stale: Return the entry even if its TTL has expired.
+        
+        Returns:
+            Cached content, or None on a miss.
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content_hash, fetched_at FROM entries WHERE url = ?", (url,)
+            ).fetchone()
+            if row is None:
+                return None
+            content_hash, fetched_at = row
+            if not allow_stale and now - fetched_at > self.ttl_for(url):
+                return None
+            
+            try:
+                with gzip.open(self._blob_path(content_hash), 'rt', encoding='utf-8', newline='') as f:
+                    content = f.read()
+            except (OSError, EOFError) as e:
+                logger.warning(f"Dropping unreadable cache entry for {url}: {e}")
+                with self._conn:
+                    self._conn.execute("DELETE FROM entries WHERE url = ?", (url,))
+                return None
+            
+            with self._conn:
+                self._conn.execute(
+                    "UPDATE entries SET accessed_at = ? WHERE url = ?", (now, url)
+                )
+        
+        logger.debug(f"Cache hit: {url}")
+        return content
+    
+    def put(self, url: str, content: str) -> str:
+        """
+        Store content for a URL, then evict least recently used entries if needed.
+        
+        Returns:
+            The content hash the body is stored under.
+        """
+        content_hash = compute_content_hash(content)
+        path = self._blob_path(content_hash)
+        now = time.time()
+        
+        with self._lock:
+            if not path.exists():
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+                with gzip.open(tmp_path, 'wt', encoding='utf-8', newline='') as f:
+                    f.write(content)
+                os.replace(tmp_path, path)
+            
+            with self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO entries "
+                    "(url, content_hash, size, fetched_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                    (url, content_hash, path.stat().st_size, now, now)
+                )
+            self._evict()
+        
+        return content_hash
+    
+    def touch(self, url: str) -> None:
+        """Mark an entry as freshly fetched (e.g. after a 304 revalidation)."""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE entries SET fetched_at = ?, accessed_at = ? WHERE url = ?",
+                (now, now, url)
+            )
+    
+    def size(self) -> int:
+        """Total compressed size of cached blobs in bytes."""
+        with self._lock:
+            return self._total_size()
+    
+    def clear(self) -> None:
+        """Remove every entry and blob."""
+        with self._lock:
+            hashes = [row[0] for row in self._conn.execute(
+                "SELECT DISTINCT content_hash FROM entries"
+            )]
+            with self._conn:
+                self._conn.execute("DELETE FROM entries")
+            for content_hash in hashes:
+                self._blob_path(content_hash).unlink(missing_ok=True)
+    
+    def close(self) -> None:
+        """Close the index database."""
+        with self._lock:
+            self._conn.close()
+    
+    def _total_size(self) -> int:
+        """Sum of distinct blob sizes (blobs shared by URLs count once)."""
+        row = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM "
+            "(SELECT content_hash, MAX(size) AS size FROM entries GROUP BY content_hash)"
+        ).fetchone()
+        return row[0]
+    
+    def _evict(self) -> None:
+        """Drop least recently accessed entries until under max_bytes."""
+        total = self._total_size()
+        if total <= self.max_bytes:
+            return
+        
+        rows = self._conn.execute(
+            "SELECT url, content_hash FROM entries ORDER BY accessed_at"
+        ).fetchall()
+        for url, content_hash in rows:
+            if total <= self.max_bytes:
+                break
+            with self._conn:
+                self._conn.execute("DELETE FROM entries WHERE url = ?", (url,))
+            still_used = self._conn.execute(
+                "SELECT 1 FROM entries WHERE content_hash = ? LIMIT 1", (content_hash,)
+            ).fetchone()
+            if not still_used:
+                path = self._blob_path(content_hash)
+                if path.exists():
+                    total -= path.stat().st_size
+                    path.unlink()
+                logger.debug(f"Evicted cache entry: {url}")
+    
+    def _blob_path(self, content_hash: str) -> Path:
+        """Get the on-disk path of a content-addressed blob."""
+        return self.cache_dir / "blobs" / content_hash[:2] / f"{content_hash}.gz"
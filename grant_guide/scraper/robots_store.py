@@ -0,0 +1,140 @@
+"""
+Persistent cache of robots.txt responses per domain.
+
+Without it every process start (and every new HttpClient) re-fetches
+robots.txt for each domain. Entries expire after a TTL so rule changes are
+picked up; failed fetches are cached for a much shorter negative TTL so a
+site that was briefly down is retried soon, rather than cached forever.
+"""
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+from urllib.robotparser import RobotFileParser
+
+# Default location, next to sources.yaml
+DEFAULT_ROBOTS_DB = Path(__file__).parent / "robots_cache.sqlite3"
+
+# Status recorded when robots.txt could not be fetched at all
+FETCH_FAILED = 0
+
+
+@dataclass
+class RobotsEntry:
+    """A robots.txt response as fetched for a domain."""
+    status: int
+    body: str = ""
+    fetched_at: float = 0.0
+    
+    @classmethod
+    def from_response(cls, status: int, body: str) -> 'RobotsEntry':
+        """Entry for a robots.txt response; error pages keep no body."""
+        return cls(status=status, body=body if status < 400 else "", fetched_at=time.time())
+    
+    @classmethod
+    def fetch_failed(cls) -> 'RobotsEntry':
+        """Entry for a robots.txt request that got no response."""
+        return cls(status=FETCH_FAILED, fetched_at=time.time())
+    
+    @property
+    def failed(self) -> bool:
+        """Whether the fetch failed (network error or server error)."""
+        return self.status == FETCH_FAILED or self.status >= 500
+    
+    def to_parser(self, robots_url: str = "") -> Optional[RobotFileParser]:
+        """
+        Build a parser with the same status handling as RobotFileParser.read().
+        
+        A server error disallows everything (read() leaves such a parser
+        unread, so can_fetch() is False) until the entry expires.
+        
+        Returns:
+            Parser, or None if robots.txt could not be fetched at all
+            (callers treat that as allowed).
+        """
+        if self.status == FETCH_FAILED:
+            return None
+        parser = RobotFileParser()
+        parser.set_url(robots_url)
+        if self.status in (401, 403) or self.status >= 500:
+            parser.disallow_all = True
+        elif 400 <= self.status < 500:
+            parser.allow_all = True
+        else:
+            parser.parse(self.body.splitlines())
+        return parser
+
+
+class RobotsStore:
+    """SQLite-backed robots.txt cache, shared safely between threads."""
+    
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        ttl: float = 24 * 3600,
+        negative_ttl: float = 3600
+    ):
+        """
+        Open (or create) the robots store.
+        
+        Args:
+            path: Path to the SQLite file. If None, uses the default location.
+                Use ":memory:" for a throwaway store.
+            ttl: Seconds a fetched robots.txt stays fresh.
+            negative_ttl: Seconds a failed fetch is remembered before retrying.
+        """
+        self.path = str(path or DEFAULT_ROBOTS_DB)
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS robots ("
+                " domain TEXT PRIMARY KEY,"
+                " status INTEGER NOT NULL,"
+                " body TEXT NOT NULL,"
+                " fetched_at REAL NOT NULL)"
+            )
+    
+    def expires_in(self, entry: RobotsEntry) -> float:
+        """Seconds until entry goes stale (negative once it has)."""
+        ttl = self.negative_ttl if entry.failed else self.ttl
+        return entry.fetched_at + ttl - time.time()
+    
+    def get(self, domain: str) -> Optional[RobotsEntry]:
+        """
+        Get the stored robots.txt response for a domain, if still fresh.
+        
+        Returns:
+            RobotsEntry, or None if nothing fresh is stored.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status, body, fetched_at FROM robots WHERE domain = ?", (domain,)
+            ).fetchone()
+        if row is None:
+            return None
+        entry = RobotsEntry(status=row[0], body=row[1], fetched_at=row[2])
+        return entry if self.expires_in(entry) > 0 else None
+    
+    def set(self, domain: str, entry: RobotsEntry) -> None:
+        """Store the robots.txt response for a domain."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO robots (domain, status, body, fetched_at) "
+                "VALUES (?, ?, ?, ?)",
+                (domain, entry.status, entry.body, entry.fetched_at)
+            )
+    
+    def delete(self, domain: str) -> None:
+        """Remove the stored response for a domain."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM robots WHERE domain = ?", (domain,))
+    
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
@@ -11,6 +11,8 @@ from datetime import datetime, timedelta
 from typing import Optional, Callable
 from functools import wraps
 
+from .cancellation import CancellationToken, OperationCancelled
+
 logger = logging.getLogger('scraper.scheduler')
 
 
@@ -54,7 +56,12 @@ class SourceStatus:
 
 
 class TimeoutHandler:
-    """Context manager for handling timeouts."""
+    """
+    Context manager for handling timeouts.
+    
+    Signal based, so it only works on the main thread; worker threads use
+    a CancellationToken instead.
+    """
     
     def __init__(self, seconds: int, error_message: str = "Operation timed out"):
         self.seconds = seconds
@@ -100,7 +107,7 @@ class ScraperScheduler:
     
     Features:
     - Weekly scheduling with configurable time
-    - Per-source timeout handling
+    - Per-source and total timeouts with cooperative cancellation
     - Parallel source processing (with rate limit awareness)
     - Automatic retry with exponential backoff
     - Health tracking per source
@@ -113,6 +120,7 @@ class ScraperScheduler:
         self._running = False
         self._shutdown_event = threading.Event()
         self._engine = None
+        self._run_token: Optional[CancellationToken] = None
     
     def _get_engine(self):
         """Lazy-load the scraper engine and pre-load all adapters."""
@@ -124,18 +132,25 @@ class ScraperScheduler:
             from .compliance import ComplianceChecker
             from .status import StatusManager
             from .importer import DjangoImporter
+            from .domains import default_classifier
             from .exporter import JsonExporter
+            from .validator_store import ValidatorStore
+            from .robots_store import RobotsStore
+            from .rate_limiter import DEFAULT_LEASE_DB, DomainRateLimiter
             
             self._engine = ScraperEngine(
                 http_client=HttpClient(
                     timeout=self.config.request_timeout,
-                    default_delay=2.0
+                    default_delay=2.0,
+                    validator_store=ValidatorStore(),
+                    robots_store=RobotsStore(),
+                    rate_limiter=DomainRateLimiter(2.0, lease_path=DEFAULT_LEASE_DB)
                 ),
                 normaliser=RecordNormaliser(),
                 deduplicator=create_django_deduplicator(),
                 compliance_checker=ComplianceChecker(),
                 status_manager=StatusManager(),
-                importer=DjangoImporter(),
+                importer=DjangoImporter(classifier=default_classifier()),
                 exporter=JsonExporter(),
             )
             self._engine.load_sources()
@@ -183,8 +198,13 @@ class ScraperScheduler:
         
         logger.info(f"Starting scheduled scrape for {len(sources)} sources")
         
+        # Hard bound for the whole run; stop() also cancels it
+        run_token = CancellationToken(timeout=self.config.total_timeout)
+        self._run_token = run_token
+        
         # Process sources with parallel execution (limited concurrency)
-        with ThreadPoolExecutor(max_workers=self.config.max_workers) as executor:
+        executor = ThreadPoolExecutor(max_workers=self.config.max_workers)
+        try:
             futures = {}
             for source in sources:
                 # Initialize status tracking
@@ -196,19 +216,17 @@ class ScraperScheduler:
                 # Submit source for processing
                 future = executor.submit(
                     self._scrape_source_with_timeout,
-                    source
+                    source,
+                    run_token
                 )
                 futures[future] = source
             
-            # Collect results with total timeout
-            remaining_timeout = self.config.total_timeout
+            # Workers stop themselves when their tokens expire; a worker stuck
+            # past the run deadline plus one request timeout is not waited for
             for future in futures:
                 source = futures[future]
                 try:
-                    source_result = future.result(timeout=min(
-                        self.config.source_timeout,
-                        remaining_timeout
-                    ))
+                    source_result = future.result(timeout=self._wait_timeout(run_token))
                     results['sources'].append(source_result)
                     results['total_created'] += source_result.get('created', 0)
                     results['total_updated'] += source_result.get('updated', 0)
@@ -220,7 +238,7 @@ class ScraperScheduler:
                     status.is_healthy = True
                     status.total_records += source_result.get('found', 0)
                     
-                except (TimeoutError, FuturesTimeoutError) as e:
+                except (TimeoutError, OperationCancelled) as e:
                     logger.error(f"Source {source.source_id} timed out: {e}")
                     self._handle_source_failure(source.source_id, str(e))
                     results['sources'].append({
@@ -239,14 +257,11 @@ class ScraperScheduler:
                         'success': False
                     })
                     results['total_errors'] += 1
-                
-                # Update remaining timeout
-                elapsed = (datetime.now() - start_time).total_seconds()
-                remaining_timeout = max(0, self.config.total_timeout - elapsed)
-                
-                if remaining_timeout <= 0:
-                    logger.warning("Total timeout reached, stopping remaining sources")
-                    break
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        if run_token.cancelled:
+            logger.warning(f"Scheduled scrape stopped early: {run_token.reason}")
         
         results['completed_at'] = datetime.now().isoformat()
         results['duration_seconds'] = (datetime.now() - start_time).total_seconds()
@@ -260,9 +275,25 @@ class ScraperScheduler:
         
         return results
     
-    def _scrape_source_with_timeout(self, source) -> dict:
-        """Scrape a single source with timeout handling."""
+    def _wait_timeout(self, run_token: CancellationToken) -> Optional[float]:
+        """Seconds to wait for a source: the run's remaining time plus one request timeout."""
+        remaining = run_token.remaining()
+        return None if remaining is None else remaining + self.config.request_timeout
+    
+    def _scrape_source_with_timeout(self, source, run_token: Optional[CancellationToken] = None) -> dict:
+        """
+        Scrape a single source, cancelling it after source_timeout.
+        
+        The timeout starts when a worker picks the source up, and the
+        source's token is also cancelled with run_token.
+        
+        Raises:
+            OperationCancelled: If the source was cancelled before it started,
+                or cut short before it finished. A run that completed is
+                reported even if its deadline passed just after.
+        """
         engine = self._get_engine()
+        token = CancellationToken(timeout=self.config.source_timeout, parent=run_token)
         result = {
             'source_id': source.source_id,
             'source_name': source.source_name,
@@ -274,11 +305,19 @@ class ScraperScheduler:
         }
         
         try:
+            # The source may have waited for a worker past the run deadline
+            token.raise_if_cancelled()
+            
             # Run the scraper for this source
-            scrape_result = engine.run(source_id=source.source_id, dry_run=False)
+            scrape_result = engine.run(
+                source_id=source.source_id, dry_run=False, cancel_token=token
+            )
             
             if scrape_result.source_results:
                 sr = scrape_result.source_results[0]
+                if not sr.success:
+                    # A source stopped by its deadline is a timeout, not a failure
+                    token.raise_if_cancelled()
                 result['found'] = sr.records_found
                 result['created'] = sr.records_created
                 result['updated'] = sr.records_updated
@@ -365,6 +404,8 @@ class ScraperScheduler:
         logger.info("Stopping scraper scheduler...")
         self._running = False
         self._shutdown_event.set()
+        if self._run_token is not None:
+            self._run_token.cancel("Scheduler stopped")
     
     def get_health_status(self) -> dict:
         """Get health status of all sources."""
@@ -0,0 +1,238 @@
+"""
+Property-based tests for the async HTTP Client.
+
+**Validates: Requirements 1.1, 1.3, 11.1**
+"""
+import asyncio
+import time
+
+import httpx
+import pytest
+from hypothesis import given, strategies as st, settings
+
+from scraper.async_http_client import AsyncHttpClient, async_retry_with_backoff
+from scraper.circuit_breaker import CircuitBreaker
+from scraper.http_client import CircuitOpenError, HttpClient, RobotsDisallowedError
+from scraper.robots_store import RobotsEntry
+
+
+def make_client(handler, **kwargs) -> AsyncHttpClient:
+    """Create an async client backed by a mock transport."""
+    return AsyncHttpClient(transport=httpx.MockTransport(handler), **kwargs)
+
+
+_real_sleep = asyncio.sleep
+
+
+async def _no_sleep(delay, *args, **kwargs):
+    """asyncio.sleep replacement skipping retry backoff."""
+    await _real_sleep(0)
+
+
+def pages_handler(robots: str = ""):
+    """Mock handler serving robots.txt and echoing the request path."""
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/robots.txt":
+            return httpx.Response(200, text=robots)
+        return httpx.Response(200, text=f"page {request.url.host}{request.url.path}")
+    return handler
+
+
+class TestAsyncRobotsTxtCompliance:
+    """
+    Feature: grant-guide-scraper-engine, Property 1: Robots.txt Compliance
+    
+    *For any* URL and its associated robots.txt file, the async client SHALL
+    refuse to access any disallowed paths.
+    """
+    
+    def test_disallowed_url_raises_error(self):
+        """Disallowed URLs raise RobotsDisallowedError."""
+        async def run():
+            async with make_client(pages_handler("User-agent: *\nDisallow: /private")) as client:
+                with pytest.raises(RobotsDisallowedError):
+                    await client.get("https://example.gov.za/private/page")
+                return await client.get("https://example.gov.za/public")
+        
+        assert asyncio.run(run()) == "page example.gov.za/public"
+    
+    @given(status=st.sampled_from([401, 403]))
+    @settings(max_examples=10)
+    def test_forbidden_robots_disallows_all(self, status):
+        """401/403 on robots.txt disallows everything, like RobotFileParser.read()."""
+        def handler(request):
+            if request.url.path == "/robots.txt":
+                return httpx.Response(status)
+            return httpx.Response(200, text="ok")
+        
+        async def run():
+            async with make_client(handler) as client:
+                return await client.is_allowed("https://example.gov.za/page")
+        
+        assert asyncio.run(run()) is False
+    
+    def test_server_error_robots_disallows_all(self):
+        """5xx on robots.txt disallows everything, as for the sync client."""
+        def handler(request):
+            if request.url.path == "/robots.txt":
+                return httpx.Response(503)
+            return httpx.Response(200, text="ok")
+        
+        async def run():
+            async with make_client(handler) as client:
+                return await client.is_allowed("https://example.gov.za/page")
+        
+        assert asyncio.run(run()) is False
+    
+    def test_robots_cache_shared_with_sync_client(self):
+        """robots.txt already loaded by the wrapped HttpClient is not fetched again."""
+        requested = []
+        
+        def handler(request):
+            requested.append(request.url.path)
+            return httpx.Response(200, text="ok")
+        
+        sync = HttpClient()
+        sync._cache_robots("example.gov.za", RobotsEntry.from_response(200, "User-agent: *\nDisallow: /private"))
+        
+        async def run():
+            async with make_client(handler, client=sync) as client:
+                return await client.is_allowed("https://example.gov.za/private/page")
+        
+        assert asyncio.run(run()) is False
+        assert requested == []
+    
+    def test_missing_robots_allows_access(self):
+        """404 on robots.txt allows everything."""
+        def handler(request):
+            if request.url.path == "/robots.txt":
+                return httpx.Response(404)
+            return httpx.Response(200, text="ok")
+        
+        async def run():
+            async with make_client(handler) as client:
+                return await client.is_allowed("https://example.gov.za/page")
+        
+        assert asyncio.run(run()) is True
+
+
+class TestAsyncRateLimiting:
+    """
+    Feature: grant-guide-scraper-engine, Property 3: Rate Limiting Enforcement
+    
+    Requests to the same domain SHALL be spaced by the crawl delay, while
+    requests to different domains SHALL run concurrently.
+    """
+    
+    def test_same_domain_requests_are_spaced(self):
+        """Consecutive requests to one domain wait for the crawl delay."""
+        async def run():
+            async with make_client(pages_handler(), default_delay=0.2) as client:
+                start = time.monotonic()
+                await client.get_many([
+                    "https://a.gov.za/1", "https://a.gov.za/2", "https://a.gov.za/3"
+                ])
+                return time.monotonic() - start
+        
+        assert asyncio.run(run()) >= 0.4
+    
+    def test_different_domains_run_concurrently(self):
+        """Requests to different domains are not spaced against each other."""
+        async def run():
+            async with make_client(pages_handler(), default_delay=0.3) as client:
+                start = time.monotonic()
+                results = await client.get_many([
+                    f"https://d{i}.gov.za/{n}" for i in range(4) for n in range(2)
+                ])
+                return results, time.monotonic() - start
+        
+        results, elapsed = asyncio.run(run())
+        
+        assert len(results) == 8
+        assert all(isinstance(r, str) for r in results.values())
+        # Bounded by one domain (one delay), not the sum over domains (four)
+        assert elapsed < 0.9
+    
+    def test_crawl_delay_from_robots(self):
+        """Crawl-delay in robots.txt raises the delay above the default."""
+        async def run():
+            async with make_client(pages_handler("User-agent: *\nCrawl-delay: 5"),
+                                   default_delay=2.0) as client:
+                return await client.get_crawl_delay("https://example.gov.za/page")
+        
+        assert asyncio.run(run()) == 5.0
+
+
+class TestAsyncRetryWithBackoff:
+    """
+    Feature: grant-guide-scraper-engine, Property 27: Network Retry with Backoff
+    
+    *For any* network error, the async client SHALL retry up to 3 times
+    with exponential backoff.
+    """
+    
+    @given(max_retries=st.integers(min_value=1, max_value=4))
+    @settings(max_examples=10)
+    def test_retry_count_configurable(self, max_retries):
+        """Retry count is configurable."""
+        call_count = 0
+        
+        @async_retry_with_backoff(max_retries=max_retries, base_delay=0.001)
+        async def failing():
+            nonlocal call_count
+            call_count += 1
+            raise httpx.ConnectError("Connection refused")
+        
+        with pytest.raises(httpx.ConnectError):
+            asyncio.run(failing())
+        
+        assert call_count == max_retries + 1
+    
+    @pytest.mark.parametrize('status,attempts', [(404, 1), (403, 1), (503, 4)])
+    def test_only_retryable_statuses_retried(self, status, attempts):
+        """Client errors fail at once; server errors are retried, as for the sync client."""
+        calls = []
+        
+        def handler(request):
+            if request.url.path == "/robots.txt":
+                return httpx.Response(404)
+            calls.append(request.url.path)
+            return httpx.Response(status)
+        
+        async def run():
+            async with make_client(handler, default_delay=0) as client:
+                return await client.get_many(["https://example.gov.za/page"])
+        
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setattr(asyncio, 'sleep', _no_sleep)
+            results = asyncio.run(run())
+        
+        assert isinstance(results["https://example.gov.za/page"], httpx.HTTPStatusError)
+        assert len(calls) == attempts
+    
+    def test_circuit_breaker_shared_with_sync_client(self):
+        """A domain whose circuit the sync client opened fails fast here too."""
+        sync = HttpClient(circuit_breaker=CircuitBreaker(failure_threshold=1))
+        sync.circuit_breaker.record_failure("example.gov.za")
+        
+        async def run():
+            async with make_client(pages_handler(), client=sync) as client:
+                return await client.get_many(["https://example.gov.za/page", "https://other.gov.za/page"])
+        
+        results = asyncio.run(run())
+        
+        assert isinstance(results["https://example.gov.za/page"], CircuitOpenError)
+        assert results["https://other.gov.za/page"] == "page other.gov.za/page"
+    
+    def test_failed_results_returned_per_url(self):
+        """get_many reports failures per URL without failing the batch."""
+        async def run():
+            async with make_client(pages_handler("User-agent: *\nDisallow: /blocked")) as client:
+                return await client.get_many([
+                    "https://example.gov.za/ok", "https://example.gov.za/blocked"
+                ])
+        
+        results = asyncio.run(run())
+        
+        assert results["https://example.gov.za/ok"] == "page example.gov.za/ok"
+        assert isinstance(results["https://example.gov.za/blocked"], RobotsDisallowedError)
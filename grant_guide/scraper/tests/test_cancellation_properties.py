@@ -0,0 +1,223 @@
+"""
+Property-based tests for cooperative cancellation.
+
+**Validates: Requirements 1.5, 11.1**
+"""
+import time
+from datetime import datetime
+
+import pytest
+from hypothesis import given, strategies as st, settings
+
+from scraper.cancellation import (
+    CancellationToken, OperationCancelled, cancellation_scope, check_cancelled, sleep
+)
+from scraper.http_client import HttpClient
+from scraper.scheduler import ScraperScheduler, ScheduleConfig
+from scraper.engine import SourceResult, ScrapeResult
+from scraper.tests.test_pipeline_properties import make_engine, make_source
+
+
+class TestCancellationToken:
+    """
+    Feature: grant-guide-scraper-engine, Property 28: Cooperative Cancellation
+    
+    *For any* token, cancellation (explicit, by deadline or through a parent)
+    SHALL be observed by every check and SHALL wake pending sleeps.
+    """
+    
+    def test_explicit_cancel_keeps_first_reason(self):
+        """Cancelling twice keeps the first reason."""
+        token = CancellationToken()
+        token.cancel("first")
+        token.cancel("second")
+        
+        assert token.cancelled
+        with pytest.raises(OperationCancelled, match="first"):
+            token.raise_if_cancelled()
+    
+    @given(timeout=st.floats(min_value=0.01, max_value=0.05))
+    @settings(max_examples=5, deadline=None)
+    def test_deadline_cancels(self, timeout):
+        """A token counts as cancelled once its deadline passes."""
+        token = CancellationToken(timeout=timeout)
+        assert not token.cancelled
+        
+        time.sleep(timeout)
+        
+        assert token.cancelled
+        assert token.reason == "Timed out"
+    
+    def test_parent_cancels_children(self):
+        """Cancelling a parent cancels existing and new children."""
+        parent = CancellationToken()
+        child = CancellationToken(parent=parent)
+        
+        parent.cancel("stopping")
+        
+        assert child.cancelled and child.reason == "stopping"
+        assert CancellationToken(parent=parent).cancelled
+    
+    def test_child_deadline_bounded_by_parent(self):
+        """A child's remaining time never exceeds its parent's."""
+        child = CancellationToken(timeout=100, parent=CancellationToken(timeout=1))
+        
+        assert child.remaining() <= 1
+    
+    def test_sleep_wakes_on_cancel(self):
+        """Sleeps in a cancelled scope return early with OperationCancelled."""
+        token = CancellationToken(timeout=0.05)
+        
+        start = time.monotonic()
+        with cancellation_scope(token), pytest.raises(OperationCancelled):
+            sleep(5)
+        
+        assert time.monotonic() - start < 1
+    
+    def test_no_scope_never_cancels(self):
+        """Without a token, checks pass and sleeps complete."""
+        check_cancelled()
+        sleep(0)
+
+
+class TestCancelledRequests:
+    """HttpClient stops between requests once cancelled."""
+    
+    def test_get_raises_when_cancelled(self):
+        """No request is made after cancellation."""
+        client = HttpClient()
+        token = CancellationToken()
+        token.cancel()
+        
+        with cancellation_scope(token), pytest.raises(OperationCancelled):
+            client.get("https://example.gov.za/page", check_robots=False)
+    
+    def test_rate_limit_wait_is_interrupted(self):
+        """A long crawl delay does not outlive the token."""
+        client = HttpClient(default_delay=30)
+        client._robots_cache["example.gov.za"] = None
+        client._last_request["example.gov.za"] = datetime.now()
+        
+        start = time.monotonic()
+        with cancellation_scope(CancellationToken(timeout=0.05)), pytest.raises(OperationCancelled):
+            client.get("https://example.gov.za/page")
+        
+        assert time.monotonic() - start < 1
+
+
+class TestEngineCancellation:
+    """The engine stops between records and skips remaining sources."""
+    
+    def test_cancelled_run_stops_early(self):
+        """A run cancelled mid-way fails the current source and skips the rest."""
+        sources = [make_source(n) for n in 'abcd']
+        engine = make_engine(sources, delay=0.05)
+        
+        start = time.monotonic()
+        result = engine.run(cancel_token=CancellationToken(timeout=0.12))
+        
+        assert time.monotonic() - start < 0.5
+        assert result.sources_failed == 1
+        assert len(result.source_results) < 4
+    
+    def test_cancelled_pipeline_fails_sources(self):
+        """Sources cut short in pipeline mode are reported as failed."""
+        from scraper.pipeline import PipelineConfig
+        sources = [make_source(n) for n in 'abcd']
+        engine = make_engine(sources, delay=0.05, pipeline_config=PipelineConfig(fetch_workers=2))
+        
+        start = time.monotonic()
+        result = engine.run(cancel_token=CancellationToken(timeout=0.08))
+        
+        assert time.monotonic() - start < 0.5
+        assert result.sources_failed == 4
+
+
+class SlowEngine:
+    """Engine stand-in whose sources run until cancelled."""
+    
+    def __init__(self, sources, durations):
+        self._sources = {s.source_id: s for s in sources}
+        self.durations = durations
+    
+    def run(self, source_id=None, dry_run=False, cancel_token=None):
+        source = self._sources[source_id]
+        result = SourceResult(source_id=source_id, source_name=source.source_name, records_found=1)
+        deadline = time.monotonic() + self.durations[source_id]
+        while time.monotonic() < deadline:
+            if cancel_token.cancelled:
+                result.success = False
+                break
+            time.sleep(0.01)
+        return ScrapeResult(started_at=None, source_results=[result])
+
+
+class StubbornEngine(SlowEngine):
+    """Engine stand-in whose sources ignore cancellation and always finish."""
+    
+    def run(self, source_id=None, dry_run=False, cancel_token=None):
+        source = self._sources[source_id]
+        time.sleep(self.durations[source_id])
+        result = SourceResult(source_id=source_id, source_name=source.source_name, records_found=1)
+        return ScrapeResult(started_at=None, source_results=[result])
+
+
+class TestSchedulerTimeouts:
+    """
+    Feature: grant-guide-scraper-engine, Property 29: Scheduler Timeout Bound
+    
+    A timed-out source SHALL stop and free its worker, and total_timeout
+    SHALL bound the whole run.
+    """
+    
+    def make_scheduler(self, durations, **config):
+        scheduler = ScraperScheduler(ScheduleConfig(**config))
+        scheduler._engine = SlowEngine([make_source(n) for n in durations], durations)
+        return scheduler
+    
+    def test_timed_out_source_frees_worker(self):
+        """With one worker, a hung source does not block the next one."""
+        scheduler = self.make_scheduler(
+            {'hung': 10, 'quick': 0}, max_workers=1, source_timeout=0.1, total_timeout=10
+        )
+        
+        start = time.monotonic()
+        results = scheduler.run_once()
+        
+        assert time.monotonic() - start < 1
+        by_id = {r['source_id']: r for r in results['sources']}
+        assert by_id['hung']['error'] == 'Timeout'
+        assert by_id['quick']['success']
+    
+    def test_total_timeout_is_hard_bound(self):
+        """No source outlives the total timeout."""
+        scheduler = self.make_scheduler(
+            {'a': 10, 'b': 10, 'c': 10}, max_workers=2, source_timeout=60, total_timeout=0.2
+        )
+        
+        start = time.monotonic()
+        results = scheduler.run_once()
+        
+        assert time.monotonic() - start < 1
+        assert results['total_errors'] == 3
+    
+    def test_completed_run_not_reported_as_timeout(self):
+        """A source that finished is reported even if its deadline passed meanwhile."""
+        scheduler = self.make_scheduler({'a': 0.2}, source_timeout=0.1, total_timeout=10)
+        scheduler._engine = StubbornEngine(list(scheduler._engine._sources.values()), {'a': 0.2})
+        
+        results = scheduler.run_once()
+        
+        assert results['sources'][0]['success']
+        assert results['total_errors'] == 0
+    
+    def test_stuck_worker_is_not_waited_for(self):
+        """A worker ignoring cancellation is abandoned one request timeout after the deadline."""
+        scheduler = self.make_scheduler({'a': 2}, total_timeout=0.1, request_timeout=0.1)
+        scheduler._engine = StubbornEngine(list(scheduler._engine._sources.values()), {'a': 2})
+        
+        start = time.monotonic()
+        results = scheduler.run_once()
+        
+        assert time.monotonic() - start < 1
+        assert results['sources'][0]['error'] == 'Timeout'
@@ -6,7 +6,7 @@ Property-based tests for the Compliance Checker.
 import pytest
 from hypothesis import given, strategies as st, settings, HealthCheck
 
-from scraper.compliance import ComplianceChecker
+from scraper.compliance import ComplianceChecker, access_control_reason, detect_access_control
 from scraper.models import (
     NormalisedOpportunity, RecordType, FundingType, FunderType,
     BusinessStage, OpportunityStatus
@@ -167,6 +167,85 @@ class TestAccessControlDetection:
         checker = ComplianceChecker()
         html = "<html><body><h1>Funding Opportunity</h1><p>Apply now!</p></body></html>"
         assert checker.detect_access_control(html) is False
+    
+    @given(pattern=st.sampled_from([
+        'Please LOG IN', '<FORM id="x" action="/SignIn">', 'Verify You Are Human', 'Members Only',
+    ]))
+    @settings(max_examples=50)
+    def test_detected_in_any_case_as_text_or_bytes(self, pattern):
+        """Mixed-case markup is detected without lowercasing, as str or bytes."""
+        html = f"<html><body><p>caf\u00e9</p>{pattern}</body></html>"
+        assert detect_access_control(html)
+        assert detect_access_control(html.encode('utf-8'))
+    
+    def test_gated_page_skipped_before_parsing(self):
+        """Adapters drop gated pages without parsing them and forget their validators."""
+        from unittest.mock import Mock, patch
+        from scraper.tests.test_pipeline_properties import PagesAdapter, make_source
+        
+        http = Mock()
+        http.get.return_value = "<form method='post' action='/login'></form>"
+        adapter = PagesAdapter(make_source('a'), http)
+        
+        with patch('scraper.adapters.base.as_document') as parse:
+            assert adapter.fetch("https://a.gov.za/page") is None
+        
+        parse.assert_not_called()
+        assert adapter.gated_urls == ["https://a.gov.za/page"]
+        http.validator_store.delete.assert_called_once_with("https://a.gov.za/page")
+    
+    def test_recaptcha_script_on_public_page_not_flagged(self):
+        """Script URLs, attributes and comments naming a CAPTCHA do not gate a public page."""
+        html = (
+            '<html><head><script src="https://www.google.com/recaptcha/api.js" async></script>'
+            '<script>grecaptcha.ready(function () {});</script></head>'
+            '<body><!-- captcha --><a href="/no-paywall">Apply now</a></body></html>'
+        )
+        assert access_control_reason(html) is None
+        assert access_control_reason(html.encode('utf-8')) is None
+    
+    @pytest.mark.parametrize('html, reason', [
+        ('<main><form method="post" action="/account/login"></form></main>', 'login form'),
+        ('<main><input name="pw" type="password"></main>', 'password field'),
+        ('<form action="/apply"><div class="g-recaptcha" data-sitekey="k"></div></form>', 'CAPTCHA widget'),
+        ('<div id="article-paywall"><p>Funding details</p></div>', 'paywall container'),
+        ('<p>Please log in to view this opportunity</p>', 'login prompt'),
+        ('<p>Subscribe to read the full call</p>', 'paywall notice'),
+    ])
+    def test_gated_page_reason_reported(self, html, reason):
+        """The matched login form, CAPTCHA or paywall is reported as the reason."""
+        assert access_control_reason(f"<html><body>{html}</body></html>") == reason
+    
+    def test_site_chrome_does_not_gate_page(self):
+        """A sign-in form in the header or footer leaves the main content public."""
+        html = (
+            '<html><body><header><form action="/signin"><input type="password"></form></header>'
+            '<main><h1>Funding Opportunity</h1></main>'
+            '<footer><div class="g-recaptcha"></div> Members only area</footer></body></html>'
+        )
+        assert access_control_reason(html) is None
+    
+    @pytest.mark.parametrize('staged', [False, True])
+    def test_gated_pages_counted_as_rejected(self, staged):
+        """Gated pages are counted as rejected records, not imported."""
+        from scraper.pipeline import PipelineConfig
+        from scraper.tests.test_pipeline_properties import (
+            FakeHttp, PAGES_PER_SOURCE, make_engine, make_source
+        )
+        
+        class GatedHttp(FakeHttp):
+            def get(self, url, check_robots=True, conditional=False):
+                if url.endswith('/page/1'):
+                    return '<form action="/login"><input type="password"></form>'
+                return super().get(url, check_robots, conditional)
+        
+        engine = make_engine([make_source('a')], pipeline_config=PipelineConfig() if staged else None)
+        engine.http_client = GatedHttp()
+        
+        result = engine.run()
+        
+        assert result.total_records_rejected == 1
+        assert result.total_records_created == PAGES_PER_SOURCE - 1
 
 
 class TestMissingDataHandling:
@@ -226,3 +305,146 @@ class TestURLValidity:
         record = create_valid_record(official_apply_url=url)
         issues = checker.check_url_validity(record)
         assert len(issues) > 0
+
+
+payment_texts = st.lists(
+    st.sampled_from([
+        "Open to all SMEs", "No application fee", "Pay To Apply online",
+        "Submit your plan", "A processing fee of R100 applies",
+    ]),
+    max_size=3
+)
+
+
+class TestBatchKeywordChecks:
+    """
+    Feature: grant-guide-scraper-engine, Property 4: Payment-to-Apply Rejection
+    
+    *For any* batch of records, check_many SHALL give the same results as
+    checking each record on its own.
+    """
+    
+    @given(
+        batch=st.lists(st.tuples(payment_texts, payment_texts), min_size=1, max_size=5),
+        social=st.lists(st.sampled_from(['example.gov.za', 'wa.me', 'www.facebook.com']), min_size=5, max_size=5)
+    )
+    @settings(max_examples=100)
+    def test_batch_matches_single(self, batch, social):
+        """Batch checks agree with per-record checks."""
+        checker = ComplianceChecker()
+        records = [
+            create_valid_record(
+                description_short=' '.join(eligibility), eligibility_bullets=eligibility,
+                application_steps=steps, official_apply_url=f"https://{host}/apply"
+            )
+            for (eligibility, steps), host in zip(batch, social)
+        ]
+        
+        assert checker.check_many(records) == [checker.check(record) for record in records]
+    
+    def test_scrape_records_checks_in_batches(self):
+        """scrape_records checks each normalised batch with one check_many call."""
+        from scraper.tests.test_pipeline_properties import make_engine, make_source
+        
+        class BatchOnlyChecker(ComplianceChecker):
+            def __init__(self):
+                self.batches = []
+            
+            def check(self, record):
+                raise AssertionError("records should be checked in batches")
+            
+            def check_many(self, records):
+                self.batches.append(len(records))
+                return super().check_many(records)
+        
+        engine = make_engine([make_source('a')])
+        engine.compliance_checker = BatchOnlyChecker()
+        
+        records = list(engine.scrape_records())
+        
+        assert engine.compliance_checker.batches == [len(records)]
+    
+    def test_one_issue_per_text(self):
+        """Each bullet with indicators is reported once, with its field."""
+        record = create_valid_record(
+            eligibility_bullets=["Application fee and admin fee apply", "Registered in SA"],
+            application_steps=["Pay before submitting"]
+        )
+        
+        assert ComplianceChecker().check_no_payment_required(record) == [
+            "Payment indicator found in eligibility: 'application fee'",
+            "Payment indicator found in application steps: 'pay before'",
+        ]
+    
+    def test_scan_reports_keys_and_offsets(self):
+        """Hits carry the key and position of the text they were found in."""
+        from scraper.keywords import keyword_matcher
+        
+        matcher = keyword_matcher(['fee', 'admin fee'])
+        hits = matcher.scan([('a', 'No FEE'), ('b', ''), ('c', 'admin fee, fee')])
+        
+        assert [(h.key, h.keyword, h.offset) for h in hits] == [
+            ('a', 'fee', 3), ('c', 'admin fee', 0), ('c', 'fee', 11),
+        ]
+        assert keyword_matcher(['Admin Fee', 'fee']) is matcher
+
+
+class TestDomainClassifier:
+    """
+    Feature: grant-guide-scraper-engine, Property 5: Social-Media-Only Rejection
+    
+    *For any* host, the social media check SHALL match registered domains
+    and their subdomains only, never unrelated hosts containing them.
+    """
+    
+    @given(
+        domain=st.sampled_from(['x.com', 'wa.me', 'facebook.com']),
+        sub=st.sampled_from(['', 'www.', 'm.', 'chat.'])
+    )
+    @settings(max_examples=50)
+    def test_subdomains_match(self, domain, sub):
+        """A social domain and its subdomains are flagged."""
+        record = create_valid_record(official_apply_url=f"https://{sub}{domain.upper()}:443/apply")
+        assert ComplianceChecker().check_no_social_media_only(record)
+    
+    @pytest.mark.parametrize("host", ['fax.company.co.za', 'box.com', 'notfacebook.com', 'wa.me.gov.za'])
+    def test_lookalike_hosts_not_flagged(self, host):
+        """Hosts that merely contain a social domain are not flagged."""
+        record = create_valid_record(official_apply_url=f"https://{host}/apply")
+        assert ComplianceChecker().check_no_social_media_only(record) == []
+    
+    def test_default_classifier_built_once(self):
+        """The sources.yaml classifier is shared across calls."""
+        from scraper.domains import default_classifier
+        from scraper.config import is_approved_source
+        
+        assert default_classifier() is default_classifier()
+        assert is_approved_source("https://www.thedtic.gov.za/")
+        assert not is_approved_source("https://www.thedtic.gov.za.evil.com/")
+    
+    def test_reloading_sources_refreshes_classifiers(self, tmp_path):
+        """ScraperEngine.load_sources rebuilds the classifiers from the file it loads."""
+        from scraper.domains import default_classifier
+        from scraper.engine import ScraperEngine
+        from scraper.importer import DjangoImporter
+        
+        config = tmp_path / "sources.yaml"
+        config.write_text(
+            "sources:\n"
+            "  - source_id: new\n"
+            "    source_name: New Fund\n"
+            "    base_url: https://newfund.gov.za\n"
+            "    scrape_urls: [https://newfund.gov.za/grants/]\n"
+            "    source_type: government\n"
+            "    adapter_class: scraper.adapters.dtic.DTICAdapter\n"
+        )
+        stale = default_classifier()
+        engine = ScraperEngine(importer=DjangoImporter(classifier=stale))
+        
+        engine.load_sources(str(config))
+        assert engine.importer.classifier.is_approved("https://newfund.gov.za/grants/x")
+        assert not engine.importer.classifier.is_approved("https://www.thedtic.gov.za/")
+        
+        engine.load_sources()
+        assert default_classifier() is not stale
+        assert engine.importer.classifier.is_approved("https://www.thedtic.gov.za/")
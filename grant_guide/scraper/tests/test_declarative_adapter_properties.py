@@ -0,0 +1,142 @@
+"""
+Property-based tests for the declarative, sources.yaml-driven adapter.
+
+**Validates: Requirements 1.1, 2.1**
+"""
+from html import escape
+
+import pytest
+import yaml
+from hypothesis import given, strategies as st, settings
+
+from scraper.adapters.declarative import DeclarativeAdapter, compile_plan, to_xpath
+from scraper.adapters.ecdc import ECDCAdapter
+from scraper.adapters.tia import TIAAdapter
+from scraper.config import ConfigurationError, get_source_by_id, load_sources
+from scraper.document import as_document
+
+
+class ListingHttp:
+    """HTTP client serving one listing page."""
+    
+    def __init__(self, html: str):
+        self.html = html
+    
+    def get(self, url: str, check_robots: bool = True, conditional: bool = False) -> str:
+        return self.html
+
+
+words = st.text(alphabet='abcdefgh ', min_size=1, max_size=40).map(str.strip).filter(bool)
+sections = st.lists(
+    st.tuples(
+        st.sampled_from(['Eligibility', 'Who can apply?', 'Background', 'Criteria']),
+        st.sampled_from(['ul', 'ol']),
+        st.lists(words, min_size=1, max_size=4),
+    ),
+    max_size=3
+)
+
+
+def programme_page(title: str, paragraphs: list[str], page_sections, apply_text: str) -> str:
+    body = ''.join(f"<p>{escape(p)}</p>" for p in paragraphs)
+    lists = ''.join(
+        f"<h3>{heading}</h3><{tag}>" + ''.join(f"<li>{escape(i)}</li>" for i in items) + f"</{tag}>"
+        for heading, tag, items in page_sections
+    )
+    return (
+        f"<html><head><title>{escape(title)} | Site</title></head><body>"
+        f"<h1 class='entry-title'>{escape(title)}</h1>"
+        f"<div class='entry-content'>{body}</div>{lists}"
+        f"<a href='/about'>About</a><a href='/calls/form'>{escape(apply_text)}</a>"
+        f"</body></html>"
+    )
+
+
+class TestDeclarativeAdapter:
+    """
+    Feature: grant-guide-scraper-engine, Property 31: Declarative Extraction
+    
+    *For any* page, a source described in sources.yaml SHALL extract the
+    same record as the hand-written adapter it replaces.
+    """
+    
+    @given(
+        title=words,
+        paragraphs=st.lists(words, max_size=6),
+        page_sections=sections,
+        apply_text=st.sampled_from(['Apply now', 'Submit proposal', 'Read more'])
+    )
+    @settings(max_examples=100)
+    def test_tia_spec_matches_adapter(self, title, paragraphs, page_sections, apply_text):
+        """The TIA extraction spec reproduces TIAAdapter."""
+        source = get_source_by_id('tia')
+        url = "https://www.tia.org.za/calls/x"
+        html = as_document(programme_page(title, paragraphs, page_sections, apply_text))
+        
+        expected = TIAAdapter(source, None).extract_opportunity(url, html)
+        actual = DeclarativeAdapter(source, None).extract_opportunity(url, html)
+        
+        assert actual == expected
+    
+    @given(title=words, paragraphs=st.lists(words, max_size=6))
+    @settings(max_examples=50)
+    def test_ecdc_spec_matches_adapter(self, title, paragraphs):
+        """The ECDC extraction spec reproduces ECDCAdapter."""
+        source = get_source_by_id('ecdc')
+        url = "https://www.ecdc.co.za/fundingprogrammes/x"
+        body = ''.join(f"<p>{escape(p)}</p>" for p in paragraphs)
+        html = as_document(f"<html><body><h1>{escape(title)}</h1><article>{body}</article></body></html>")
+        
+        expected = ECDCAdapter(source, None).extract_opportunity(url, html)
+        actual = DeclarativeAdapter(source, None).extract_opportunity(url, html)
+        
+        assert actual == expected
+    
+    def test_listing_links(self):
+        """Listing links are selected and filtered by the spec."""
+        listing = (
+            "<h2 class='title'><a href='/open-call-1'>One</a></h2>"
+            "<h2 class='title'><a href='/news'>News</a></h2>"
+            "<h2><a href='/proposal-2'>Untitled heading</a></h2>"
+            "<h2 class='title big'><a href='https://www.tia.org.za/call-3'>Three</a></h2>"
+        )
+        adapter = DeclarativeAdapter(get_source_by_id('tia'), ListingHttp(listing))
+        
+        assert list(adapter.get_opportunity_urls()) == [
+            "https://www.tia.org.za/open-call-1",
+            "https://www.tia.org.za/call-3",
+        ]
+    
+    def test_plans_are_shared(self):
+        """Identical specs compile to the same plan."""
+        spec = {'title': ['h1'], 'links': {'href_keywords': ['grant']}}
+        assert compile_plan(dict(spec)) is compile_plan(dict(spec))
+    
+    @pytest.mark.parametrize("selector,expected", [
+        ("h1", "//h1"),
+        ("div.entry-content p", "//div[contains(concat(' ', normalize-space(@class), ' '), ' entry-content ')]//p"),
+        ("ul > li", "//ul/li"),
+        ("//main//a", "//main//a"),
+    ])
+    def test_selector_shorthand(self, selector, expected):
+        """Shorthand selectors translate to XPath; XPath passes through."""
+        assert to_xpath(selector) == expected
+    
+    @pytest.mark.parametrize("extraction", [
+        {'titel': ['h1']},
+        {'title': ['h1[']},
+        {'eligibility': {'lists': ['ul']}},
+        {'defaults': {'colour': 'blue'}},
+    ])
+    def test_invalid_spec_rejected_at_load(self, tmp_path, extraction):
+        """Bad extraction specs fail when sources.yaml is loaded."""
+        path = tmp_path / "sources.yaml"
+        path.write_text(yaml.safe_dump({'sources': [{
+            'source_id': 'x', 'source_name': 'X', 'base_url': 'https://x.gov.za',
+            'scrape_urls': ['https://x.gov.za'], 'source_type': 'government',
+            'adapter_class': 'scraper.adapters.declarative.DeclarativeAdapter',
+            'extraction': extraction,
+        }]}))
+        
+        with pytest.raises(ConfigurationError):
+            load_sources(str(path))
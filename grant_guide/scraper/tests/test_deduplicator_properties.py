@@ -6,9 +6,9 @@ Property-based tests for the Deduplicator.
 import pytest
 from hypothesis import given, strategies as st, settings
 
-from scraper.deduplicator import Deduplicator
+from scraper.deduplicator import Deduplicator, DedupIndex
 from scraper.models import (
-    NormalisedOpportunity, RecordType, FundingType, FunderType,
+    NormalisedOpportunity, RawOpportunity, RecordType, FundingType, FunderType,
     BusinessStage, OpportunityStatus
 )
 from datetime import date
@@ -227,3 +227,266 @@ class TestEmptyDatabase:
         
         result = dedup.check_duplicate(record)
         assert not result.is_duplicate
+
+
+class TestDedupIndex:
+    """Test the per-run in-memory deduplication index."""
+    
+    def test_existing_records_loaded_once(self):
+        """Existing records are fetched once, not once per check."""
+        calls = 0
+        
+        def get_existing():
+            nonlocal calls
+            calls += 1
+            return [{'id': 1, 'apply_link': '', 'source_link': 'https://example.gov.za/funding',
+                     'funding_name': 'Test', 'funder': 'Test'}]
+        
+        dedup = Deduplicator(get_existing)
+        for _ in range(5):
+            assert dedup.check_duplicate(create_record()).is_duplicate
+        
+        assert calls == 1
+    
+    def test_load_index_refreshes(self):
+        """load_index re-reads existing records for a new run."""
+        existing = []
+        dedup = Deduplicator(lambda: list(existing))
+        dedup.load_index()
+        assert not dedup.check_duplicate(create_record()).is_duplicate
+        
+        existing.append({'id': 7, 'apply_link': '', 'source_link': 'https://example.gov.za/funding',
+                         'funding_name': '', 'funder': ''})
+        dedup.load_index()
+        assert dedup.check_duplicate(create_record()).existing_record_id == 7
+    
+    def test_added_rows_are_matched(self):
+        """Rows added during a run are visible to later checks."""
+        dedup = Deduplicator(lambda: [])
+        index = dedup.load_index()
+        index.add({'id': 3, 'apply_link': 'https://example.gov.za/apply',
+                   'source_link': 'https://example.gov.za/funding',
+                   'funding_name': 'Test Funding Opportunity', 'funder': 'Test Funder'})
+        
+        result = dedup.check_duplicate(create_record())
+        assert result.is_duplicate
+        assert result.existing_record_id == 3
+    
+    def test_updated_row_replaces_old_links(self):
+        """Re-adding an id drops the links it no longer has."""
+        index = DedupIndex([
+            {'id': 1, 'apply_link': 'https://a.gov.za/apply', 'source_link': 'https://a.gov.za/src',
+             'funding_name': 'A', 'funder': 'A'},
+        ])
+        index.add({'id': 1, 'apply_link': 'https://b.gov.za/apply', 'source_link': 'https://b.gov.za/src',
+                   'funding_name': 'B', 'funder': 'B'})
+        
+        assert 'https://a.gov.za/src' not in index.by_source_link
+        assert index.by_source_link['https://b.gov.za/src'] == 1
+        assert index.by_apply_link['https://b.gov.za/apply'] == 1
+        assert len(index) == 1
+    
+    def test_first_row_wins_on_shared_link(self):
+        """When rows share a link the first one indexed is returned."""
+        index = DedupIndex([
+            {'id': 1, 'apply_link': 'https://example.gov.za/apply', 'source_link': '',
+             'funding_name': '', 'funder': ''},
+            {'id': 2, 'apply_link': 'https://example.gov.za/apply', 'source_link': '',
+             'funding_name': '', 'funder': ''},
+        ])
+        dedup = Deduplicator(index=index)
+        
+        result = dedup.check_duplicate(create_record(source_url='https://new.gov.za/funding'))
+        assert result.existing_record_id == 1
+
+
+class TestBatchDeduplication:
+    """Test batch duplicate checking against the index."""
+    
+    EXISTING = [
+        {'id': 1, 'apply_link': 'https://a.gov.za/apply', 'source_link': 'https://a.gov.za/src',
+         'funding_name': 'Youth Development Grant Programme', 'funder': 'NYDA'},
+        {'id': 2, 'apply_link': 'https://b.gov.za/apply', 'source_link': 'https://b.gov.za/src',
+         'funding_name': 'Agriculture Support Fund', 'funder': 'DTIC'},
+    ]
+    
+    @given(title=st.sampled_from([
+        'Youth Development Grant Program', 'Youth Development Grant Programme',
+        'Agriculture Support Fund', 'Completely Unrelated Scheme',
+    ]), funder=st.sampled_from(['NYDA', 'DTIC', 'Other Org']))
+    @settings(max_examples=50)
+    def test_batch_agrees_with_single_checks(self, title, funder):
+        """Batch results match per-record results for blocked candidates."""
+        dedup = Deduplicator(lambda: self.EXISTING)
+        record = create_record(
+            title=title, funder_name=funder,
+            official_apply_url='https://new.gov.za/apply',
+            source_url='https://new.gov.za/funding'
+        )
+        
+        single = dedup.check_duplicate(record)
+        [batch] = dedup.check_duplicates_batch([record])
+        
+        assert batch.is_duplicate == single.is_duplicate
+        assert batch.existing_record_id == single.existing_record_id
+        assert batch.match_type == single.match_type
+    
+    def test_exact_matches_take_priority_in_batch(self):
+        """Batch mode keeps the source URL > apply URL > fuzzy order."""
+        dedup = Deduplicator(lambda: self.EXISTING)
+        records = [
+            create_record(source_url='https://b.gov.za/src'),
+            create_record(source_url='https://new.gov.za/x', official_apply_url='https://a.gov.za/apply'),
+            create_record(source_url='https://new.gov.za/y', official_apply_url='https://new.gov.za/apply',
+                          title='Agriculture Support Fund', funder_name='DTIC'),
+            create_record(source_url='https://new.gov.za/z', official_apply_url='https://new.gov.za/apply'),
+        ]
+        
+        results = dedup.check_duplicates_batch(records)
+        
+        assert [r.match_type for r in results] == ['source_url', 'apply_url', 'fuzzy_title', None]
+        assert [r.existing_record_id for r in results] == [2, 1, 2, None]
+    
+    def test_candidates_without_shared_block_are_skipped(self):
+        """Rows sharing no funder token or title prefix are not scored."""
+        index = DedupIndex([
+            {'id': 1, 'apply_link': '', 'source_link': '',
+             'funding_name': 'Programme Youth Development', 'funder': 'Agency'},
+        ])
+        dedup = Deduplicator(index=index)
+        record = create_record(
+            title='Youth Development Programme', funder_name='Agency Inc',
+            source_url='https://new.gov.za/funding'
+        )
+        
+        [result] = dedup.check_duplicates_batch([record])
+        assert result.is_duplicate
+        assert result.existing_record_id == 1
+        
+        record = create_record(
+            title='Youth Development Programme', funder_name='Other',
+            source_url='https://new.gov.za/funding'
+        )
+        [result] = dedup.check_duplicates_batch([record])
+        assert not result.is_duplicate
+    
+    def test_records_matched_within_batch(self):
+        """New records resolve to earlier new records of the same batch."""
+        dedup = Deduplicator(lambda: self.EXISTING)
+        records = [
+            create_record(source_url='https://new.gov.za/1', official_apply_url='https://new.gov.za/apply',
+                          title='Township Enterprise Fund', funder_name='SEDFA'),
+            create_record(source_url='https://other.gov.za/1', official_apply_url='https://new.gov.za/apply',
+                          title='Enterprise Fund for Townships', funder_name='SEDFA'),
+            create_record(source_url='https://new.gov.za/2', official_apply_url='https://new.gov.za/apply2',
+                          title='Township Enterprise Funds', funder_name='SEDFA'),
+            create_record(source_url='https://new.gov.za/3', official_apply_url='https://a.gov.za/apply'),
+        ]
+        
+        results = dedup.check_duplicates_batch(records)
+        
+        assert [r.match_type for r in results] == [None, 'apply_url', 'fuzzy_title', 'apply_url']
+        assert [r.batch_match for r in results] == [None, 0, 0, None]
+        assert [r.existing_record_id for r in results] == [None, None, None, 1]
+    
+    def test_exact_batch_match_beats_fuzzy_index_match(self):
+        """An earlier record with the same apply URL wins over a fuzzy row match."""
+        dedup = Deduplicator(lambda: self.EXISTING)
+        records = [
+            create_record(source_url='https://new.gov.za/1', official_apply_url='https://new.gov.za/apply'),
+            create_record(source_url='https://new.gov.za/2', official_apply_url='https://new.gov.za/apply',
+                          title='Agriculture Support Fund', funder_name='DTIC'),
+        ]
+        
+        results = dedup.check_duplicates_batch(records)
+        
+        assert results[1].batch_match == 0
+        assert results[1].existing_record_id is None
+    
+    def test_empty_batch(self):
+        """Empty input gives empty output."""
+        assert Deduplicator(lambda: []).check_duplicates_batch([]) == []
+    
+    @pytest.mark.parametrize('staged', [False, True])
+    def test_runs_deduplicate_in_batches(self, staged):
+        """Serial and staged runs match records through the batch check only."""
+        from scraper.pipeline import PipelineConfig
+        from scraper.tests.test_pipeline_properties import make_engine, make_source, stored_rows
+        
+        class RecordingDeduplicator(Deduplicator):
+            def __init__(self):
+                super().__init__(lambda: stored_rows([make_source('a')]))
+                self.batches = []
+            
+            def check_duplicate(self, record):
+                raise AssertionError("records should be matched in batches")
+            
+            def check_duplicates_batch(self, records):
+                self.batches.append(len(records))
+                return super().check_duplicates_batch(records)
+        
+        engine = make_engine([make_source('a')], pipeline_config=PipelineConfig() if staged else None)
+        engine.deduplicator = RecordingDeduplicator()
+        
+        result = engine.run()
+        
+        assert engine.deduplicator.batches == [3]
+        assert result.total_records_created == 3
+
+
+class TestUnchangedContent:
+    """Test skipping pages whose content hash matches the stored record."""
+    
+    HTML = '<html><body><h1>Youth Grant</h1></body></html>'
+    
+    def make_engine(self, **kwargs):
+        """Create an engine whose index holds one record with the HTML's hash."""
+        from scraper.engine import ScraperEngine
+        from scraper.http_client import compute_content_hash
+        
+        dedup = Deduplicator(lambda: [
+            {'id': 5, 'apply_link': '', 'source_link': 'https://a.gov.za/src',
+             'funding_name': 'Youth Grant', 'funder': 'NYDA',
+             'raw_content_hash': compute_content_hash(self.HTML)},
+        ])
+        dedup.load_index()
+        return ScraperEngine(deduplicator=dedup, **kwargs)
+    
+    @given(html=st.text(min_size=1))
+    @settings(max_examples=30)
+    def test_only_identical_content_is_unchanged(self, html):
+        """A record is unchanged only if the page hash matches for the same URL."""
+        engine = self.make_engine()
+        raw = RawOpportunity(source_url='https://a.gov.za/src', raw_html=html)
+        
+        expected = 5 if html == self.HTML else None
+        assert engine._unchanged_record_id(raw) == expected
+    
+    def test_unchanged_page_skips_pipeline(self):
+        """An unchanged page returns before normalisation."""
+        engine = self.make_engine()
+        engine.normaliser = None  # Would fail if used
+        raw = RawOpportunity(source_url='https://a.gov.za/src', raw_html=self.HTML)
+        
+        result = engine._check_record(raw, source=None)
+        
+        assert result.action == 'unchanged'
+        assert result.record_id == 5
+    
+    def test_other_url_and_empty_html_not_skipped(self):
+        """Different source URLs and pages without content are processed."""
+        engine = self.make_engine()
+        
+        assert engine._unchanged_record_id(
+            RawOpportunity(source_url='https://b.gov.za/src', raw_html=self.HTML)
+        ) is None
+        assert engine._unchanged_record_id(
+            RawOpportunity(source_url='https://a.gov.za/src', raw_html='')
+        ) is None
+    
+    def test_full_refresh_disables_skip(self):
+        """skip_unchanged=False processes every page."""
+        engine = self.make_engine(skip_unchanged=False)
+        raw = RawOpportunity(source_url='https://a.gov.za/src', raw_html=self.HTML)
+        
+        assert engine._unchanged_record_id(raw) is None
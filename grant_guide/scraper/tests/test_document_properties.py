@@ -0,0 +1,144 @@
+"""
+Property-based tests for shared parsed documents.
+
+**Validates: Requirements 1.6, 8.1**
+"""
+import pickle
+from html import escape
+
+from hypothesis import given, strategies as st, settings
+
+from scraper.adapters.dtic import DTICAdapter
+from scraper.compliance import ComplianceChecker
+from scraper.document import ParsedDocument, as_document
+from scraper.tests.test_pipeline_properties import PagesAdapter, make_source
+
+
+class CountingHttp:
+    """HTTP client counting requests."""
+    
+    def __init__(self, html: str = "<h1>Page</h1>"):
+        self.html = html
+        self.requests = []
+    
+    def get(self, url: str, check_robots: bool = True, conditional: bool = False) -> str:
+        self.requests.append(url)
+        return self.html
+
+
+class SoupAdapter(PagesAdapter):
+    """Adapter recording the soup it extracted from."""
+    
+    def extract_opportunity(self, url: str, html: str):
+        self.soup = self.parse_html(html)
+        return super().extract_opportunity(url, html)
+
+
+class TestParsedDocument:
+    """
+    Feature: grant-guide-scraper-engine, Property 30: Single Parse Per Page
+    
+    *For any* fetched page, the adapter's fetch and extraction SHALL share
+    one parse of the page.
+    """
+    
+    @given(body=st.text(max_size=200))
+    @settings(max_examples=50)
+    def test_document_is_the_html(self, body):
+        """A document equals, hashes and pickles like its markup."""
+        html = f"<html><body>{body}</body></html>"
+        document = ParsedDocument(html, "https://a.gov.za/x")
+        
+        assert document == html and document.html == html
+        restored = pickle.loads(pickle.dumps(document))
+        assert restored == html and restored.url == "https://a.gov.za/x"
+        assert 'soup' not in vars(restored)
+    
+    def test_trees_are_built_once(self):
+        """The soup and lxml tree are cached on the document."""
+        document = as_document("<p>Grant</p>")
+        
+        assert document.soup is document.soup
+        assert document.tree is document.tree
+        assert as_document(document) is document
+    
+    def test_adapter_reuses_fetched_parse(self):
+        """extract() parses the fetched page once and shares the tree."""
+        adapter = SoupAdapter(make_source('a'), CountingHttp())
+        url = "https://a.gov.za/page/0"
+        
+        document = adapter.fetch(url)
+        raw = adapter.extract(url, document)
+        
+        assert isinstance(document, ParsedDocument)
+        assert adapter.soup is document.soup
+        assert raw.raw_html == "<h1>Page</h1>"
+    
+    def test_access_control_uses_document(self):
+        """Access-control detection accepts a document."""
+        checker = ComplianceChecker()
+        
+        assert checker.detect_access_control(as_document("<p>Please LOG IN to continue</p>"))
+        assert not checker.detect_access_control(as_document("<p>Apply now</p>"))
+
+
+DTIC_PAGE = """
+<html><head><title>Fallback | the dtic</title><script>var x = 1;</script></head>
+<body>
+  <h1>Black Industrialists Scheme | the dtic</h1>
+  <div class="node field-body">
+    <p>Supports <b>black-owned</b> manufacturers.</p><p>Cost-sharing grant.</p>
+    <p>Third.</p><p>Fourth is dropped.</p>
+  </div>
+  <h3>Eligibility Criteria</h3>
+  <ul><li>South African company</li><li>51% black owned</li></ul>
+  <h3>Related links</h3>
+  <ul><li>Not eligibility</li></ul>
+  <strong>How to apply</strong>
+  <ol><li>Register on the portal</li><li>Submit documents</li></ol>
+  <a href="/about">About us</a>
+  <a href="/bis/application-form">Online Application</a>
+</body></html>
+"""
+
+
+class TestFastBackend:
+    """
+    Feature: grant-guide-scraper-engine, Property 30: Single Parse Per Page
+    
+    *For any* page, the compiled-selector helpers SHALL extract the same
+    text as the BeautifulSoup helpers.
+    """
+    
+    @given(parts=st.lists(
+        st.tuples(st.sampled_from(['p', 'b', 'span', 'script', 'li']),
+                  st.text(alphabet='abc &<>\n\t', max_size=10)),
+        max_size=8
+    ))
+    @settings(max_examples=100)
+    def test_node_text_matches_extract_text(self, parts):
+        """node_text equals extract_text on the same markup."""
+        adapter = PagesAdapter(make_source('a'), CountingHttp())
+        body = ''.join(f"<{tag}>{escape(text)}</{tag}>" for tag, text in parts)
+        document = as_document(f"<html><body><div id='x'>{body}</div></body></html>")
+        
+        expected = adapter.extract_text(document.soup.find('div', id='x'))
+        assert adapter.node_text(adapter.select_one(document.tree, "//div[@id='x']")) == expected
+    
+    def test_dtic_extraction(self):
+        """The DTIC adapter extracts a programme page with the fast backend."""
+        adapter = DTICAdapter(make_source('dtic'), CountingHttp())
+        
+        raw = adapter.extract_opportunity("https://dtic.gov.za/bis", as_document(DTIC_PAGE))
+        
+        assert raw.title == "Black Industrialists Scheme"
+        assert raw.description == "Supportsblack-ownedmanufacturers. Cost-sharing grant. Third."
+        assert raw.eligibility == ["South African company", "51% black owned"]
+        assert raw.application_steps == ["Register on the portal", "Submit documents"]
+        assert raw.apply_url == "https://dtic.gov.za/bis/application-form"
+    
+    def test_blank_page_has_a_tree(self):
+        """Blank pages and XML-declared pages still parse."""
+        assert len(as_document("").tree) == 0
+        declared = as_document('<?xml version="1.0" encoding="utf-8"?><html><h1>T</h1></html>')
+        assert declared.tree.xpath('string(//h1)') == "T"
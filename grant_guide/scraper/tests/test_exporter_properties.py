@@ -0,0 +1,76 @@
+"""
+Property-based tests for the JSON exporter.
+
+**Validates: Requirements 9.1, 9.4**
+"""
+import gzip
+import io
+import json
+
+from hypothesis import given, strategies as st, settings
+
+from scraper.exporter import ExportFormat, JsonExporter
+from scraper.tests.test_pipeline_properties import make_engine, make_source
+from scraper.tests.test_status_properties import create_record
+
+titles = st.text(min_size=1, max_size=40)
+
+
+class TestStreamingExport:
+    """
+    Feature: grant-guide-scraper-engine, Property 33: Streaming Export
+    
+    *For any* records, a streamed export SHALL contain the same records as
+    export(), each written as soon as it is received.
+    """
+    
+    @given(names=st.lists(titles, max_size=5))
+    @settings(max_examples=50)
+    def test_stream_matches_export(self, names):
+        """The streamed JSON array is export()'s text plus a newline."""
+        records = [create_record(title=name) for name in names]
+        stream = io.StringIO()
+        
+        JsonExporter().export_to_stream(iter(records), stream)
+        
+        assert stream.getvalue() == JsonExporter().export(records) + '\n'
+    
+    @given(names=st.lists(titles, max_size=5))
+    @settings(max_examples=50)
+    def test_ndjson_one_record_per_line(self, names):
+        """NDJSON has one parseable record per line."""
+        stream = io.StringIO()
+        with JsonExporter().open_stream(stream, ExportFormat.NDJSON) as writer:
+            writer.write_all(create_record(title=name) for name in names)
+        
+        lines = stream.getvalue().splitlines()
+        assert [json.loads(line)['title'] for line in lines] == names
+    
+    def test_records_written_before_close(self):
+        """Each record reaches the stream before the next one is produced."""
+        stream = io.StringIO()
+        writer = JsonExporter().open_stream(stream, ExportFormat.NDJSON)
+        
+        writer.write(create_record(title='first'))
+        assert json.loads(stream.getvalue())['title'] == 'first'
+        writer.close()
+    
+    def test_gzip_inferred_from_suffix(self, tmp_path):
+        """Paths ending in .gz are gzipped."""
+        path = tmp_path / "records.ndjson.gz"
+        with JsonExporter().open_stream(path, ExportFormat.NDJSON) as writer:
+            writer.write(create_record(title='zipped'))
+        
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            assert json.loads(f.readline())['title'] == 'zipped'
+    
+    def test_engine_streams_scraped_records(self):
+        """scrape_to_stream writes every compliant record of a run."""
+        engine = make_engine([make_source('a')])
+        stream = io.StringIO()
+        
+        count = engine.scrape_to_stream(stream, fmt=ExportFormat.NDJSON)
+        
+        urls = [json.loads(line)['source_url'] for line in stream.getvalue().splitlines()]
+        assert count == len(urls) == 3
+        assert urls[0] == "https://a.gov.za/page/0"
@@ -0,0 +1,114 @@
+"""
+Property-based tests for the URL frontier.
+
+**Validates: Requirements 1.1, 1.3**
+"""
+from hypothesis import given, strategies as st, settings
+
+from scraper.config import is_approved_source, load_sources
+from scraper.frontier import UrlFrontier, canonicalise_url
+from scraper.tests.test_pipeline_properties import PagesAdapter, make_source
+
+segments = st.lists(st.text(alphabet='abcdefgh-', min_size=1, max_size=8), min_size=1, max_size=3)
+
+
+class ListingAdapter(PagesAdapter):
+    """Adapter yielding a fixed list of URLs."""
+    
+    urls: list[str] = []
+    
+    def get_opportunity_urls(self):
+        yield from self.urls
+
+
+class OverlappingAdapter(ListingAdapter):
+    """Adapter whose sources link to the same pages."""
+    
+    urls = ["https://a.gov.za/fund", "https://a.gov.za/fund/"]
+
+
+class TestUrlFrontier:
+    """
+    Feature: grant-guide-scraper-engine, Property 32: URL Frontier
+    
+    *For any* set of links, the frontier SHALL admit each page of an
+    approved source once per run, whatever its spelling.
+    """
+    
+    @given(
+        path=segments,
+        slash=st.booleans(),
+        fragment=st.sampled_from(['', '#apply', '#top']),
+        tracking=st.sampled_from(['', 'utm_source=x', 'utm_medium=email&fbclid=1']),
+        upper_host=st.booleans()
+    )
+    @settings(max_examples=100)
+    def test_variants_share_canonical_form(self, path, slash, fragment, tracking, upper_host):
+        """Case, trailing slash, fragment and tracking variants are one URL."""
+        host = "WWW.DTIC.GOV.ZA" if upper_host else "www.dtic.gov.za"
+        variant = f"HTTPS://{host}:443/{'/'.join(path)}{'/' if slash else ''}"
+        variant += f"?{tracking}" if tracking else ''
+        variant += fragment
+        
+        assert canonicalise_url(variant) == canonicalise_url(f"https://www.dtic.gov.za/{'/'.join(path)}")
+    
+    def test_other_query_params_kept(self):
+        """Non-tracking parameters distinguish pages."""
+        assert canonicalise_url("https://a.gov.za/p?id=1&utm_source=x") == "https://a.gov.za/p?id=1"
+        assert canonicalise_url("https://a.gov.za/p?id=1") != canonicalise_url("https://a.gov.za/p?id=2")
+    
+    def test_admits_each_page_once(self):
+        """Duplicates and off-site links are dropped; URLs are returned as found."""
+        frontier = UrlFrontier.for_sources([make_source('a')])
+        
+        assert frontier.admit("https://a.gov.za/grants/") == "https://a.gov.za/grants/"
+        assert frontier.admit("https://A.gov.za/grants#apply") is None
+        assert frontier.admit("https://twitter.com/a") is None
+        assert (frontier.duplicates, frontier.rejected, len(frontier)) == (1, 1, 1)
+    
+    def test_adapter_skips_repeats_across_sources(self):
+        """Adapters sharing a run's frontier fetch each page once."""
+        frontier = UrlFrontier.for_sources([make_source('a'), make_source('b')])
+        first = ListingAdapter(make_source('a'), None)
+        second = ListingAdapter(make_source('b'), None)
+        first.urls = second.urls = [
+            "https://a.gov.za/fund", "https://a.gov.za/fund/", "https://a.gov.za/fund?utm_medium=x",
+            "https://b.gov.za/fund", "https://facebook.com/a",
+        ]
+        first.frontier = second.frontier = frontier
+        
+        assert list(first.opportunity_urls()) == ["https://a.gov.za/fund", "https://b.gov.za/fund"]
+        assert list(second.opportunity_urls()) == []
+    
+    def test_dry_run_shares_the_run_frontier(self):
+        """scrape_records de-duplicates pages across sources like run() does."""
+        from scraper.tests.test_pipeline_properties import make_engine
+        
+        # Two sources on the same site, linking to the same pages
+        sources = [make_source('a'), make_source('a')]
+        sources[1].source_id = 'a-news'
+        for source in sources:
+            source.adapter_class = f"{__name__}.OverlappingAdapter"
+        
+        run = make_engine(sources).run()
+        records = list(make_engine(sources).scrape_records())
+        
+        assert [r.source_url for r in records] == ["https://a.gov.za/fund"]
+        assert run.total_records_created == len(records)
+    
+    def test_source_without_path_does_not_approve_everything(self):
+        """A scrape URL with no path only approves its own host."""
+        sources = load_sources()
+        
+        assert is_approved_source("https://www.nyda.gov.za/funding", sources)
+        assert not is_approved_source("https://evil.example.com/", sources)
+        assert not is_approved_source("https://www.dtic.gov.za.evil.com/", sources)
+    
+    def test_scrape_url_directory_is_approved(self):
+        """Pages under a scrape URL's directory are approved, siblings of it are not."""
+        source = make_source('a')
+        source.base_url = "https://portal.a.gov.za"
+        source.scrape_urls = ["https://www.a.gov.za/funding/calls"]
+        
+        assert is_approved_source("https://www.a.gov.za/funding/grant-1", [source])
+        assert not is_approved_source("https://www.a.gov.za/fundingnews", [source])
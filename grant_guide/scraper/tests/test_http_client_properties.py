@@ -7,11 +7,21 @@ import pytest
 from datetime import datetime, timedelta
 from hypothesis import given, strategies as st, settings
 from unittest.mock import Mock, patch, MagicMock
+import threading
 import time
 
+import requests
+
+from scraper.circuit_breaker import CircuitBreaker
 from scraper.http_client import (
-    HttpClient, RobotsDisallowedError, retry_with_backoff, compute_content_hash
+    HttpClient, RobotsDisallowedError, NotModifiedError, CircuitOpenError,
+    retry_with_backoff, compute_content_hash
 )
+from scraper.cancellation import CancellationToken, OperationCancelled, cancellation_scope
+from scraper.models import ImportResult, SourceConfig, SourceType
+from scraper.rate_limiter import DomainRateLimiter, parse_retry_after
+from scraper.robots_store import RobotsStore
+from scraper.validator_store import ValidatorStore
 
 
 class TestRateLimitingEnforcement:
@@ -56,6 +66,170 @@ class TestRateLimitingEnforcement:
         assert client.default_delay == delay
 
 
+class TestSharedRateLimiter:
+    """
+    Feature: grant-guide-scraper-engine, Property 3: Rate Limiting Enforcement
+    
+    *For any* number of workers sharing a limiter, requests to one domain
+    SHALL be spaced by its interval, stretched on 429/503 responses.
+    """
+    
+    def test_concurrent_workers_are_spaced(self):
+        """Threads hitting the same domain take turns; other domains never wait."""
+        limiter = DomainRateLimiter(default_delay=0.05)
+        started = []
+        
+        def worker():
+            limiter.acquire("a.gov.za")
+            started.append(time.monotonic())
+        
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        started.sort()
+        assert all(b - a >= 0.045 for a, b in zip(started, started[1:]))
+        assert limiter.reserve("b.gov.za") == 0
+    
+    def test_source_rate_limit_applied(self):
+        """A source's rate_limit_seconds sets the delay for its domains."""
+        client = HttpClient(default_delay=2.0)
+        client._robots_cache["slow.gov.za"] = None
+        client._robots_cache["other.gov.za"] = None
+        client.configure_rate_limits([SourceConfig(
+            source_id='slow', source_name='Slow', base_url='https://slow.gov.za',
+            scrape_urls=['https://slow.gov.za/funding'], source_type=SourceType.GOVERNMENT,
+            adapter_class='x', rate_limit_seconds=5.0,
+        )])
+        
+        assert client.get_crawl_delay("https://slow.gov.za/page") == 5.0
+        assert client.get_crawl_delay("https://other.gov.za/page") == 2.0
+    
+    def test_retry_after_holds_domain_off(self):
+        """A 429 with Retry-After blocks the domain and stretches its interval."""
+        client = HttpClient(default_delay=0.01)
+        client._robots_cache["example.gov.za"] = None
+        response = Mock(status_code=429, headers={'Retry-After': '30'}, text="")
+        response.raise_for_status = Mock(side_effect=requests.HTTPError("429", response=response))
+        client._session.get = Mock(return_value=response)
+        
+        with cancellation_scope(CancellationToken(timeout=0.2)), pytest.raises(OperationCancelled):
+            client.get("https://example.gov.za/page")
+        
+        assert client._session.get.call_count == 1
+        assert client.rate_limiter.reserve("example.gov.za") >= 29
+    
+    def test_lease_shared_between_processes(self, tmp_path):
+        """Limiters on the same lease file space requests between them."""
+        first = DomainRateLimiter(default_delay=10, lease_path=tmp_path / "lease.sqlite3")
+        second = DomainRateLimiter(default_delay=10, lease_path=tmp_path / "lease.sqlite3")
+        
+        assert first.reserve("a.gov.za") == 0
+        assert 9 < second.reserve("a.gov.za") <= 10
+        assert second.reserve("b.gov.za") == 0
+        first.close()
+        second.close()
+    
+    @pytest.mark.parametrize("value,expected", [
+        ("120", 120.0), ("Wed, 21 Oct 2015 07:28:00 GMT", 0.0), ("soon", None), (None, None),
+    ])
+    def test_parse_retry_after(self, value, expected):
+        """Retry-After accepts seconds or an HTTP date."""
+        assert parse_retry_after(value) == expected
+
+
+def http_error(status: int) -> requests.HTTPError:
+    return requests.HTTPError(f"{status} error", response=Mock(status_code=status))
+
+
+class TestCircuitBreaker:
+    """
+    Feature: grant-guide-scraper-engine, Property 27: Network Retry with Backoff
+    
+    Only transient failures SHALL be retried, within a per-domain budget,
+    and a domain that keeps failing SHALL fail fast for the rest of the run.
+    """
+    
+    @pytest.mark.parametrize("status,calls", [(404, 1), (403, 1), (503, 3), (429, 3)])
+    def test_retries_depend_on_status(self, status, calls):
+        """4xx responses are raised at once; 429 and 5xx are retried."""
+        func = Mock(side_effect=http_error(status))
+        
+        with pytest.raises(requests.HTTPError):
+            retry_with_backoff(max_retries=2, base_delay=0.001)(func)()
+        
+        assert func.call_count == calls
+    
+    def make_client(self, breaker, error):
+        client = HttpClient(default_delay=0, circuit_breaker=breaker)
+        client._robots_cache["dead.gov.za"] = None
+        client._session.get = Mock(side_effect=error)
+        return client
+    
+    @patch('scraper.cancellation.sleep')
+    def test_retry_budget_shared_by_domain(self, sleep):
+        """Once a domain's retries are spent, its requests fail after one attempt."""
+        client = self.make_client(CircuitBreaker(retry_budget=4), requests.Timeout("slow"))
+        
+        for page in range(3):
+            with pytest.raises(requests.Timeout):
+                client.get(f"https://dead.gov.za/{page}")
+        
+        # 4 attempts for the first page (3 retries), 2 then 1 for the rest
+        assert client._session.get.call_count == 7
+    
+    def test_circuit_opens_and_fails_fast(self):
+        """After the threshold, requests to the domain fail without a request."""
+        client = self.make_client(
+            CircuitBreaker(failure_threshold=2, retry_budget=0),
+            requests.ConnectionError("refused")
+        )
+        
+        for page in range(2):
+            with pytest.raises(requests.ConnectionError):
+                client.get(f"https://dead.gov.za/{page}")
+        with pytest.raises(CircuitOpenError):
+            client.get("https://dead.gov.za/2")
+        
+        assert client._session.get.call_count == 2
+        client.reset_circuits(["https://dead.gov.za"])
+        assert not client.circuit_open("https://dead.gov.za/2")
+    
+    def test_missing_pages_do_not_open_circuit(self):
+        """404s mean the site is up and reset the failure count."""
+        client = self.make_client(CircuitBreaker(failure_threshold=1), None)
+        response = Mock(status_code=404, headers={}, text="")
+        response.raise_for_status = Mock(side_effect=http_error(404))
+        client._session.get.side_effect = None
+        client._session.get.return_value = response
+        
+        for page in range(3):
+            with pytest.raises(requests.HTTPError):
+                client.get(f"https://dead.gov.za/{page}")
+        
+        assert not client.circuit_open("https://dead.gov.za/")
+    
+    def test_open_circuit_fails_source(self):
+        """A source whose site trips the breaker fails fast and counts a failure."""
+        from scraper.tests.test_pipeline_properties import make_engine, make_source
+        
+        source = make_source('dead')
+        source.rate_limit_seconds = 0
+        engine = make_engine([source])
+        engine.http_client = self.make_client(
+            CircuitBreaker(failure_threshold=2, retry_budget=0),
+            requests.ConnectionError("refused")
+        )
+        
+        result = engine.run()
+        
+        assert result.sources_failed == 1
+        assert source.consecutive_failures == 1
+        assert engine.http_client._session.get.call_count == 2
+
+
 class TestRobotsTxtCompliance:
     """
     Feature: grant-guide-scraper-engine, Property 1: Robots.txt Compliance
@@ -111,6 +285,93 @@ class TestRobotsTxtCompliance:
         assert isinstance(result, bool)
 
 
+def robots_response(status: int = 200, text: str = "User-agent: *\nDisallow: /private\n"):
+    return Mock(status_code=status, text=text)
+
+
+class TestRobotsCache:
+    """
+    Feature: grant-guide-scraper-engine, Property 1: Robots.txt Compliance
+    
+    robots.txt SHALL be fetched through the client's session, cached across
+    clients for its TTL, and failures SHALL only be cached briefly.
+    """
+    
+    def test_fetched_once_and_shared_across_clients(self, tmp_path):
+        """A second client reuses the stored robots.txt without fetching it."""
+        store = RobotsStore(tmp_path / "robots.sqlite3")
+        first = HttpClient(robots_store=store)
+        first._session.get = Mock(return_value=robots_response())
+        
+        assert not first.is_allowed("https://example.gov.za/private/x")
+        assert first.is_allowed("https://example.gov.za/public")
+        first._session.get.assert_called_once_with(
+            "https://example.gov.za/robots.txt", timeout=first.timeout
+        )
+        
+        second = HttpClient(robots_store=RobotsStore(tmp_path / "robots.sqlite3"))
+        second._session.get = Mock(side_effect=AssertionError("fetched again"))
+        assert not second.is_allowed("https://example.gov.za/private/x")
+    
+    @pytest.mark.parametrize("status,allowed", [(401, False), (403, False), (404, True)])
+    def test_status_handling_matches_robotparser(self, status, allowed):
+        """401/403 disallow everything; other 4xx allow everything."""
+        client = HttpClient()
+        client._session.get = Mock(return_value=robots_response(status, "Disallow: /"))
+        
+        assert client.is_allowed("https://example.gov.za/page") is allowed
+    
+    def test_failures_expire_after_negative_ttl(self):
+        """A failed fetch allows access and is retried once the negative TTL passes."""
+        client = HttpClient(robots_store=RobotsStore(":memory:", negative_ttl=0.05))
+        client._session.get = Mock(side_effect=ConnectionError("down"))
+        
+        assert client.is_allowed("https://example.gov.za/private/x")
+        assert client.is_allowed("https://example.gov.za/private/y")
+        assert client._session.get.call_count == 1
+        
+        time.sleep(0.06)
+        client._session.get = Mock(return_value=robots_response())
+        assert not client.is_allowed("https://example.gov.za/private/x")
+    
+    def test_server_error_disallows_until_negative_ttl(self):
+        """A 5xx robots.txt disallows everything, and is retried once the negative TTL passes."""
+        client = HttpClient(robots_store=RobotsStore(":memory:", negative_ttl=0.05))
+        client._session.get = Mock(return_value=robots_response(503, "Service Unavailable"))
+        
+        assert not client.is_allowed("https://example.gov.za/public")
+        assert not client.is_allowed("https://example.gov.za/other")
+        assert client._session.get.call_count == 1
+        
+        time.sleep(0.06)
+        client._session.get = Mock(return_value=robots_response())
+        assert client.is_allowed("https://example.gov.za/public")
+    
+    def test_entries_expire_after_ttl(self):
+        """Fresh rules are fetched once the TTL passes."""
+        client = HttpClient(robots_store=RobotsStore(":memory:", ttl=0.05))
+        client._session.get = Mock(return_value=robots_response())
+        assert not client.is_allowed("https://example.gov.za/private/x")
+        
+        time.sleep(0.06)
+        client._session.get = Mock(return_value=robots_response(text="User-agent: *\nAllow: /\n"))
+        assert client.is_allowed("https://example.gov.za/private/x")
+    
+    def test_prefetch_loads_each_domain_once(self):
+        """Prefetching fetches every domain's robots.txt once, concurrently."""
+        client = HttpClient()
+        client._session.get = Mock(return_value=robots_response())
+        
+        client.prefetch_robots([
+            "https://a.gov.za", "https://a.gov.za/funding", "https://b.gov.za/x",
+        ])
+        assert client.is_allowed("https://a.gov.za/page")
+        assert client.is_allowed("https://b.gov.za/page")
+        
+        fetched = sorted(call.args[0] for call in client._session.get.call_args_list)
+        assert fetched == ["https://a.gov.za/robots.txt", "https://b.gov.za/robots.txt"]
+
+
 class TestNetworkRetryWithBackoff:
     """
     Feature: grant-guide-scraper-engine, Property 27: Network Retry with Backoff
@@ -223,3 +484,145 @@ class TestDomainExtraction:
         
         extracted = client._get_domain(url)
         assert extracted == domain
+
+
+class TestConditionalRequests:
+    """Test conditional GET with persisted ETag/Last-Modified validators."""
+    
+    def make_client(self, responses):
+        """Create a client whose session returns the given responses in order."""
+        client = HttpClient(validator_store=ValidatorStore(":memory:"))
+        client._robots_cache["example.gov.za"] = None
+        client._session.get = Mock(side_effect=responses)
+        return client
+    
+    def make_response(self, status=200, text="<html></html>", headers=None):
+        response = Mock()
+        response.status_code = status
+        response.text = text
+        response.headers = headers or {}
+        response.raise_for_status = Mock()
+        return response
+    
+    def test_validators_stored_and_sent(self):
+        """Validators from a 200 are sent on the next conditional fetch."""
+        client = self.make_client([
+            self.make_response(headers={'ETag': '"v1"', 'Last-Modified': 'Mon, 06 Jan 2025 10:00:00 GMT'}),
+            self.make_response(text="<html>new</html>"),
+        ])
+        url = "https://example.gov.za/page"
+        
+        client.get(url, conditional=True)
+        client._last_request.clear()
+        assert client.get(url, conditional=True) == "<html>new</html>"
+        
+        headers = client._session.get.call_args.kwargs['headers']
+        assert headers == {
+            'If-None-Match': '"v1"',
+            'If-Modified-Since': 'Mon, 06 Jan 2025 10:00:00 GMT',
+        }
+    
+    def test_not_modified_raises(self):
+        """A 304 response raises NotModifiedError without retrying."""
+        client = self.make_client([self.make_response(status=304)])
+        
+        with pytest.raises(NotModifiedError):
+            client.get("https://example.gov.za/page", conditional=True)
+        
+        assert client._session.get.call_count == 1
+    
+    def test_unconditional_sends_no_validators(self):
+        """Plain fetches never send conditional headers."""
+        client = self.make_client([
+            self.make_response(headers={'ETag': '"v1"'}),
+            self.make_response(headers={'ETag': '"v2"'}),
+        ])
+        url = "https://example.gov.za/page"
+        
+        client.get(url)
+        client._last_request.clear()
+        client.get(url)
+        
+        assert client._session.get.call_args.kwargs['headers'] == {}
+        assert client.validator_store.get(url).etag == '"v2"'
+    
+    def test_adapter_records_unchanged_pages(self):
+        """Adapters skip 304 pages and report them as unchanged."""
+        from scraper.adapters.base import BaseSourceAdapter
+        from scraper.models import RawOpportunity, SourceConfig, SourceType
+        
+        class Adapter(BaseSourceAdapter):
+            def get_opportunity_urls(self):
+                yield "https://example.gov.za/a"
+                yield "https://example.gov.za/b"
+            
+            def extract_opportunity(self, url, html):
+                return RawOpportunity(title=html, source_url=url)
+        
+        http = Mock()
+        http.get.side_effect = [NotModifiedError("a"), "B"]
+        config = SourceConfig(
+            source_id="x", source_name="X", base_url="https://example.gov.za",
+            scrape_urls=[], source_type=SourceType.GOVERNMENT, adapter_class="x.Adapter"
+        )
+        adapter = Adapter(config, http)
+        
+        records = list(adapter.scrape())
+        
+        assert [r.source_url for r in records] == ["https://example.gov.za/b"]
+        assert adapter.unchanged_urls == ["https://example.gov.za/a"]
+    
+    class ConditionalHttp:
+        """Serves pages in full once, then 304 while validators are stored."""
+        
+        def __init__(self):
+            self.validator_store = ValidatorStore(":memory:")
+            self.full_fetches = []
+        
+        def get(self, url, check_robots=True, conditional=False):
+            if conditional and self.validator_store.get(url) is not None:
+                raise NotModifiedError(url)
+            self.validator_store.set(url, '"v1"', None)
+            self.full_fetches.append(url)
+            return f"<h1>{url}</h1>"
+    
+    @pytest.mark.parametrize('staged', [False, True])
+    def test_failed_import_refetched_next_run(self, staged):
+        """Pages whose import failed are fetched and imported in full next run."""
+        from scraper.pipeline import PipelineConfig
+        from scraper.tests.test_pipeline_properties import make_engine, make_source
+        
+        engine = make_engine([make_source('a')], pipeline_config=PipelineConfig() if staged else None)
+        engine.http_client = self.ConditionalHttp()
+        import_batch = engine.importer.import_batch
+        engine.importer.import_batch = lambda records, existing_ids=None, merge_with=None: [
+            ImportResult(success=False, action='skipped', error="database down") for _ in records
+        ]
+        
+        first = engine.run()
+        engine.importer.import_batch = import_batch
+        engine.http_client.full_fetches.clear()
+        second = engine.run()
+        
+        assert first.total_records_created == 0
+        assert second.total_records_created == first.total_records_skipped
+        assert sorted(engine.http_client.full_fetches) == sorted(
+            f"https://a.gov.za/{page}" for page in ('page/0', 'page/1', 'page/2', 'unchanged', 'broken')
+        )
+    
+    def test_failed_extraction_refetched_next_run(self):
+        """A page the adapter failed to parse is not reported unchanged next run."""
+        from scraper.deduplicator import Deduplicator
+        from scraper.tests.test_pipeline_properties import IndexingImporter, make_engine, make_source
+        
+        engine = make_engine([make_source('bad')])
+        engine.http_client = self.ConditionalHttp()
+        engine.importer = IndexingImporter()
+        engine.deduplicator = Deduplicator(lambda: list(engine.importer.stored))
+        
+        engine.run()
+        engine.http_client.full_fetches.clear()
+        second = engine.run()
+        
+        assert engine.http_client.full_fetches == ["https://bad.gov.za/page/2"]
+        assert second.total_records_unchanged == 4
@@ -0,0 +1,238 @@
+"""
+Property-based tests for the Django importer.
+
+**Validates: Requirements 7.1, 7.2, 7.3**
+"""
+from datetime import date
+
+import pytest
+
+from opportunities.models import AuditLog, FundingOpportunity, Industry
+from scraper.importer import DjangoImporter
+from scraper.lookups import LookupCache, lookup_cache
+from scraper.models import (
+    NormalisedOpportunity, RecordType, FundingType, FunderType,
+    BusinessStage, OpportunityStatus
+)
+
+
+def create_record(**overrides) -> NormalisedOpportunity:
+    """Create a normalised record with optional overrides."""
+    defaults = {
+        'record_type': RecordType.FUNDING_OPPORTUNITY,
+        'title': 'Test Funding Opportunity',
+        'funder_name': 'Test Funder',
+        'funder_type': FunderType.GOV,
+        'funding_type': FundingType.GRANT,
+        'description_short': 'A test funding opportunity.',
+        'industry_tags': ['ICT'],
+        'province_tags': ['Gauteng'],
+        'business_stage': BusinessStage.SME,
+        'eligibility_bullets': ['Registered business'],
+        'funding_amount_min': None,
+        'funding_amount_max': None,
+        'deadline_date': None,
+        'is_rolling': True,
+        'required_documents_bullets': ['ID'],
+        'application_steps': ['Apply online'],
+        'official_apply_url': 'https://example.gov.za/apply',
+        'source_url': 'https://example.gov.za/funding',
+        'source_name': 'Test Source',
+        'last_verified_date': date.today(),
+        'status': OpportunityStatus.ACTIVE,
+        'raw_content_hash': 'abc123',
+        'validation_issues': []
+    }
+    defaults.update(overrides)
+    return NormalisedOpportunity(**defaults)
+
+
+@pytest.fixture(autouse=True)
+def fresh_lookup_cache():
+    """Drop cached rows between tests, since each test's rows are rolled back."""
+    lookup_cache.invalidate()
+    yield
+    lookup_cache.invalidate()
+
+
+def batch(n: int) -> list[NormalisedOpportunity]:
+    """Create n records with distinct source URLs and shared titles."""
+    return [
+        create_record(
+            title='Grant Programme',
+            source_url=f'https://example.gov.za/funding/{i}',
+            industry_tags=['ICT', f'Sector {i % 3}'],
+            province_tags=['gauteng', 'Western Cape'],
+        )
+        for i in range(n)
+    ]
+
+
+@pytest.mark.django_db
+class TestBulkImport:
+    """
+    Feature: grant-guide-scraper-engine, Property 20: Import Record Completeness
+    
+    *For any* batch of records, import_batch SHALL write the same rows,
+    relations and audit logs as importing each record on its own.
+    """
+    
+    def test_batch_matches_single_imports(self):
+        """Batch and per-record imports produce equivalent rows."""
+        importer = DjangoImporter()
+        records = batch(3)
+        
+        results = importer.import_batch(records)
+        
+        assert [r.action for r in results] == ['created'] * 3
+        slugs = sorted(FundingOpportunity.objects.values_list('slug', flat=True))
+        assert slugs == ['grant-programme', 'grant-programme-1', 'grant-programme-2']
+        
+        single = importer.import_record(create_record(
+            title='Grant Programme', source_url='https://example.gov.za/funding/single',
+            industry_tags=['ICT', 'Sector 0'], province_tags=['gauteng', 'Western Cape'],
+        ))
+        assert FundingOpportunity.objects.get(id=single.record_id).slug == 'grant-programme-3'
+        
+        for result in [*results, single]:
+            opp = FundingOpportunity.objects.get(id=result.record_id)
+            assert opp.raw_content_hash == 'abc123'
+            assert sorted(p.name for p in opp.provinces.all()) == ['Gauteng', 'Western Cape']
+            assert 'ICT' in {i.name for i in opp.industries.all()}
+        
+        assert AuditLog.objects.filter(action='created_by_scraper').count() == 4
+    
+    def test_query_count_is_constant(self, django_assert_max_num_queries):
+        """Query count does not grow with batch size."""
+        importer = DjangoImporter()
+        importer.import_batch(batch(5))
+        existing = list(FundingOpportunity.objects.values_list('id', flat=True))
+        
+        records = batch(40)
+        existing_ids = existing + [None] * 35
+        with django_assert_max_num_queries(20):
+            results = importer.import_batch(records, existing_ids)
+        
+        assert [r.action for r in results] == ['updated'] * 5 + ['created'] * 35
+        assert FundingOpportunity.objects.count() == 40
+    
+    def test_update_changes_fields_and_relations(self):
+        """Updates overwrite changed fields and replace relations."""
+        importer = DjangoImporter()
+        [created] = importer.import_batch([create_record()])
+        
+        [updated] = importer.import_batch(
+            [create_record(description_short='Changed.', province_tags=['Western Cape'])],
+            [created.record_id]
+        )
+        
+        assert updated.action == 'updated'
+        opp = FundingOpportunity.objects.get(id=created.record_id)
+        assert opp.description == 'Changed.'
+        assert [p.name for p in opp.provinces.all()] == ['Western Cape']
+        log = AuditLog.objects.get(action='updated_by_scraper')
+        assert log.changes == {'fields': ['description']}
+    
+    def test_same_source_url_in_batch_creates_one_row(self):
+        """New records sharing a source URL are merged, the last one winning."""
+        results = DjangoImporter().import_batch([
+            create_record(title='First'), create_record(title='Second')
+        ])
+        
+        assert [r.action for r in results] == ['created', 'updated']
+        assert results[0].record_id == results[1].record_id
+        assert FundingOpportunity.objects.get().funding_name == 'Second'
+    
+    @pytest.mark.parametrize('fail_bulk', [False, True])
+    def test_records_sharing_apply_url_create_one_row(self, fail_bulk, monkeypatch):
+        """Two new records in one flush with the same apply URL write one row."""
+        from scraper.deduplicator import Deduplicator, DedupIndex
+        from scraper.engine import ScraperEngine, SourceResult
+        
+        index = DedupIndex()
+        importer = DjangoImporter(dedup_index=index)
+        if fail_bulk:
+            monkeypatch.setattr(importer, '_bulk_import', lambda *args: 1 / 0)
+        engine = ScraperEngine(deduplicator=Deduplicator(index=index), importer=importer)
+        result = SourceResult(source_id='test', source_name='Test')
+        
+        engine._flush_imports([
+            create_record(source_url='https://example.gov.za/a', title='First'),
+            create_record(source_url='https://news.example.gov.za/a', title='Second'),
+        ], result)
+        
+        assert (result.records_created, result.records_updated) == (1, 1)
+        assert FundingOpportunity.objects.get().funding_name == 'Second'
+    
+    def test_failed_batch_falls_back_to_single_imports(self):
+        """A bad record only skips itself."""
+        results = DjangoImporter().import_batch(
+            [create_record(source_url='https://example.gov.za/ok'),
+             create_record(source_url='https://example.gov.za/bad')],
+            [None, 999]
+        )
+        
+        assert [r.action for r in results] == ['created', 'skipped']
+        assert FundingOpportunity.objects.count() == 1
+    
+    def test_unapproved_sources_skipped(self):
+        """With a classifier, records from unapproved sites are not imported."""
+        from scraper.domains import DomainClassifier
+        from scraper.tests.test_pipeline_properties import make_source
+        
+        importer = DjangoImporter(classifier=DomainClassifier([make_source('example')]))
+        results = importer.import_batch([
+            create_record(source_url='https://example.gov.za/a'),
+            create_record(source_url='https://scam.example.com/a'),
+            create_record(source_url='https://example.gov.za/b'),
+        ])
+        
+        assert [r.action for r in results] == ['created', 'skipped', 'created']
+        assert FundingOpportunity.objects.count() == 2
+    
+    def test_missing_industries_created_once(self):
+        """Unknown industry tags are created in bulk and reused."""
+        before = Industry.objects.count()
+        DjangoImporter().import_batch(batch(6))
+        
+        assert Industry.objects.count() == before + 4
+        assert Industry.objects.filter(name__startswith='Sector ').count() == 3
+
+
+@pytest.mark.django_db
+class TestLookupCache:
+    """Test cached Industry and Province lookups."""
+    
+    def test_lookups_hit_database_once(self, django_assert_num_queries):
+        """After loading, repeated lookups run no queries."""
+        cache = LookupCache()
+        cache.provinces(['Gauteng'])
+        cache.industries(['Agriculture'])
+        
+        with django_assert_num_queries(0):
+            for _ in range(10):
+                assert cache.provinces(['gauteng', 'Western Cape']).keys() == {'gauteng', 'Western Cape'}
+                assert 'Agriculture' in cache.industries(['Agriculture'])
+    
+    def test_missing_provinces_are_skipped(self):
+        """Unknown provinces are left out rather than created."""
+        assert LookupCache().provinces(['Atlantis']) == {}
+    
+    def test_industries_created_in_one_insert(self, django_assert_max_num_queries):
+        """Missing industries are bulk created and then cached."""
+        cache = LookupCache()
+        cache.industries(['Agriculture'])
+        
+        with django_assert_max_num_queries(2):
+            created = cache.industries([f'New Sector {i}' for i in range(10)])
+        
+        assert len(created) == 10
+        assert Industry.objects.filter(name__startswith='New Sector ').count() == 10
+    
+    def test_saving_a_row_invalidates_shared_cache(self):
+        """ORM saves on lookup tables drop the process-wide cache."""
+        lookup_cache.industries(['Agriculture'])
+        Industry.objects.create(name='Aquaculture', slug='aquaculture')
+        
+        assert lookup_cache._industries is None
+        assert 'Aquaculture' in lookup_cache.industries(['Aquaculture'])
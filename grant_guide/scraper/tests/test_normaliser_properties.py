@@ -8,7 +8,7 @@ from datetime import date
 from decimal import Decimal
 from hypothesis import given, strategies as st, settings, HealthCheck
 
-from scraper.normaliser import RecordNormaliser
+from scraper.normaliser import RecordNormaliser, parse_amount_range, parse_date
 from scraper.models import RawOpportunity, FundingType
 
 
@@ -64,6 +64,35 @@ class TestCurrencyNormalisation:
         """Empty string returns None."""
         normaliser = RecordNormaliser()
         assert normaliser.normalise_amount("") is None
+    
+    @given(amount=st.sampled_from(["R1,5m", "R1.5m", "R1 500 000", "R1,500,000", "1.5 million ZAR"]))
+    @settings(max_examples=20)
+    def test_decimal_comma_and_thousands(self, amount):
+        """Commas mark decimals unless they group thousands."""
+        assert RecordNormaliser().normalise_amount(amount) == Decimal("1500000")
+    
+    @given(amount=st.sampled_from([
+        "R50k–R2m", "R50k - R2m", "R50 000 to R2 million", "between R50k and R2m"
+    ]))
+    @settings(max_examples=20)
+    def test_ranges(self, amount):
+        """Ranges give both bounds; normalise_amount is the lower one."""
+        normaliser = RecordNormaliser()
+        assert normaliser.normalise_amount_range(amount) == (Decimal("50000"), Decimal("2000000"))
+        assert normaliser.normalise_amount(amount) == Decimal("50000")
+    
+    def test_range_shares_upper_unit(self):
+        """In "R1–5 million" both bounds are millions."""
+        assert parse_amount_range("R1–5 million") == (Decimal("1000000"), Decimal("5000000"))
+    
+    def test_range_fills_record_bounds(self):
+        """A range in the minimum field also supplies a missing maximum."""
+        raw = RawOpportunity(
+            title="Grant", funding_amount_min="R50k–R2m", source_url="https://a.gov.za/g"
+        )
+        record = RecordNormaliser().normalise(raw, "A")
+        assert record.funding_amount_min == Decimal("50000")
+        assert record.funding_amount_max == Decimal("2000000")
 
 
 class TestDateNormalisation:
@@ -106,6 +135,29 @@ class TestDateNormalisation:
         """Invalid date string returns None."""
         normaliser = RecordNormaliser()
         assert normaliser.normalise_date("not a date") is None
+    
+    @given(date_str=st.sampled_from([
+        "15th March 2025", "15TH MARCH 2025", "March 15th, 2025", "15 March, 2025", "Mar. 15, 2025"
+    ]))
+    @settings(max_examples=20)
+    def test_ordinal_and_punctuated_dates(self, date_str):
+        """Ordinal suffixes, case and punctuation do not change the date."""
+        assert RecordNormaliser().normalise_date(date_str) == date(2025, 3, 15)
+    
+    @given(date_str=st.sampled_from(["31/02/2025", "15 Marsh 2025", "Rolling", "2025-13-01"]))
+    @settings(max_examples=20)
+    def test_impossible_dates(self, date_str):
+        """Well-shaped strings that name no real date return None."""
+        assert RecordNormaliser().normalise_date(date_str) is None
+    
+    def test_repeated_strings_cached(self):
+        """Repeated date strings are parsed once."""
+        parse_date.cache_clear()
+        normaliser = RecordNormaliser()
+        for _ in range(3):
+            normaliser.normalise_date("Rolling")
+            normaliser.normalise_date("15 March 2025")
+        assert parse_date.cache_info().misses == 2
 
 
 class TestProvinceNormalisation:
@@ -222,3 +274,60 @@ class TestDescriptionTruncation:
         result = normaliser._truncate_description(description)
         assert result == description
         assert len(result) == 300
+
+
+class TestBatchNormalisation:
+    """
+    Feature: grant-guide-scraper-engine, Property 34: Batch Normalisation
+    
+    *For any* batch of raw records, normalise_batch SHALL produce the same
+    records as normalising each one on its own.
+    """
+    
+    @given(records=st.lists(st.builds(
+        RawOpportunity,
+        title=st.sampled_from(["Grant A", "Grant B", None]),
+        funding_type=st.sampled_from(["grant", "loan", "unknown", None]),
+        industries=st.lists(st.sampled_from(["tech", "agri", "mining", "knitting"]), max_size=3),
+        provinces=st.lists(st.sampled_from(["GP", "kzn", "Atlantis"]), max_size=2),
+        funding_amount_min=st.sampled_from(["R50k–R2m", "R1 million", "Rolling", None]),
+        funding_amount_max=st.sampled_from(["R5m", None]),
+        deadline=st.sampled_from(["15th March 2099", "2099-03-15", "Rolling", None]),
+        is_rolling=st.booleans(),
+        apply_url=st.sampled_from(["https://a.gov.za/apply", None]),
+        source_url=st.just("https://a.gov.za/g"),
+        raw_html=st.text(max_size=50),
+    ), max_size=8))
+    @settings(max_examples=50)
+    def test_batch_matches_single(self, records):
+        """Batch and one-at-a-time normalisation agree record for record."""
+        normaliser = RecordNormaliser()
+        
+        batch = normaliser.normalise_batch(records, "Source")
+        
+        assert batch == [normaliser.normalise(raw, "Source") for raw in records]
+    
+    def test_distinct_tags_resolved_once(self):
+        """Each distinct tag string is normalised once per batch."""
+        normaliser = RecordNormaliser()
+        records = [RawOpportunity(industries=["tech", "tech"], provinces=["GP"]) for _ in range(20)]
+        calls = []
+        original = normaliser.normalise_industry
+        normaliser.normalise_industry = lambda tag: calls.append(tag) or original(tag)
+        
+        batch = normaliser.normalise_batch(records, "Source")
+        
+        assert calls == ["tech"]
+        assert all(record.industry_tags == ["ICT", "ICT"] for record in batch)
+    
+    def test_content_hashes_in_order(self):
+        """Pooled hashing keeps each hash with its own record."""
+        from scraper.http_client import compute_content_hash
+        
+        records = [RawOpportunity(raw_html=f"<p>{i}</p>" * 1000) for i in range(10)]
+        
+        batch = RecordNormaliser().normalise_batch(records, "Source")
+        
+        assert [r.raw_content_hash for r in batch] == [
+            compute_content_hash(raw.raw_html) for raw in records
+        ]
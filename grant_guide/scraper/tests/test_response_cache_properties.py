@@ -0,0 +1,151 @@
+"""
+Property-based tests for the on-disk response cache.
+
+**Validates: Requirements 1.3, 11.1**
+"""
+import time
+from unittest.mock import Mock
+
+import pytest
+from hypothesis import given, strategies as st, settings, HealthCheck
+
+from scraper.http_client import HttpClient, CacheMissError, compute_content_hash
+from scraper.models import SourceConfig, SourceType
+from scraper.response_cache import ResponseCache, CacheMode
+
+
+def make_response(text="<html></html>", status=200, headers=None):
+    """Create a mock requests response."""
+    response = Mock()
+    response.status_code = status
+    response.text = text
+    response.headers = headers or {}
+    response.raise_for_status = Mock()
+    return response
+
+
+class TestCacheRoundTrip:
+    """Cached bodies are returned unchanged and stored content-addressed."""
+    
+    @given(content=st.text(max_size=2000))
+    @settings(max_examples=50, suppress_health_check=[HealthCheck.function_scoped_fixture])
+    def test_put_then_get_returns_content(self, tmp_path, content):
+        """Any body read back from the cache equals what was stored."""
+        cache = ResponseCache(tmp_path)
+        cache.put("https://example.gov.za/page", content)
+        
+        assert cache.get("https://example.gov.za/page") == content
+    
+    def test_identical_bodies_stored_once(self, tmp_path):
+        """Two URLs with the same body share one blob."""
+        cache = ResponseCache(tmp_path)
+        hash_a = cache.put("https://example.gov.za/a", "<html>same</html>")
+        hash_b = cache.put("https://example.gov.za/b", "<html>same</html>")
+        
+        assert hash_a == hash_b == compute_content_hash("<html>same</html>")
+        assert len(list((tmp_path / "blobs").rglob("*.gz"))) == 1
+    
+    def test_miss_returns_none(self, tmp_path):
+        """Unknown URLs are a miss."""
+        assert ResponseCache(tmp_path).get("https://example.gov.za/none") is None
+
+
+class TestCacheExpiry:
+    """Entries expire after their TTL; per-source TTLs override the default."""
+    
+    def test_expired_entry_is_stale(self, tmp_path):
+        """Entries older than the TTL are only returned with allow_stale."""
+        cache = ResponseCache(tmp_path, default_ttl=0.05)
+        cache.put("https://example.gov.za/page", "body")
+        time.sleep(0.1)
+        
+        assert cache.get("https://example.gov.za/page") is None
+        assert cache.get("https://example.gov.za/page", allow_stale=True) == "body"
+    
+    def test_source_ttl_overrides_default(self, tmp_path):
+        """Sources with cache_ttl_seconds use their own TTL."""
+        cache = ResponseCache(tmp_path, default_ttl=60)
+        cache.set_source_ttls([SourceConfig(
+            source_id="x", source_name="X", base_url="https://slow.gov.za",
+            scrape_urls=["https://slow.gov.za/list"], source_type=SourceType.GOVERNMENT,
+            adapter_class="x.Adapter", cache_ttl_seconds=3600
+        )])
+        
+        assert cache.ttl_for("https://slow.gov.za/page") == 3600
+        assert cache.ttl_for("https://other.gov.za/page") == 60
+
+
+class TestCacheEviction:
+    """The cache stays under max_bytes by evicting least recently used entries."""
+    
+    def test_lru_entry_evicted(self, tmp_path):
+        """The least recently accessed entry is evicted first."""
+        import os
+        bodies = {f"https://example.gov.za/{i}": os.urandom(2000).hex() for i in range(3)}
+        cache = ResponseCache(tmp_path, max_bytes=10 ** 9)
+        for url, body in bodies.items():
+            cache.put(url, body)
+        single_size = cache.size() // 3
+        
+        cache.get("https://example.gov.za/0")  # Most recently used now
+        cache.max_bytes = single_size * 2 + single_size // 2
+        cache.put("https://example.gov.za/3", os.urandom(2000).hex())
+        
+        assert cache.size() <= cache.max_bytes
+        assert cache.get("https://example.gov.za/0") is not None
+        assert cache.get("https://example.gov.za/1") is None
+
+
+class TestHttpClientCaching:
+    """HttpClient serves from the cache according to its mode."""
+    
+    def make_client(self, cache, responses=()):
+        client = HttpClient(response_cache=cache)
+        client._robots_cache["example.gov.za"] = None
+        client._session.get = Mock(side_effect=list(responses))
+        return client
+    
+    def test_normal_mode_serves_fresh_entries(self, tmp_path):
+        """A fresh entry is served without a request."""
+        client = self.make_client(ResponseCache(tmp_path), [make_response("live")])
+        
+        assert client.get("https://example.gov.za/page") == "live"
+        assert client.get("https://example.gov.za/page") == "live"
+        assert client._session.get.call_count == 1
+    
+    def test_record_mode_always_fetches(self, tmp_path):
+        """Record mode refreshes entries on every fetch."""
+        cache = ResponseCache(tmp_path, mode=CacheMode.RECORD)
+        client = self.make_client(cache, [make_response("v1"), make_response("v2")])
+        
+        client.get("https://example.gov.za/page")
+        client._last_request.clear()
+        assert client.get("https://example.gov.za/page") == "v2"
+        assert cache.get("https://example.gov.za/page") == "v2"
+    
+    def test_replay_mode_never_fetches(self, tmp_path):
+        """Replay mode serves stale entries and raises on misses."""
+        ResponseCache(tmp_path, default_ttl=0).put("https://example.gov.za/page", "recorded")
+        client = self.make_client(ResponseCache(tmp_path, mode=CacheMode.REPLAY, default_ttl=0))
+        
+        assert client.get("https://example.gov.za/page") == "recorded"
+        with pytest.raises(CacheMissError):
+            client.get("https://example.gov.za/other")
+        assert client._session.get.call_count == 0
+    
+    def test_stale_entry_revalidated_with_304(self, tmp_path):
+        """A stale entry is revalidated and reused when the server returns 304."""
+        from scraper.validator_store import ValidatorStore
+        
+        cache = ResponseCache(tmp_path, default_ttl=0)
+        client = self.make_client(cache, [
+            make_response("body", headers={'ETag': '"v1"'}),
+            make_response(status=304),
+        ])
+        client.validator_store = ValidatorStore(":memory:")
+        
+        client.get("https://example.gov.za/page")
+        client._last_request.clear()
+        
+        assert client.get("https://example.gov.za/page") == "body"
+        assert client._session.get.call_args.kwargs['headers'] == {'If-None-Match': '"v1"'}
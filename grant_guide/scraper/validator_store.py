@@ -0,0 +1,92 @@
+"""
+Persistent store of HTTP cache validators (ETag / Last-Modified) per URL.
+"""
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+# Default location, next to sources.yaml
+DEFAULT_VALIDATOR_DB = Path(__file__).parent / "http_validators.sqlite3"
+
+
+@dataclass
+class Validators:
+    """Cache validators returned by a server for a URL."""
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    
+    def as_request_headers(self) -> dict[str, str]:
+        """Build conditional request headers from the validators."""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class ValidatorStore:
+    """SQLite-backed store of validators, shared safely between threads."""
+    
+    def __init__(self, path: Optional[str] = None):
+        """
+        Open (or create) the validator store.
+        
+        Args:
+            path: Path to the SQLite file. If None, uses the default location.
+                Use ":memory:" for a throwaway store.
+        """
+        self.path = str(path or DEFAULT_VALIDATOR_DB)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS validators ("
+                " url TEXT PRIMARY KEY,"
+                " etag TEXT,"
+                " last_modified TEXT,"
+                " updated_at TEXT NOT NULL)"
+            )
+    
+    def get(self, url: str) -> Optional[Validators]:
+        """
+        Get stored validators for a URL.
+        
+        Returns:
+            Validators, or None if nothing is stored for the URL.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified FROM validators WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        return Validators(etag=row[0], last_modified=row[1])
+    
+    def set(self, url: str, etag: Optional[str], last_modified: Optional[str]) -> None:
+        """
+        Store validators for a URL. Removes the entry if both are empty.
+        """
+        if not etag and not last_modified:
+            self.delete(url)
+            return
+        
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO validators (url, etag, last_modified, updated_at) "
+                "VALUES (?, ?, ?, ?)",
+                (url, etag, last_modified, datetime.now().isoformat())
+            )
+    
+    def delete(self, url: str) -> None:
+        """Remove stored validators for a URL."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM validators WHERE url = ?", (url,))
+    
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
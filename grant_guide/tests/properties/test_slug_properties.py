@@ -0,0 +1,104 @@
+"""
+Property-based tests for unique slug allocation (P6).
+
+**Validates: Requirements 2.1**
+"""
+import pytest
+from datetime import date
+from unittest import mock
+
+from hypothesis import given, settings, strategies as st, HealthCheck
+
+from opportunities import models as opportunity_models
+from opportunities.models import FundingOpportunity
+from opportunities.slugs import allocate_slugs
+
+
+def make_opportunity(**kwargs) -> FundingOpportunity:
+    """Build an unsaved opportunity."""
+    defaults = {
+        'funding_name': "Grant Programme",
+        'funder': "Test Funder",
+        'funding_type': 'grant',
+        'description': "Test description",
+        'business_stage': 'startup',
+        'apply_link': "https://example.com/apply",
+        'source_link': "https://example.com/source",
+        'last_verified': date.today(),
+    }
+    defaults.update(kwargs)
+    return FundingOpportunity(**defaults)
+
+
+class TestSlugUniqueness:
+    """
+    P6: Slug Uniqueness
+    
+    Property: Every saved opportunity gets a unique slug derived from its
+    name, found with a single query however many slugs are taken.
+    
+    **Validates: Requirements 2.1**
+    """
+    
+    @pytest.mark.django_db
+    def test_suffixes_increment(self):
+        """Same-named opportunities get -1, -2, ... suffixes."""
+        slugs = []
+        for _ in range(4):
+            opp = make_opportunity()
+            opp.save()
+            slugs.append(opp.slug)
+        
+        assert slugs == ['grant-programme', 'grant-programme-1',
+                         'grant-programme-2', 'grant-programme-3']
+    
+    @pytest.mark.django_db
+    def test_one_query_per_allocation(self, django_assert_num_queries):
+        """Allocation cost does not grow with the number of taken slugs."""
+        for _ in range(10):
+            make_opportunity().save()
+        
+        with django_assert_num_queries(1):
+            [slug] = allocate_slugs(FundingOpportunity.objects.all(), ["Grant Programme"])
+        
+        assert slug == 'grant-programme-10'
+    
+    @pytest.mark.django_db
+    @given(names=st.lists(st.sampled_from(["Grant Programme", "Youth Fund", "grant programme"]),
+                          max_size=12))
+    @settings(max_examples=20, suppress_health_check=[HealthCheck.function_scoped_fixture])
+    def test_batch_allocation_is_unique(self, names):
+        """Slugs allocated for a batch are unique among themselves and existing rows."""
+        FundingOpportunity.objects.all().delete()
+        make_opportunity().save()
+        
+        slugs = allocate_slugs(FundingOpportunity.objects.all(), names)
+        
+        assert len(set(slugs)) == len(slugs)
+        assert 'grant-programme' not in slugs
+    
+    @pytest.mark.django_db
+    def test_save_retries_when_slug_taken_concurrently(self):
+        """A slug taken between allocation and insert is re-allocated."""
+        make_opportunity().save()
+        # First allocation ignores the existing row, as a racing worker would
+        stale = iter([['grant-programme']])
+        real = opportunity_models.allocate_slugs
+        
+        with mock.patch.object(
+            opportunity_models, 'allocate_slugs',
+            side_effect=lambda qs, names: next(stale, None) or real(qs, names)
+        ):
+            opp = make_opportunity()
+            opp.save()
+        
+        assert opp.slug == 'grant-programme-1'
+        assert FundingOpportunity.objects.count() == 2
+    
+    @pytest.mark.django_db
+    def test_explicit_slug_is_kept(self):
+        """Saving with a slug already set does not re-allocate it."""
+        opp = make_opportunity(slug='custom-slug')
+        opp.save()
+        
+        assert FundingOpportunity.objects.get(pk=opp.pk).slug == 'custom-slug'